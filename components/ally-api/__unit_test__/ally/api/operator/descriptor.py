@@ -0,0 +1,92 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally api
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides unit testing for the API operator descriptors.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import model
+from ally.api.operator.descriptor import ContainerSupport, \
+    ContainerCompactSupport
+from ally.api.type import typeFor
+from ally.exception import DevelError
+import unittest
+
+# --------------------------------------------------------------------
+
+@model(id='Id')
+class Entity:
+    Id = int
+    Name = str
+
+@model(id='Id', compact=True)
+class EntityCompact:
+    Id = int
+    Name = str
+
+@model(compact=True)
+class EntityCompactExtended(EntityCompact):
+    Entity = Entity
+
+# --------------------------------------------------------------------
+
+class TestDescriptor(unittest.TestCase):
+
+    def testContains(self):
+        entity = Entity()
+        entity.Name = None
+        self.assertTrue(Entity.Name in entity)
+        self.assertTrue(typeFor(Entity.Name) in entity)
+        self.assertFalse(Entity.Id in entity)
+        self.assertFalse(EntityCompact.Name in entity)
+        self.assertFalse('Name' in entity)
+        del entity.Name
+        self.assertFalse(Entity.Name in entity)
+
+    def testCompact(self):
+        entity = EntityCompact()
+        entity.Id = 1
+        self.assertTrue(isinstance(entity, ContainerSupport))
+        self.assertTrue(isinstance(entity, ContainerCompactSupport))
+        self.assertFalse(isinstance(Entity(), ContainerCompactSupport))
+        self.assertFalse(hasattr(entity, '__dict__'))
+        self.assertIs(typeFor(entity), typeFor(EntityCompact))
+
+        self.assertTrue(EntityCompact.Id in entity)
+        self.assertFalse(EntityCompact.Name in entity)
+        self.assertEqual((entity.Id, entity.Name), (1, None))
+        entity.Name = None
+        self.assertTrue(typeFor(EntityCompact.Name) in entity)
+        self.assertEqual(entity._ally_values, {'Id': 1, 'Name': None})
+        del entity.Id
+        self.assertFalse(EntityCompact.Id in entity)
+        self.assertEqual(str(entity), 'EntityCompact[Name=None]')
+        self.assertRaises(AttributeError, setattr, entity, 'Other', 1)
+
+    def testCompactExtended(self):
+        entity = EntityCompactExtended()
+        entity.Name, entity.Entity = 'Name', 2
+        self.assertTrue(EntityCompact.Name in entity)
+        self.assertTrue(EntityCompactExtended.Entity in entity)
+        self.assertFalse(EntityCompact.Id in entity)
+        self.assertEqual(entity._ally_values, {'Name': 'Name', 'Entity': 2})
+
+    def testCompactExtendedNotCompact(self):
+        class EntityExtended(EntityCompact):
+            Other = str
+        self.assertRaises(DevelError, model, EntityExtended)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -18,9 +18,10 @@ if True:
 
 from ally.api.config import model, service, call
 from ally.container.binder_op import validateAutoId, validateMaxLength, \
-    validateManaged, bindValidations, validateRequired
+    validateManaged, bindValidations, validateRequired, validateModel, \
+    EVENT_MODEL_INSERT_CHECK
 from ally.container.proxy import proxyWrapFor
-from ally.exception import InputError
+from ally.exception import InputError, Ref
 import unittest
 
 # --------------------------------------------------------------------
@@ -116,6 +117,17 @@ class TestBinderOp(unittest.TestCase):
 
         self.assertRaises(AttributeError, getattr, proxySrv, '_hidden')
 
+        # The validations bound after the service calls need to be used also.
+        checked = []
+        def check(obj, errors):
+            checked.append([error.property for error in errors])
+            errors.append(Ref('Invalid entity', ref=Entity))
+        validateModel(Entity, check, EVENT_MODEL_INSERT_CHECK)
+        e = Entity()
+        e.WithLength = 'This is a longer text then 5'
+        self.assertRaisesRegex(InputError, "(Entity='Invalid entity')", proxySrv.insert, e)
+        self.assertEqual(checked, [['Required', 'WithLength']])
+
 # --------------------------------------------------------------------
 
 if __name__ == '__main__': unittest.main()
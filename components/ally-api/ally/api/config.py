@@ -11,7 +11,8 @@ Provides the decorators used for APIs in a much easier to use form.
 
 from .operator.container import Call, Service, Criteria, Query, Model, Container
 from .operator.descriptor import Property, Reference, CriteriaEntry, \
-    ContainerSupport, CriteriaSupport, QuerySupport
+    ContainerSupport, CriteriaSupport, QuerySupport, PropertyCompact, \
+    ContainerCompactSupport
 from .operator.extract import extractCriterias, extractProperties, \
     extractPropertiesInherited, extractContainersFrom, extractCriteriasInherited, \
     extractOuputInput, processGenericCall
@@ -89,6 +90,12 @@ def model(*args, id=None, name=None, **hints):
         @keyword replace: class
             The model class to be replaced by this model class, should only be used whenever you need to prototype a
             model in order to be fully defined latter.
+        @keyword compact: boolean
+            If True the model objects will keep the property values in slots and the presence of the values in a bit
+            mask instead of the instance dictionary, this makes the model objects smaller and faster to access. The
+            compact model class is a new class created with slots, so it cannot be used with attributes other then the
+            model properties and it cannot be mapped with SQL alchemy. The models that extend a compact model need to
+            be compact as well.
     '''
     def decorator(clazz):
         assert isclass(clazz), 'Invalid class %s' % clazz
@@ -133,6 +140,7 @@ def model(*args, id=None, name=None, **hints):
                 raise DevelError('Invalid type %s for property \'%s\', only primitives or models allowed' % (typ, prop))
     
         replace = hints.pop('replace', None)
+        compact = hints.pop('compact', False)
         if id is not None:
             assert isinstance(id, str), 'Invalid property id %s' % id
             assert id in properties, 'Invalid property id %s is not in model properties' % id
@@ -143,6 +151,19 @@ def model(*args, id=None, name=None, **hints):
             if isinstance(properties[id], TypeModel):
                 raise DevelError('The id cannot be a model reference, got %s' % properties[id])
     
+        if not compact:
+            for base in clazz.__bases__:
+                if hasattr(base, '_ally_slots'):
+                    raise DevelError('The model class %s extends the compact model class %s so it needs to be compact '
+                                     'as well' % (clazz, base))
+        else:
+            namespace = dict(clazz.__dict__)
+            namespace.pop('__dict__', None)
+            namespace.pop('__weakref__', None)
+            if any(hasattr(base, '_ally_slots') for base in clazz.__bases__): namespace['__slots__'] = ()
+            else: namespace['__slots__'] = ('_ally_slots', '_ally_mask')
+            clazz = type(clazz)(clazz.__name__, clazz.__bases__, namespace)
+
         modelType = TypeModel(clazz, Model(properties, name, id, hints))
         if replace:
             assert isclass(replace), 'Invalid class %s' % replace
@@ -154,19 +175,31 @@ def model(*args, id=None, name=None, **hints):
             typ.clazz = clazz
             typ.container = modelType.container
     
-        reference = {}
-        for prop, typ in properties.items():
+        reference, descriptors, masks = {}, {}, {}
+        for index, (prop, typ) in enumerate(sorted(properties.items())):
             propType = TypeModelProperty(modelType, prop)
             reference[prop] = Reference(propType)
             if isinstance(typ, TypeModel):
                 propType = TypeModelProperty(modelType, prop, typ.container.properties[typ.container.propertyId])
-            setattr(clazz, prop, Property(propType))
+            if compact:
+                descriptor = descriptors[prop] = PropertyCompact(propType, index)
+                masks[reference[prop]] = masks[typeFor(reference[prop])] = masks[propType] = descriptor.mask
+            else: descriptor = Property(propType)
+            setattr(clazz, prop, descriptor)
     
         clazz._ally_type = modelType  # This specified the detected type for the model class by using 'typeFor'
         clazz._ally_reference = reference  # The references to be returned by the properties when used only with class
-        clazz.__new__ = ContainerSupport.__new__
+        clazz._ally_contained = {}  # The contained descriptors table, @see: containedFor
         clazz.__str__ = ContainerSupport.__str__
-        clazz.__contains__ = ContainerSupport.__contains__
+        if compact:
+            clazz._ally_descriptors = descriptors
+            clazz._ally_masks = masks
+            clazz._ally_values = ContainerCompactSupport._ally_values
+            clazz.__new__ = ContainerCompactSupport.__new__
+            clazz.__contains__ = ContainerCompactSupport.__contains__
+        else:
+            clazz.__new__ = ContainerSupport.__new__
+            clazz.__contains__ = ContainerSupport.__contains__
     
         return clazz
     if args: return decorator(*args)
@@ -61,7 +61,9 @@ class Reference(TypeSupport):
         raise AttributeError('\'%s\' object has no attribute \'%s\'' % (self.__class__.__name__, name))
 
     def __hash__(self):
-        return hash(self._ally_type)
+        # The reference hash is different from the type hash, this way the references and types can be used as keys
+        # in the same dictionary without colliding.
+        return hash((Reference, self._ally_type))
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
@@ -149,6 +151,64 @@ class Property(IGet, IContained, ISet, IDelete):
     def __str__(self):
         return str(self.type)
 
+class PropertyCompact(Property):
+    '''
+    Provides the descriptor for the properties of the compact models, the values are kept in the slots list of the model
+    object and the presence of a value is marked in the presence bit mask of the model object.
+    '''
+    __slots__ = ('index', 'mask')
+
+    def __init__(self, type, index):
+        '''
+        Constructs the compact model property descriptor.
+        
+        @param type: TypeProperty
+            The property type represented by the property.
+        @param index: integer
+            The index of the property value in the model object slots.
+        '''
+        assert isinstance(index, int), 'Invalid index %s' % index
+        super().__init__(type)
+
+        self.index = index
+        self.mask = 1 << index
+
+    def __get__(self, obj, clazz=None):
+        '''
+        @see: IGet.__get__
+        '''
+        if obj is None: return super().__get__(obj, clazz)
+        assert isinstance(obj, ContainerCompactSupport), 'Invalid compact container object %s' % obj
+        return obj._ally_slots[self.index]
+
+    def __contained__(self, obj):
+        '''
+        @see: IContained.__contained__
+        '''
+        assert isinstance(obj, ContainerCompactSupport), 'Invalid compact container object %s' % obj
+        return obj._ally_mask & self.mask != 0
+
+    def __set__(self, obj, value):
+        '''
+        @see: ISet.__set__
+        '''
+        assert isinstance(obj, ContainerCompactSupport), 'Invalid compact container object %s' % obj
+        assert self.type.parent.isValid(obj), 'Invalid container object %s, expected %s' % (obj, self.type.parent)
+        obj._ally_slots[self.index] = value
+        obj._ally_mask |= self.mask
+        assert log.debug('Success on setting value (%s) for %s', value, self) or True
+
+    def __delete__(self, obj):
+        '''
+        @see: IDelete.__delete__
+        '''
+        assert isinstance(obj, ContainerCompactSupport), 'Invalid compact container object %s' % obj
+        assert self.type.parent.isValid(obj), 'Invalid container object %s, expected %s' % (obj, self.type.parent)
+        if obj._ally_mask & self.mask:
+            obj._ally_slots[self.index] = None
+            obj._ally_mask &= ~self.mask
+            assert log.debug('Success on removing value for %s', self) or True
+
 # --------------------------------------------------------------------
 
 class CriteriaEntry(TypeSupport):
@@ -293,15 +353,15 @@ class ContainerSupport(metaclass=ABCMeta):
         @return: boolean
             True if a value for the reference is present, false otherwise.
         '''
-        typ = typeFor(ref)
-        if not isinstance(typ, TypeProperty): return False
-        assert isinstance(typ, TypeProperty)
-        if typ.parent.isValid(self):
-            descriptor, _clazz = getAttrAndClass(self.__class__, typ.property)
-            if isinstance(descriptor, IContained):
-                assert isinstance(descriptor, IContained)
-                return descriptor.__contained__(self)
-        return False
+        contained = self.__class__.__dict__.get('_ally_contained')
+        try: descriptor = contained[ref]
+        except (KeyError, TypeError):
+            typ = typeFor(ref)
+            try: descriptor = contained[typ]
+            except (KeyError, TypeError): descriptor = containedFor(self, typ)
+            if isinstance(ref, Reference): self.__class__.__dict__['_ally_contained'][ref] = descriptor
+        if descriptor is None: return False
+        return descriptor.__contained__(self)
 
     def __str__(self):
         container = self._ally_type.container
@@ -324,6 +384,54 @@ class ContainerSupport(metaclass=ABCMeta):
             return isinstance(typeFor(C), TypeContainer)
         return NotImplemented
 
+class ContainerCompactSupport(ContainerSupport):
+    '''
+    Support class for compact containers, the compact containers keep the property values in a slots list and the
+    presence of the values in a bit mask instead of the instance dictionary.
+    '''
+    _ally_descriptors = {}  # The compact property descriptors indexed by property name.
+    _ally_masks = {}  # The presence masks indexed by the property references and types.
+
+    def __new__(cls, *args, **keyargs):
+        '''
+        Construct the instance of the compact container.
+        '''
+        assert isinstance(cls._ally_type, TypeContainer), \
+        'Bad container support class %s, no type assigned' % cls._ally_type
+        assert cls._ally_type.isOf(cls), 'Illegal class %s, expected %s' % (cls, cls._ally_type)
+        self = object.__new__(cls)
+        self._ally_slots = [None] * len(cls._ally_type.container.properties)
+        self._ally_mask = 0
+
+        return self
+
+    def __contains__(self, ref):
+        '''
+        @see: ContainerSupport.__contains__
+        '''
+        masks = self.__class__.__dict__.get('_ally_masks')
+        try: mask = masks[ref]
+        except (KeyError, TypeError):
+            try: mask = masks[typeFor(ref)]
+            except (KeyError, TypeError): return ContainerSupport.__contains__(self, ref)
+        return self._ally_mask & mask != 0
+
+    @property
+    def _ally_values(self):
+        '''
+        Provides the dictionary of the property values contained by the compact container, the dictionary is a copy so
+        the changes are not reflected in the container.
+        '''
+        mask, slots = self._ally_mask, self._ally_slots
+        return {prop: slots[descriptor.index] for prop, descriptor in self.__class__._ally_descriptors.items()
+                if mask & descriptor.mask}
+
+    @classmethod
+    def __subclasshook__(cls, C):
+        if cls is ContainerCompactSupport:
+            return isinstance(typeFor(C), TypeContainer) and hasattr(C, '_ally_slots')
+        return NotImplemented
+
 class CriteriaSupport(ContainerSupport):
     '''
     Support class for criterias.
@@ -427,6 +535,32 @@ class QuerySupport(metaclass=ABCMeta):
 
 # --------------------------------------------------------------------
 
+def containedFor(obj, typ):
+    '''
+    Provides the contained descriptor for the property type in the container object. The descriptors are cached in the
+    '_ally_contained' table of the container class so the class hierarchy is searched only once for a property type.
+    
+    @param obj: object
+        The container object to provide the descriptor for.
+    @param typ: Type|None
+        The property type to provide the descriptor for.
+    @return: IContained|None
+        The contained descriptor or None if the property type is not contained by the container class.
+    '''
+    clazz, descriptor = obj.__class__, None
+    if isinstance(typ, TypeProperty):
+        assert isinstance(typ, TypeProperty)
+        if typ.parent.isValid(obj):
+            try: descriptor, _clazz = getAttrAndClass(clazz, typ.property)
+            except AttributeError: pass
+            if not isinstance(descriptor, IContained): descriptor = None
+    else: return None  # Only the property types are cached
+
+    contained = clazz.__dict__.get('_ally_contained')
+    if contained is None: type.__setattr__(clazz, '_ally_contained', {})
+    clazz.__dict__['_ally_contained'][typ] = descriptor
+    return descriptor
+
 def typesFor(ref):
     '''
     Provides the types of the provided references. This function provides a list of types that represent the references.
@@ -15,8 +15,8 @@ from ..api.operator.type import TypeModel, TypeModelProperty, TypeService
 from ..api.type import typeFor
 from ..exception import InputError, Ref
 from ..internationalization import _
-from .binder import bindListener, callListeners, registerProxyBinder, \
-    bindBeforeListener, indexBefore, INDEX_DEFAULT
+from .binder import bindListener, registerProxyBinder, bindBeforeListener, \
+    indexBefore, INDEX_DEFAULT, listenersFor, compiledFor
 from collections import Sized
 from functools import partial
 from inspect import isclass
@@ -44,6 +44,10 @@ EVENT_MODEL_INSERT = 'model_insert'
 # Listener key used for the model insert
 EVENT_MODEL_UPDATE = 'model_update'
 # Listener key used for the model update
+EVENT_MODEL_INSERT_CHECK = 'model_insert_check'
+# Listener key used for the model checks on insert, this checks are performed after the property validations
+EVENT_MODEL_UPDATE_CHECK = 'model_update_check'
+# Listener key used for the model checks on update, this checks are performed after the property validations
 
 EVENT_PROP_INSERT = 'insert:%s'
 # Listener key used for the property insert
@@ -269,6 +273,29 @@ def onPropertyMaxLength(length, prop, obj, errors):
 
 # --------------------------------------------------------------------
 
+def compileValidation(onInsert, clazz):
+    '''
+    Compiles the validation listeners of the model class into a flat validation that is used for all the calls.
+    
+    @param onInsert: boolean
+        Flag indicating that the validation should be compiled for insert if True, False for update.
+    @param clazz: class
+        The model class to compile the validation for.
+    @return: tuple(list[callable], list[tuple(string, list[callable])], list[callable])
+        The model listeners, the properties listeners and the model check listeners.
+    '''
+    typ = typeFor(clazz)
+    assert isinstance(typ, TypeModel), 'Invalid model class %s' % clazz
+    if onInsert: eventModel, eventProp, eventCheck = EVENT_MODEL_INSERT, EVENT_PROP_INSERT, EVENT_MODEL_INSERT_CHECK
+    else: eventModel, eventProp, eventCheck = EVENT_MODEL_UPDATE, EVENT_PROP_UPDATE, EVENT_MODEL_UPDATE_CHECK
+
+    properties = []
+    for prop in typ.container.properties:
+        listeners = listenersFor(clazz, eventProp % prop)
+        if listeners: properties.append((prop, listeners))
+
+    return listenersFor(clazz, eventModel), properties, listenersFor(clazz, eventCheck)
+
 def onCallValidateModel(onInsert, positions, args, keyargs):
     '''
     Process the validation for a model for the specified call.
@@ -293,13 +320,15 @@ def onCallValidateModel(onInsert, positions, args, keyargs):
 
         assert isinstance(typ, TypeModel), 'Invalid model type %s for index %s' % (typ, k)
         assert typ.isValid(obj), 'Invalid object %s for %s' % (obj, typ)
-        if onInsert:
-            if callListeners(typ.clazz, EVENT_MODEL_INSERT, obj, errors):
-                for prop in typ.container.properties:
-                    callListeners(typ.clazz, EVENT_PROP_INSERT % prop, prop, obj, errors)
+        listenersModel, properties, listenersCheck = compiledFor(typ.clazz, (compileValidation, onInsert),
+                                                                 partial(compileValidation, onInsert))
+        for listener in listenersModel:
+            if listener(obj, errors) == False: break
         else:
-            if callListeners(typ.clazz, EVENT_MODEL_UPDATE, obj, errors):
-                for prop in typ.container.properties:
-                    callListeners(typ.clazz, EVENT_PROP_UPDATE % prop, prop, obj, errors)
+            for prop, listeners in properties:
+                for listener in listeners:
+                    if listener(prop, obj, errors) == False: break
+            for listener in listenersCheck:
+                if listener(obj, errors) == False: break
 
     if errors: raise InputError(*errors)
@@ -17,6 +17,12 @@ from inspect import isclass
 from ally.api.criteria import AsBoolean, AsLike, AsEqual, AsOrdered
 from itertools import chain
 from collections import Sized
+from ally.api.operator.container import Model
+
+# --------------------------------------------------------------------
+
+_changeListeners = []
+# The listeners that are notified about the changes made on the models entities.
 
 # --------------------------------------------------------------------
 
@@ -207,3 +213,40 @@ def likeAsRegex(like, caseInsensitive=True):
     if caseInsensitive: likeRegex = re.compile(likeRegex, re.IGNORECASE)
     else: likeRegex = re.compile(likeRegex)
     return likeRegex
+
+# --------------------------------------------------------------------
+
+def addChangeListener(listener):
+    '''
+    Adds a listener to be notified whenever the entities of a model are changed by a service implementation, this is
+    used mainly by caches that need to invalidate data related to the model. The listeners are notified only for the
+    changes made in the current process.
+    
+    @param listener: callable(Model)
+        The listener to be called with the changed model.
+    '''
+    assert callable(listener), 'Invalid listener %s' % listener
+    if listener not in _changeListeners: _changeListeners.append(listener)
+
+def removeChangeListener(listener):
+    '''
+    Removes a listener added with @see: addChangeListener.
+    
+    @param listener: callable(Model)
+        The listener to remove.
+    '''
+    try: _changeListeners.remove(listener)
+    except ValueError: pass
+
+def notifyChange(model):
+    '''
+    Notifies the change listeners that the entities of the model have been inserted, updated or deleted.
+    
+    @param model: Model|class
+        The changed model or model class.
+    '''
+    if not isinstance(model, Model):
+        typ = typeFor(model)
+        assert isinstance(typ, TypeModel), 'Invalid model %s' % model
+        model = typ.container
+    for listener in list(_changeListeners): listener(model)
@@ -58,6 +58,14 @@ def allow_method_override():
     '''
     return True
 
+@ioc.config
+def multipart_spool_threshold():
+    '''
+    The size in bytes above which a multi part body is spooled to a temporary file, the smaller bodies are kept in
+    memory. If 0 the multi part bodies are not spooled and are read directly from the request content.
+    '''
+    return 1024 * 1024
+
 # --------------------------------------------------------------------
 
 @ioc.entity
@@ -114,6 +122,7 @@ def parserMultiPart() -> Handler:
     b.charSetDefault = default_characterset()
     b.parsingAssembly = parsingAssembly()
     b.populateAssembly = assemblyMultiPartPopulate()
+    b.spoolThreshold = multipart_spool_threshold()
     return b
 
 @ioc.entity
@@ -0,0 +1,51 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally core http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides the configurations for the response cache processor.
+'''
+
+from ..ally_core.processor import assemblyResources, invoking
+from ..ally_core_http.processor import updateAssemblyResourcesForHTTP
+from ally.container import ioc
+from ally.core.http.impl.processor.cache import ResponseCacheHandler
+from ally.design.processor import Handler
+
+# --------------------------------------------------------------------
+
+@ioc.config
+def response_cache() -> bool:
+    '''
+    Indicates that the rendered responses of the GET resources should be cached, the cached responses are invalidated
+    whenever the services notify changes on the response models or when the cache time expires.
+    '''
+    return False
+
+@ioc.config
+def response_cache_size() -> int:
+    '''The maximum number of responses kept in the cache'''
+    return 1000
+
+@ioc.config
+def response_cache_time() -> int:
+    '''The time in seconds for which a cached response is valid'''
+    return 10
+
+# --------------------------------------------------------------------
+
+@ioc.entity
+def responseCache() -> Handler:
+    b = ResponseCacheHandler()
+    b.size = response_cache_size()
+    b.timeToLive = response_cache_time()
+    return b
+
+# --------------------------------------------------------------------
+
+@ioc.after(updateAssemblyResourcesForHTTP)
+def updateAssemblyResourcesForCache():
+    if response_cache(): assemblyResources().add(responseCache(), before=invoking())
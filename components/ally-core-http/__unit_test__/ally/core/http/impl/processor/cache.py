@@ -0,0 +1,185 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally core http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides testing for the response cache.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import model, query, service, call, GET, INSERT
+from ally.api.criteria import AsLikeOrdered
+from ally.api.type import typeFor, Iter
+from ally.container import ioc
+from ally.core.http.impl.processor.cache import ResponseCacheHandler, \
+    ResponseCache, keyForValue
+from ally.core.impl.invoker import InvokerCall
+from ally.core.spec.resources import Invoker
+from ally.design.context import Context, defines, requires
+from ally.design.processor import Assembly, Chain, HandlerProcessorProceed, \
+    NO_VALIDATION
+from ally.http.impl.processor.header import HeaderHandler
+from ally.http.spec.server import IEncoderHeader
+from ally.support.api.util_service import notifyChange
+from ally.support.util_io import IInputStream
+from collections import Iterable
+from io import BytesIO
+import unittest
+
+# --------------------------------------------------------------------
+
+@model(id='Id')
+class Post:
+    Id = int
+    Name = str
+
+@query(Post)
+class QPost:
+    name = AsLikeOrdered
+
+@service
+class IPostService:
+
+    @call
+    def getAll(self, q:QPost=None) -> Iter(Post):
+        '''
+        Nothing.
+        '''
+
+class PostService(IPostService):
+
+    def getAll(self, q=None):
+        return ()
+
+class Request(Context):
+    scheme = defines(str)
+    method = defines(int)
+    uriRoot = defines(str)
+    uri = defines(str)
+    headers = defines(dict)
+    invoker = defines(Invoker)
+    arguments = defines(dict)
+
+class Response(Context):
+    code = defines(int)
+    isSuccess = defines(bool)
+    encoderHeader = requires(IEncoderHeader)
+
+class ResponseContent(Context):
+    source = defines(IInputStream, Iterable)
+
+class HandlerRender(HandlerProcessorProceed):
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        self.stream = False
+
+    def process(self, response:Response, responseCnt:ResponseContent, **keyargs):
+        self.count += 1
+        response.code, response.isSuccess = 200, True
+        response.encoderHeader.encode('Content-Type', 'text/json')
+        if self.stream: responseCnt.source = StreamRender(b'render %d' % self.count)
+        else: responseCnt.source = (chunk for chunk in (b'render ', str(self.count).encode()))
+
+class StreamRender:
+
+    def __init__(self, content):
+        self.content = BytesIO(content)
+
+    def read(self, nbytes=None):
+        return self.content.read(nbytes)
+
+    def close(self):
+        self.content.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+# --------------------------------------------------------------------
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.handlerCache = ResponseCacheHandler()
+        ioc.initialize(self.handlerCache)
+        self.handlerRender = HandlerRender()
+
+        handlerHeader = HeaderHandler()
+        ioc.initialize(handlerHeader)
+
+        assembly = Assembly()
+        assembly.add(handlerHeader, self.handlerCache, self.handlerRender)
+        self.processing = assembly.create(NO_VALIDATION, request=Request, response=Response,
+                                          responseCnt=ResponseContent)
+        self.invoker = InvokerCall(PostService(), typeFor(IPostService).service.calls['getAll'])
+
+    def execute(self, method=GET, q=None, host='localhost'):
+        request, response = self.processing.contexts['request'](), self.processing.contexts['response']()
+        responseCnt = self.processing.contexts['responseCnt']()
+        request.scheme, request.method, request.uriRoot, request.uri = 'http', method, 'resources/', 'Post'
+        request.headers, request.invoker, request.arguments = {'Host': host}, self.invoker, {'q': q}
+        Chain(self.processing).process(request=request, response=response, responseCnt=responseCnt).doAll()
+        return b''.join(responseCnt.source), response.headers
+
+    def testCache(self):
+        self.assertEqual(self.execute()[0], b'render 1')
+        content, headers = self.execute()
+        self.assertEqual(content, b'render 1')
+        self.assertEqual(headers, {'Content-Type': 'text/json', 'Content-Length': '8'})
+
+        self.assertEqual(self.execute(host='other')[0], b'render 2')
+        self.assertEqual(self.execute(q=QPost(name='a%'))[0], b'render 3')
+        self.assertEqual(self.execute(q=QPost(name='a%'))[0], b'render 3')
+        self.assertEqual(self.execute(method=INSERT)[0], b'render 4')
+        self.assertEqual(self.handlerRender.count, 4)
+
+    def testCacheStream(self):
+        self.handlerRender.stream = True
+        self.assertEqual(self.execute()[0], b'render 1')
+        self.assertEqual(self.execute()[0], b'render 1')
+        self.assertEqual(self.handlerRender.count, 1)
+
+    def testInvalidate(self):
+        self.assertEqual(self.execute()[0], b'render 1')
+        notifyChange(Post)
+        self.assertEqual(self.execute()[0], b'render 2')
+        self.assertEqual(self.execute()[0], b'render 2')
+
+    def testCacheEviction(self):
+        cache = ResponseCache(2, 60)
+        for k in range(3): cache.put(k, None, cache.generation, k)
+        self.assertEqual((cache.get(0), cache.get(1), cache.get(2)), (None, 1, 2))
+
+        model = typeFor(Post).container
+        generation = cache.generation
+        cache.invalidate(model)
+        cache.put(3, model, generation, 3)
+        self.assertIsNone(cache.get(3))
+
+        cache = ResponseCache(2, -1)
+        cache.put(0, None, cache.generation, 0)
+        self.assertIsNone(cache.get(0))
+
+    def testKeyForValue(self):
+        q1, q2 = QPost(name='a%'), QPost(name='a%')
+        q2.name.orderAsc()
+        self.assertEqual(keyForValue({'q': q1}), keyForValue({'q': QPost(name='a%')}))
+        self.assertNotEqual(keyForValue({'q': q1}), keyForValue({'q': q2}))
+        self.assertRaises(TypeError, keyForValue, {'q': {1, 2}})
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,133 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally core http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides testing for the models fetching.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import model, service, call
+from ally.api.type import typeFor, Iter
+from ally.core.http.impl.processor.fetcher import FetcherInvoker, Fetcher
+from ally.core.http.spec.transform.support_model import DataModel
+from ally.core.impl.invoker import InvokerCall
+from ally.design.context import Context, defines
+import unittest
+
+# --------------------------------------------------------------------
+
+@model(id='Id')
+class User:
+    Id = int
+    Name = str
+
+@model(id='Id')
+class Post:
+    Id = int
+    Author = User
+
+@service
+class IUserService:
+
+    @call
+    def getById(self, id:User.Id) -> User:
+        '''
+        Nothing.
+        '''
+
+@service
+class IPostService:
+
+    @call
+    def getAll(self) -> Iter(Post):
+        '''
+        Nothing.
+        '''
+
+class UserService(IUserService):
+
+    def __init__(self):
+        self.calls = []
+
+    def getById(self, id):
+        self.calls.append(id)
+        return self.create(id)
+
+    def getByIds(self, ids):
+        self.calls.append(sorted(ids))
+        return {id: self.create(id) for id in ids if id < 100}
+
+    def create(self, id):
+        user = User()
+        user.Id, user.Name = id, 'User %s' % id
+        return user
+
+class PostService(IPostService):
+
+    def getAll(self):
+        for k in range(10):
+            post = Post()
+            post.Id, post.Author = k, k % 3 if k < 9 else 100
+            yield post
+
+class Response(Context):
+    encoderData = defines(dict)
+    encoderDataModel = defines(DataModel)
+
+# --------------------------------------------------------------------
+
+class TestFetcher(unittest.TestCase):
+
+    def testBulkFetch(self):
+        userService = UserService()
+        invokerUser = InvokerCall(userService, typeFor(IUserService).service.calls['getById'])
+        invokerPost = InvokerCall(PostService(), typeFor(IPostService).service.calls['getAll'])
+
+        data = DataModel()
+        data.datas['Author'] = dataAuthor = DataModel()
+        dataAuthor.fetchReference, dataAuthor.fetchEncode, dataAuthor.fetchData = Post.Author, lambda: None, DataModel()
+
+        fetcherInvoker = FetcherInvoker(invokerPost)
+        fetcherInvoker.addFetch(Post.Author, invokerUser, [None], userService.getByIds)
+
+        response = Response()
+        response.encoderData, response.encoderDataModel = {}, data
+        posts = fetcherInvoker.invoke(response)
+        self.assertIsInstance(posts, list)
+        self.assertEqual(userService.calls, [[0, 1, 2, 100]])
+
+        fetcher = response.encoderData['fetcher']
+        self.assertIsInstance(fetcher, Fetcher)
+        self.assertEqual([fetcher.fetch(Post.Author, post.Author).Name for post in posts],
+                         ['User 0', 'User 1', 'User 2'] * 3 + ['User 100'])
+        # The id that is not delivered by the bulk fetch is fetched one by one.
+        self.assertEqual(userService.calls, [[0, 1, 2, 100], 100])
+
+    def testNoBulkFetch(self):
+        userService = UserService()
+        invokerUser = InvokerCall(userService, typeFor(IUserService).service.calls['getById'])
+        invokerPost = InvokerCall(PostService(), typeFor(IPostService).service.calls['getAll'])
+
+        fetcherInvoker = FetcherInvoker(invokerPost)
+        fetcherInvoker.addFetch(Post.Author, invokerUser, [None])
+
+        response = Response()
+        response.encoderData, response.encoderDataModel = {}, DataModel()
+        posts = list(fetcherInvoker.invoke(response))
+        fetcher = response.encoderData['fetcher']
+        for post in posts: fetcher.fetch(Post.Author, post.Author)
+        self.assertEqual(userService.calls, [0, 1, 2, 100])
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,144 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally core http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides testing for the multi part parsing.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.container import ioc
+from ally.core.http.impl.processor.parsing_multipart import DataMultiPart, \
+    StreamMultiPart, NextContent, RequestPopulate, RequestContentMultiPart
+from ally.core.impl.processor.parsing import Response
+from ally.design.context import Context, requires
+from ally.design.processor import Assembly, NO_MISSING_VALIDATION, \
+    HandlerProcessorProceed
+from io import BytesIO
+import unittest
+
+# --------------------------------------------------------------------
+
+class StreamChunks:
+
+    def __init__(self, content, size):
+        self.content, self.size = BytesIO(content), size
+
+    def read(self, nbytes=None):
+        return self.content.read(min(self.size, nbytes) if nbytes is not None and nbytes >= 0 else self.size)
+
+class Request(Context):
+    headers = requires(dict)
+
+class HandlerHeaders(HandlerProcessorProceed):
+
+    def __init__(self):
+        super().__init__()
+        self.headers = []
+
+    def process(self, request:Request, **keyargs):
+        self.headers.append(request.headers)
+
+def multipart(*bodies, boundary='AaB03x'):
+    parts = [b'preamble\r\n']
+    for headers, body in bodies:
+        parts.append(('--%s\r\n' % boundary).encode())
+        parts.extend(('%s: %s\r\n' % header).encode() for header in headers.items())
+        parts.append(b'\r\n')
+        parts.append(body)
+        parts.append(b'\r\n')
+    parts.append(('--%s--\r\n' % boundary).encode())
+    return b''.join(parts)
+
+# --------------------------------------------------------------------
+
+class TestParsingMultiPart(unittest.TestCase):
+
+    def setUp(self):
+        self.data = DataMultiPart()
+        ioc.initialize(self.data)
+        self.handlerHeaders = HandlerHeaders()
+        assembly = Assembly()
+        assembly.add(self.handlerHeaders)
+        self.processing = assembly.create(NO_MISSING_VALIDATION, request=RequestPopulate,
+                                          requestCnt=RequestContentMultiPart, response=Response)
+
+    def contents(self, content, chunk):
+        stream = StreamMultiPart(self.data, StreamChunks(content, chunk), 'AaB03x')
+        requestCnt = self.processing.contexts['requestCnt']()
+        response = self.processing.contexts['response']()
+        contents = []
+        requestCnt = NextContent(requestCnt, response, self.processing, self.data, stream)()
+        while requestCnt is not None:
+            contents.append(requestCnt)
+            requestCnt = requestCnt.fetchNextContent()
+        return contents
+
+    def testStream(self):
+        self.data.spoolThreshold = 0
+        large = bytes(range(256)) * 300 + b'\r\n--AaB03 no mark'
+        content = multipart(({'Content-Disposition': 'form-data; name="a"'}, b'value a'),
+                            ({'Content-Type': 'image/png'}, large), ({}, b''))
+
+        for chunk in (1, 7, 100, 4096, len(content)):
+            for packageSize in (1, 10, 1024):
+                self.data.packageSize = packageSize
+                stream = StreamMultiPart(self.data, StreamChunks(content, chunk), 'AaB03x')
+                requestCnt = NextContent(self.processing.contexts['requestCnt'](),
+                                         self.processing.contexts['response'](), self.processing, self.data, stream)()
+                self.assertIsInstance(requestCnt.source, StreamMultiPart)
+                self.assertEqual(requestCnt.source.read(), b'value a')
+
+                requestCnt = requestCnt.fetchNextContent()
+                data = bytearray()
+                while True:
+                    read = requestCnt.source.read(333)
+                    if not read: break
+                    data.extend(read)
+                self.assertEqual(bytes(data), large)
+
+                requestCnt = requestCnt.fetchNextContent()
+                self.assertEqual(requestCnt.source.read(), b'')
+                self.assertIsNone(requestCnt.fetchNextContent())
+
+        self.assertEqual(self.handlerHeaders.headers[-3:], [{'Content-Disposition': 'form-data; name="a"'},
+                                                            {'Content-Type': 'image/png'}, {}])
+
+    def testSpool(self):
+        self.data.spoolThreshold = 1024
+        large = b'x' * 5000
+        content = multipart(({'Content-Disposition': 'form-data; name="a"'}, b'value a'),
+                            ({'Content-Type': 'image/png'}, large))
+
+        for chunk in (1, 100, len(content)):
+            contents = self.contents(content, chunk)
+            self.assertEqual(len(contents), 2)
+            self.assertEqual(contents[0].source.read(), b'value a')
+            self.assertFalse(contents[0].source._rolled)
+            self.assertTrue(contents[1].source._rolled)
+            self.assertEqual(contents[1].source.read(), large)
+            contents[1].source.seek(10)
+            self.assertEqual(contents[1].source.read(5), b'xxxxx')
+
+    def testSkip(self):
+        self.data.spoolThreshold = 0
+        content = multipart(({'Content-Type': 'text/plain'}, b'a' * 5000), ({'Content-Type': 'text/plain'}, b'b'))
+        stream = StreamMultiPart(self.data, StreamChunks(content, 100), 'AaB03x')
+        requestCnt = NextContent(self.processing.contexts['requestCnt'](), self.processing.contexts['response'](),
+                                 self.processing, self.data, stream)()
+        self.assertEqual(requestCnt.source.read(10), b'a' * 10)
+        requestCnt = requestCnt.fetchNextContent()
+        self.assertEqual(requestCnt.source.read(), b'b')
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,59 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally core http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides testing for the Babel conversion.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.type import Date, Number
+from ally.container import ioc
+from ally.core.http.impl.processor.text_conversion import \
+    BabelConversionDecodeHandler, ConverterBabel
+from ally.core.spec.resources import Normalizer
+import unittest
+
+# --------------------------------------------------------------------
+
+class TestTextConversion(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = BabelConversionDecodeHandler()
+        self.handler.normalizer = Normalizer()
+        self.handler.languageDefault = 'en'
+        self.handler.cacheSize = 3
+        ioc.initialize(self.handler)
+
+    def testLocale(self):
+        locale = self.handler.localeFor('en-US', '-')
+        self.assertEqual(str(locale), 'en_US')
+        self.assertIs(self.handler.localeFor('en-US', '-'), locale)
+        self.assertIsNone(self.handler.localeFor('not a language', '-'))
+        self.assertIsNone(self.handler.localeFor('not a language', '-'))
+
+    def testConverter(self):
+        locale = self.handler.localeFor('en')
+        converter = self.handler.converterFor(locale, {Date: 'yyyy-MM-dd'})
+        self.assertTrue(isinstance(converter, ConverterBabel))
+        self.assertEqual(converter.formats[Date], 'yyyy-MM-dd')
+        self.assertIn(Number, converter.formats)
+        self.assertIs(self.handler.converterFor(locale, {Date: 'yyyy-MM-dd'}), converter)
+        self.assertIsNot(self.handler.converterFor(locale, {}), converter)
+
+    def testCacheBound(self):
+        for language in ('en', 'fr', 'de', 'ro', 'xx1', 'xx2'): self.handler.localeFor(language)
+        self.assertEqual(len(self.handler._cache), 3)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,330 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally core http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides the cache for the rendered responses of the GET resources.
+'''
+
+from ally.api.config import GET
+from ally.api.operator.descriptor import ContainerSupport, QuerySupport
+from ally.api.operator.type import TypeModel, TypeModelProperty
+from ally.api.type import Iter
+from ally.container.ioc import injected
+from ally.core.http.impl.processor.fetcher import FetcherInvoker
+from ally.core.spec.resources import Invoker
+from ally.design.context import Context, requires, defines, optional
+from ally.design.processor import HandlerProcessor, Chain
+from ally.http.spec.server import IDecoderHeader, IEncoderHeader
+from ally.support.api.util_service import addChangeListener
+from ally.support.util_io import IInputStream, readGenerator
+from collections import Iterable, OrderedDict
+from threading import Lock
+import logging
+import time
+
+# --------------------------------------------------------------------
+
+log = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------
+
+class Request(Context):
+    '''
+    The request context.
+    '''
+    # ---------------------------------------------------------------- Required
+    scheme = requires(str)
+    method = requires(int)
+    uriRoot = requires(str)
+    uri = requires(str)
+    decoderHeader = requires(IDecoderHeader)
+    invoker = requires(Invoker)
+    arguments = requires(dict)
+
+class Response(Context):
+    '''
+    The response context.
+    '''
+    # ---------------------------------------------------------------- Defined
+    code = defines(int)
+    isSuccess = defines(bool)
+    text = defines(str)
+    # ---------------------------------------------------------------- Required
+    headers = requires(dict)
+    encoderHeader = requires(IEncoderHeader)
+    # ---------------------------------------------------------------- Optional
+    language = optional(str)
+
+class ResponseContent(Context):
+    '''
+    The response content context.
+    '''
+    # ---------------------------------------------------------------- Defined
+    source = defines(IInputStream, Iterable)
+    length = defines(int)
+    # ---------------------------------------------------------------- Optional
+    type = optional(str)
+    charSet = optional(str)
+
+# --------------------------------------------------------------------
+
+@injected
+class ResponseCacheHandler(HandlerProcessor):
+    '''
+    Implementation for a processor that caches the rendered responses of the GET invokers. The responses are identified
+    by the invoker, the invoker arguments, the URI and the negotiated content type, character set and language. If a
+    cached response is found the processing chain is stopped and the cached content is delivered, otherwise the content
+    rendered by the next processors is captured and cached. The cached responses for a model are invalidated whenever
+    a service notifies a change on that model, @see: ally.support.api.util_service.notifyChange. The change notifications
+    are provided only for the changes made in the same process, so when the server runs with worker processes the
+    responses cached by the other workers are invalidated only by their time to live.
+    '''
+
+    size = 1000
+    # The maximum number of responses kept in the cache.
+    timeToLive = 10
+    # The time in seconds for which a cached response is valid.
+    contentSizeMax = 512 * 1024
+    # The maximum size in bytes of a response content that is cached.
+    headerHost = 'Host'
+    # The header name for the host.
+    headersVary = ['X-Filter', 'X-TimeZone']
+    # The header names that influence the rendered content and need to be part of the cache key.
+    nameContentLength = 'Content-Length'
+    # The header name for the content length.
+
+    def __init__(self):
+        assert isinstance(self.size, int), 'Invalid size %s' % self.size
+        assert isinstance(self.timeToLive, (int, float)), 'Invalid time to live %s' % self.timeToLive
+        assert isinstance(self.contentSizeMax, int), 'Invalid content size maximum %s' % self.contentSizeMax
+        assert isinstance(self.headerHost, str), 'Invalid string %s' % self.headerHost
+        assert isinstance(self.headersVary, (list, tuple)), 'Invalid vary headers %s' % self.headersVary
+        assert isinstance(self.nameContentLength, str), 'Invalid content length name %s' % self.nameContentLength
+        super().__init__()
+
+        self.cache = ResponseCache(self.size, self.timeToLive)
+        addChangeListener(self.cache.invalidate)
+
+    def process(self, chain, request:Request, response:Response, responseCnt:ResponseContent, **keyargs):
+        '''
+        @see: HandlerProcessor.process
+
+        Delivers the cached response or captures the rendered response.
+        '''
+        assert isinstance(chain, Chain), 'Invalid processors chain %s' % chain
+        assert isinstance(request, Request), 'Invalid request %s' % request
+        assert isinstance(response, Response), 'Invalid response %s' % response
+        assert isinstance(responseCnt, ResponseContent), 'Invalid response content %s' % responseCnt
+
+        if response.isSuccess is not False and request.method == GET:  # Skip in case the response is in error
+            assert isinstance(request.invoker, Invoker), 'Invalid request invoker %s' % request.invoker
+
+            key = self.keyFor(request, response, responseCnt)
+            if key is not None:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    assert log.debug('Delivering cached response for %s', request.uri) or True
+                    (response.code, response.isSuccess), response.text, headers, content = cached
+                    response.headers.update(headers)
+                    if self.nameContentLength not in headers:
+                        assert isinstance(response.encoderHeader, IEncoderHeader), \
+                        'Invalid header encoder %s' % response.encoderHeader
+                        response.encoderHeader.encode(self.nameContentLength, str(len(content)))
+                    responseCnt.source, responseCnt.length = (content,), len(content)
+                    return  # The chain is stopped since the response is delivered from cache
+
+                model, generation = modelFor(request.invoker.output), self.cache.generation
+                def onFinalize():
+                    '''
+                    Captures the rendered response.
+                    '''
+                    if response.isSuccess is not True or responseCnt.source is None: return
+                    if ResponseContent.length in responseCnt and responseCnt.length > self.contentSizeMax: return
+                    cached = (response.code, response.isSuccess), response.text, dict(response.headers)
+                    responseCnt.source = self.capture(key, model, generation, cached, responseCnt.source)
+
+                chain.callBack(onFinalize)
+
+        chain.proceed()
+
+    # ----------------------------------------------------------------
+
+    def keyFor(self, request, response, responseCnt):
+        '''
+        Provides the cache key for the request.
+
+        @return: tuple|None
+            The key, None if the response cannot be cached.
+        '''
+        assert isinstance(request, Request), 'Invalid request %s' % request
+        assert isinstance(response, Response), 'Invalid response %s' % response
+        assert isinstance(responseCnt, ResponseContent), 'Invalid response content %s' % responseCnt
+        assert isinstance(request.decoderHeader, IDecoderHeader), \
+        'Invalid request decoder header %s' % request.decoderHeader
+
+        try: arguments = keyForValue(request.arguments)
+        except TypeError:
+            assert log.debug('Cannot cache the response for the unhashable arguments %s', request.arguments) or True
+            return None
+
+        invoker = request.invoker
+        # The fetcher invokers are created for each request so the wrapped invoker is used.
+        while isinstance(invoker, FetcherInvoker): invoker = invoker.invoker
+
+        headers = tuple(request.decoderHeader.retrieve(name) for name in self.headersVary)
+        return (invoker, arguments, request.scheme, request.decoderHeader.retrieve(self.headerHost),
+                request.uriRoot, request.uri, responseCnt.type, responseCnt.charSet, response.language, headers)
+
+    def capture(self, key, model, generation, cached, source):
+        '''
+        Generator that captures the content of the source and caches it after is fully delivered.
+        '''
+        if isinstance(source, IInputStream): source = readGenerator(source)
+        chunks, size = [], 0
+        for chunk in source:
+            size += len(chunk)
+            if chunks is not None:
+                if size > self.contentSizeMax: chunks = None
+                else: chunks.append(chunk)
+            yield chunk
+        if chunks is not None: self.cache.put(key, model, generation, cached + (b''.join(chunks),))
+
+# --------------------------------------------------------------------
+
+class ResponseCache:
+    '''
+    Provides a least recently used cache with time to live for the responses, the cached responses are associated with
+    a model in order to be invalidated whenever the model is changed.
+    '''
+    __slots__ = ('size', 'timeToLive', 'generation', '_entries', '_keysByModel', '_invalidated', '_invalidatedAll',
+                 '_lock')
+
+    def __init__(self, size=1000, timeToLive=10):
+        '''
+        Construct the response cache.
+
+        @param size: integer
+            The maximum number of responses kept in the cache.
+        @param timeToLive: integer|float
+            The time in seconds for which a cached response is valid.
+        @ivar generation: integer
+            The invalidation generation, it is incremented on each invalidation.
+        '''
+        assert isinstance(size, int) and size > 0, 'Invalid size %s' % size
+        assert isinstance(timeToLive, (int, float)), 'Invalid time to live %s' % timeToLive
+        self.size = size
+        self.timeToLive = timeToLive
+        self.generation = 0
+
+        self._entries = OrderedDict()
+        self._keysByModel = {}
+        self._invalidated = {}
+        self._invalidatedAll = -1
+        self._lock = Lock()
+
+    def get(self, key):
+        '''
+        Provides the cached value for the key.
+
+        @param key: tuple
+            The key of the cached value.
+        @return: object|None
+            The cached value or None if there is no valid cached value.
+        '''
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None: return None
+            if entry[0] < time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def put(self, key, model, generation, value):
+        '''
+        Caches the value for the key.
+
+        @param key: tuple
+            The key of the cached value.
+        @param model: Model|None
+            The model the value is related to.
+        @param generation: integer
+            The cache generation at the moment the value started to be obtained, if the model has been invalidated since
+            then the value is not cached.
+        @param value: object
+            The value to cache.
+        '''
+        with self._lock:
+            if max(self._invalidated.get(model, -1), self._invalidatedAll) > generation: return
+            self._remove(key)
+            self._entries[key] = (time.time() + self.timeToLive, model, value)
+            keys = self._keysByModel.get(model)
+            if keys is None: keys = self._keysByModel[model] = set()
+            keys.add(key)
+            while len(self._entries) > self.size: self._remove(next(iter(self._entries)))
+
+    def invalidate(self, model=None):
+        '''
+        Invalidates the cached values related to the model.
+
+        @param model: Model|None
+            The model to invalidate the values for, if None all the cached values are invalidated.
+        '''
+        with self._lock:
+            self.generation += 1
+            if model is None:
+                self._invalidatedAll = self.generation
+                self._entries.clear()
+                self._keysByModel.clear()
+                return
+            self._invalidated[model] = self.generation
+            for key in self._keysByModel.pop(model, ()): self._entries.pop(key, None)
+
+    # ----------------------------------------------------------------
+
+    def _remove(self, key):
+        '''
+        Removes the cached value for the key, the lock needs to be acquired.
+        '''
+        entry = self._entries.pop(key, None)
+        if entry is None: return
+        keys = self._keysByModel.get(entry[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys: del self._keysByModel[entry[1]]
+
+# --------------------------------------------------------------------
+
+def modelFor(typ):
+    '''
+    Provides the model of the type.
+
+    @param typ: Type
+        The type to provide the model for.
+    @return: Model|None
+        The model of the type or None if the type is not model related.
+    '''
+    if isinstance(typ, Iter): typ = typ.itemType
+    if isinstance(typ, (TypeModel, TypeModelProperty)): return typ.container
+
+def keyForValue(value):
+    '''
+    Provides a hashable key for the value, the query and model objects are keyed based on their values.
+
+    @param value: object
+        The value to provide the key for.
+    @return: object
+        The hashable key.
+    @raise TypeError: If the value cannot be keyed.
+    '''
+    if isinstance(value, (QuerySupport, ContainerSupport)):
+        return (value.__class__, frozenset((name, keyForValue(val)) for name, val in value._ally_values.items()
+                                           if not name.startswith('_ally')))
+    if isinstance(value, dict): return frozenset((name, keyForValue(val)) for name, val in value.items())
+    if isinstance(value, (list, tuple)): return tuple(keyForValue(val) for val in value)
+    hash(value)
+    return value
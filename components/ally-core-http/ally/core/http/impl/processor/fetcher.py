@@ -9,13 +9,16 @@ Created on Jul 31, 2012
 Provides the standard headers handling.
 '''
 
+from ally.api.extension import IterPart
 from ally.api.operator.type import TypeModelProperty, TypeModel
-from ally.api.type import Input, typeFor, TypeClass, Type
+from ally.api.type import Input, typeFor, TypeClass, Type, Iter
 from ally.container.ioc import injected
 from ally.core.http.spec.transform.support_model import DataModel, IFetcher
+from ally.core.impl.invoker import InvokerCall
 from ally.core.spec.resources import Path, Node, Invoker, INodeInvokerListener
 from ally.design.context import Context, requires, optional
 from ally.design.processor import HandlerProcessorProceed
+from collections import deque
 from weakref import WeakKeyDictionary
 import logging
 
@@ -52,12 +55,17 @@ class FetcherHandler(HandlerProcessorProceed, INodeInvokerListener):
     Implementation for a handler that provides the fetcher used in getting the filtered models.
     '''
     typeResponse = TypeClass(Response)
+    nameBulkCall = '%ss'
+    # The name format used for the optional service implementation method that delivers in bulk the models for the
+    # fetched references, as an example for the 'getById' call the 'getByIds' method is used. The method receives a list
+    # of ids and needs to return a dictionary having as a key the id and as a value the model.
 
     def __init__(self):
         '''
         Construct the encoder.
         '''
         assert isinstance(self.typeResponse, Type), 'Invalid type response %s' % self.typeResponse
+        assert isinstance(self.nameBulkCall, str), 'Invalid bulk call name %s' % self.nameBulkCall
         super().__init__()
 
         self._cache = WeakKeyDictionary()
@@ -121,7 +129,12 @@ class FetcherHandler(HandlerProcessorProceed, INodeInvokerListener):
                                 log.warning('Cannot locate any input main invoker %s input for invoker %s and input %s',
                                             invokerMain, invoker, inp)
                                 break
-                    else: fetcher.addFetch(reference, invoker, indexes)
+                    else:
+                        if indexes == [None] and isinstance(invoker, InvokerCall):
+                            assert isinstance(invoker, InvokerCall)
+                            bulk = getattr(invoker.implementation, self.nameBulkCall % invoker.call.name, None)
+                        else: bulk = None
+                        fetcher.addFetch(reference, invoker, indexes, bulk)
 
                 fetcher.inputs.append(Input('$response', self.typeResponse, True, None))
 
@@ -168,7 +181,7 @@ class FetcherInvoker(Invoker):
     '''
     Invoker that provides the model fetching.
     '''
-    __slots__ = ('invoker', 'references', 'invokers')
+    __slots__ = ('invoker', 'references', 'invokers', 'hasBulk')
 
     def __init__(self, invoker):
         '''
@@ -181,6 +194,7 @@ class FetcherInvoker(Invoker):
         self.invoker = invoker
         self.references = {}
         self.invokers = []
+        self.hasBulk = False
 
     def addInput(self, inp):
         '''
@@ -198,7 +212,7 @@ class FetcherInvoker(Invoker):
 
         return len(self.inputs) - 1
 
-    def addFetch(self, reference, invoker, indexes):
+    def addFetch(self, reference, invoker, indexes, bulk=None):
         '''
         Add a new reference entry in the fetcher.
         
@@ -209,12 +223,16 @@ class FetcherInvoker(Invoker):
         @param indexes: list[integer]
             The indexes in the invoker arguments to be used for the invoker at fetching, basically all the indexes of
             the arguments (beside of the model id one which is None in the indexes) to be used for call the invoker.
+        @param bulk: callable(list) -> dictionary{object, object}|None
+            The callable used for fetching in bulk the models for a list of ids.
         '''
         assert isinstance(invoker, Invoker), 'Invalid invoker %s' % invoker
         assert isinstance(indexes, list), 'Invalid indexes list %s' % indexes
+        assert bulk is None or callable(bulk), 'Invalid bulk callable %s' % bulk
 
         self.references[reference] = len(self.invokers)
-        self.invokers.append((invoker, indexes))
+        self.invokers.append((invoker, indexes, bulk))
+        if bulk is not None: self.hasBulk = True
 
     def invoke(self, *args):
         '''
@@ -222,8 +240,23 @@ class FetcherInvoker(Invoker):
         '''
         response = args[-1]
         assert isinstance(response, Response), 'Invalid response %s' % response
-        response.encoderData.update(fetcher=Fetcher(self, args))
-        return self.invoker.invoke(*args[:len(self.invoker.inputs)])
+        fetcher = Fetcher(self, args)
+        response.encoderData.update(fetcher=fetcher)
+        value = self.invoker.invoke(*args[:len(self.invoker.inputs)])
+        if not self.hasBulk or value is None: return value
+
+        # The referenced models are fetched in bulk before encoding, this means that the value needs to be iterable twice.
+        if isinstance(value, IterPart):
+            assert isinstance(value, IterPart)
+            if not isinstance(value.wrapped, (list, tuple)): value.wrapped = list(value.wrapped)
+            values = value.wrapped
+        elif isinstance(self.output, Iter):
+            if not isinstance(value, (list, tuple)): value = list(value)
+            values = value
+        else: values = (value,)
+        fetcher.prefetch(response.encoderDataModel, values)
+
+        return value
 
 class Fetcher(IFetcher):
     '''
@@ -257,7 +290,7 @@ class Fetcher(IFetcher):
             index = fetcher.references.get(reference)
             if index is None: value = None
             else:
-                invoker, indexes = fetcher.invokers[index]
+                invoker, indexes, _bulk = fetcher.invokers[index]
                 assert isinstance(invoker, Invoker)
 
                 value = invoker.invoke(*(valueId if k is None else self.args[k] for k in indexes))
@@ -265,3 +298,45 @@ class Fetcher(IFetcher):
 
         return value
 
+    def prefetch(self, data, values):
+        '''
+        Fetches in bulk all the models that are referenced in the provided values, the fetched models are placed in the
+        fetch cache. The references that do not have a bulk fetch or the ids that are not delivered by the bulk fetch
+        are still fetched one by one.
+        
+        @param data: DataModel
+            The data model used for encoding the values.
+        @param values: Iterable(object)
+            The values to be encoded.
+        '''
+        assert isinstance(data, DataModel), 'Invalid data model %s' % data
+        fetcher = self.fetcher
+        assert isinstance(fetcher, FetcherInvoker)
+
+        pending = deque((data, value) for value in values)
+        while pending:
+            ids = {}
+            while pending:
+                data, value = pending.popleft()
+                if value is None: continue
+                assert isinstance(data, DataModel), 'Invalid data model %s' % data
+
+                if data.fetchEncode and data.fetchReference:
+                    if data.fetchReference in fetcher.references:
+                        ids.setdefault(data.fetchReference, (data.fetchData, set()))[1].add(value)
+                elif DataModel.datas in data:
+                    for name, cdata in data.datas.items():
+                        if DataModel.filter in data and name not in data.filter: continue
+                        pending.append((cdata, getattr(value, name, None)))
+
+            for reference, (fetchData, valueIds) in ids.items():
+                _invoker, _indexes, bulk = fetcher.invokers[fetcher.references[reference]]
+                values = self._cache.get(reference)
+                if values is None: values = self._cache[reference] = {}
+                valueIds.difference_update(values)
+                if bulk is None or not valueIds: continue
+
+                models = bulk(list(valueIds))
+                assert isinstance(models, dict), 'Invalid bulk models %s' % models
+                values.update(models)
+                if fetchData: pending.extend((fetchData, model) for model in models.values())
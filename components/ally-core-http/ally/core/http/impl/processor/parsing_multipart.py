@@ -21,8 +21,7 @@ from ally.exception import DevelError
 from ally.http.spec.codes import INVALID_HEADER_VALUE
 from ally.support.util_io import IInputStream, IClosable
 from collections import Callable
-from io import BytesIO
-import codecs
+from tempfile import SpooledTemporaryFile
 import logging
 import re
 
@@ -90,8 +89,11 @@ class DataMultiPart:
     # Characters to be removed from the multi part body end, if found.
     separatorHeader = ':'
     # Mark used to separate the header from the value, only the first occurrence is considered.
-    packageSize = 1024
+    packageSize = 64 * 1024
     # The maximum package size to be read in one go.
+    spoolThreshold = 1024 * 1024
+    # The size in bytes above which a multi part body is spooled to a temporary file, the smaller bodies are kept in
+    # memory. If 0 the bodies are not spooled and are read directly from the request content stream.
 
     def __init__(self):
         assert isinstance(self.charSet, str), 'Invalid character set %s' % self.charSet
@@ -101,6 +103,7 @@ class DataMultiPart:
         assert isinstance(self.trimBodyAtEnd, str), 'Invalid trim body at end %s' % self.trimBodyAtEnd
         assert isinstance(self.separatorHeader, str), 'Invalid separator header %s' % self.separatorHeader
         assert isinstance(self.packageSize, int), 'Invalid package size %s' % self.packageSize
+        assert isinstance(self.spoolThreshold, int), 'Invalid spool threshold %s' % self.spoolThreshold
 
         self.markHeaderEnd = bytes(self.markHeaderEnd, self.charSet)
         self.trimBodyAtEnd = bytes(self.trimBodyAtEnd, self.charSet)
@@ -180,9 +183,11 @@ class ParsingMultiPartHandler(ParsingHandler, DataMultiPart):
 
 class StreamMultiPart(IInputStream, IClosable):
     '''
-    Provides the muti part stream content.
+    Provides the muti part stream content. The content is read in a buffer that is scanned for the marks based on offsets,
+    the consumed bytes are removed from the buffer only when they exceed the unconsumed bytes.
     '''
-    __slots__ = ('_data', '_stream', '_markStart', '_markEnd', '_extraSize', '_flag', '_buffer')
+    __slots__ = ('_data', '_stream', '_markStart', '_markEnd', '_markPrefix', '_extraSize', '_flag', '_buffer',
+                 '_offset', '_exhausted')
 
     def __init__(self, data, stream, boundary):
         '''
@@ -204,10 +209,17 @@ class StreamMultiPart(IInputStream, IClosable):
 
         self._markStart = bytes(data.formatMarkStart % boundary, data.charSet)
         self._markEnd = bytes(data.formatMarkEnd % boundary, data.charSet)
-        self._extraSize = max(len(self._markStart), len(self._markEnd), len(data.markHeaderEnd))
+        # The common prefix of the marks is used in order to scan the buffer only once for both marks.
+        k = 0
+        while k < min(len(self._markStart), len(self._markEnd)) and self._markStart[k] == self._markEnd[k]: k += 1
+        self._markPrefix = self._markStart[:k]
+        self._extraSize = max(len(self._markStart), len(self._markEnd), len(data.markHeaderEnd)) + \
+        len(data.trimBodyAtEnd)
 
         self._flag = 0
         self._buffer = bytearray()
+        self._offset = 0
+        self._exhausted = False
 
     def read(self, nbytes=None):
         '''
@@ -216,20 +228,13 @@ class StreamMultiPart(IInputStream, IClosable):
         if self._flag & FLAG_CLOSED: raise ValueError('I/O operation on a closed content file')
         if self._flag & FLAG_END: return b''
 
-        if nbytes:
-            if nbytes <= self._data.packageSize:
-                return self._readToMark(nbytes)
-            else:
-                data = bytearray()
-                while True:
-                    data.extend(self._readToMark(min(nbytes - len(data), self._data.packageSize)))
-                    if len(data) >= nbytes or self._flag & FLAG_END: break
-        else:
-            data = bytearray()
-            while True:
-                data.extend(self._readToMark(self._data.packageSize))
-                if self._flag & FLAG_END: break
+        if nbytes is not None and nbytes >= 0: return self._readToMark(nbytes)
 
+        data = bytearray()
+        while True:
+            start, end = self._scanToMark(self._data.packageSize)
+            with memoryview(self._buffer) as view: data += view[start:end]
+            if self._flag & FLAG_END: break
         return bytes(data)
 
     def close(self):
@@ -242,13 +247,77 @@ class StreamMultiPart(IInputStream, IClosable):
 
     def _readInBuffer(self, nbytes):
         '''
-        Reads in the instance buffer the specified number of bytes, always when reading it will read in the buffer
-        additional bytes for the mark processing. It will adjust the flags if END is encountered.
+        Reads in the instance buffer until it contains at least the specified number of unconsumed bytes. The consumed
+        bytes are removed before reading only if they are more then the unconsumed bytes, this way the shifting of the
+        buffer is done at most once for each byte.
+        
+        @return: boolean
+            True if the buffer contains the number of bytes, False if the content stream is exhausted before.
+        '''
+        buffer = self._buffer
+        while len(buffer) - self._offset < nbytes:
+            if self._exhausted: return False
+            if self._offset and self._offset >= len(buffer) - self._offset:
+                del buffer[:self._offset]
+                self._offset = 0
+            data = self._stream.read(max(nbytes - len(buffer) + self._offset, self._data.packageSize))
+            if data: buffer += data
+            else: self._exhausted = True
+        return True
+
+    def _scanToMark(self, nbytes):
+        '''
+        Scans the provided number of bytes or until a mark separator is encountered (including the end separator).
+        It will adjust the flags according to the findings and consume the scanned bytes.
+        
+        @return: tuple(integer, integer)
+            The start and end offsets in the buffer of the scanned bytes, they are valid only until the next reading
+            in buffer.
+        '''
+        assert not self._flag & FLAG_MARK, 'Already at a mark, cannot read until flag is reset'
+        assert nbytes >= 0, 'Invalid number of bytes %s' % nbytes
+
+        self._readInBuffer(nbytes + self._extraSize)
+        buffer, start, trim = self._buffer, self._offset, self._data.trimBodyAtEnd
+        if start == len(buffer):
+            self._flag |= FLAG_CONTENT_END
+            return start, start
+
+        index, mark, flag = self._findMark(start)
+        if index >= 0:
+            end = index
+            if index - len(trim) >= start and buffer.endswith(trim, index - len(trim), index): end -= len(trim)
+            if end - start <= nbytes:
+                self._flag |= flag
+                self._offset = index + len(mark)
+                return start, end
+
+        if self._exhausted: end = min(len(buffer), start + nbytes)
+        else: end = min(len(buffer) - self._extraSize, start + nbytes)
+        self._offset = end
+        return start, end
+
+    def _findMark(self, start):
+        '''
+        Finds the first mark in the buffer starting from the provided offset.
+        
+        @return: tuple(integer, bytes, integer)
+            The index of the mark or -1 if there is no mark, the mark and the flag for the mark.
         '''
-        assert not self._flag & FLAG_CONTENT_END, 'End reached, cannot read anymore'
-        data = self._stream.read(nbytes + self._extraSize - len(self._buffer))
-        if data: self._buffer.extend(data)
-        if not self._buffer: self._flag |= FLAG_CONTENT_END
+        buffer, prefix = self._buffer, self._markPrefix
+        if not prefix:
+            index, mark, flag = buffer.find(self._markEnd, start), self._markEnd, FLAG_MARK_END
+            indexSep = buffer.find(self._markStart, start, index if index >= 0 else len(buffer))
+            if indexSep >= 0: index, mark, flag = indexSep, self._markStart, FLAG_MARK_START
+            return index, mark, flag
+
+        index = buffer.find(prefix, start)
+        while index >= 0:
+            # The end mark needs to be checked first since the start mark could be a prefix of it.
+            if buffer.startswith(self._markEnd, index): return index, self._markEnd, FLAG_MARK_END
+            if buffer.startswith(self._markStart, index): return index, self._markStart, FLAG_MARK_START
+            index = buffer.find(prefix, index + 1)
+        return -1, None, None
 
     def _readToMark(self, nbytes):
         '''
@@ -258,57 +327,24 @@ class StreamMultiPart(IInputStream, IClosable):
         @return: bytes
             The bytes read.
         '''
-        assert not self._flag & FLAG_MARK, 'Already at a mark, cannot read until flag is reset'
+        start, end = self._scanToMark(nbytes)
+        with memoryview(self._buffer) as view: return bytes(view[start:end])
 
-        self._readInBuffer(nbytes)
-
-        if not self._buffer: return b''
-        indexSep = self._buffer.find(self._markStart)
-        if indexSep >= 0:
-            self._flag |= FLAG_MARK_START
-            indexBody = indexSep - len(self._data.trimBodyAtEnd)
-            if not self._buffer.endswith(self._data.trimBodyAtEnd, indexBody, indexSep): indexBody = indexSep
-            data = self._buffer[:indexBody]
-            del self._buffer[:indexSep + len(self._markStart)]
-        else:
-            nbytes = max(len(self._buffer), nbytes)
-            data = self._buffer[:nbytes]
-            del self._buffer[:nbytes]
-
-        indexEnd = data.find(self._markEnd)
-        if indexEnd >= 0:
-            self._flag |= FLAG_MARK_END
-            indexBody = indexEnd - len(self._data.trimBodyAtEnd)
-            if not data.endswith(self._data.trimBodyAtEnd, indexBody, indexEnd): indexBody = indexEnd
-            data = data[:indexBody]
-            self._buffer = data[indexEnd + len(self._markEnd):]
-
-        return data
-
-    def _readToHeader(self, nbytes):
+    def _pipeToMark(self, output):
         '''
-        Read the provided number of bytes or read until the mark header is encountered.
-        It will adjust the flags according to the findings.
+        Writes in the provided output all the bytes until a mark separator is encountered (including the end separator),
+        the bytes are written directly from the buffer without copying them.
         
-        @return: bytes
-            The bytes read.
+        @param output: IOutputStream
+            The output to write to.
         '''
-        assert not self._flag & FLAG_HEADER_END, 'Already at header end, cannot read until flag is reset'
-
-        self._readInBuffer(nbytes)
-
-        if not self._buffer: return b''
-        indexHeader = self._buffer.find(self._data.markHeaderEnd)
-        if indexHeader >= 0:
-            self._flag |= FLAG_HEADER_END
-            data = self._buffer[:indexHeader]
-            del self._buffer[:indexHeader + len(self._data.markHeaderEnd)]
-        else:
-            nbytes = max(len(self._buffer), nbytes)
-            data = self._buffer[:nbytes]
-            del self._buffer[:nbytes]
-
-        return data
+        while not self._flag & FLAG_END:
+            start, end = self._scanToMark(self._data.packageSize)
+            if start < end:
+                with memoryview(self._buffer) as view:
+                    segment = view[start:end]
+                    try: output.write(segment)
+                    finally: segment.release()
 
     def _pullHeaders(self):
         '''
@@ -319,22 +355,20 @@ class StreamMultiPart(IInputStream, IClosable):
         '''
         assert self._flag & FLAG_MARK_START, 'Not at a separator mark position, cannot process headers'
 
-        data = bytearray()
+        markHeaderEnd, scanned = self._data.markHeaderEnd, 0
         while True:
-            data.extend(self._readToHeader(self._data.packageSize))
-            if self._flag & FLAG_HEADER_END:
-                self._flag ^= FLAG_HEADER_END  # Clearing the header flag
-                break
-            if self._flag & FLAG_CONTENT_END: raise DevelError('No empty line after multi part header')
+            index = self._buffer.find(markHeaderEnd, self._offset + scanned)
+            if index >= 0: break
+            if self._exhausted: raise DevelError('No empty line after multi part header')
+            scanned = max(0, len(self._buffer) - self._offset - len(markHeaderEnd) + 1)
+            self._readInBuffer(len(self._buffer) - self._offset + self._data.packageSize)
 
-        reader = codecs.getreader(self._data.charSet)(BytesIO(data))
         headers = {}
-        while True:
-            line = reader.readline()
-            if line == '':  break
+        for line in str(self._buffer[self._offset:index], self._data.charSet).splitlines():
             hindex = line.find(self._data.separatorHeader)
             if hindex < 0: raise DevelError('Invalid multi part header \'%s\'' % line)
             headers[line[:hindex]] = line[hindex + 1:].strip()
+        self._offset = index + len(markHeaderEnd)
 
         self._flag ^= FLAG_MARK_START
         return headers
@@ -389,7 +423,7 @@ class NextContent:
         if not stream._flag & (FLAG_CONTENT_END | FLAG_MARK_END):
             if not stream._flag & FLAG_MARK_START:
                 while True:
-                    stream._readToMark(self._data.packageSize)
+                    stream._scanToMark(self._data.packageSize)
                     if stream._flag & FLAG_MARK_START: break
                     if stream._flag & FLAG_END: return
 
@@ -401,7 +435,12 @@ class NextContent:
             req.headers = stream._pullHeaders()
             if stream._flag & FLAG_CLOSED: stream._flag ^= FLAG_CLOSED
 
-            reqCnt.source = stream
+            if self._data.spoolThreshold:
+                # The body is spooled in memory or in a temporary file if it exceeds the threshold.
+                reqCnt.source = SpooledTemporaryFile(self._data.spoolThreshold)
+                stream._pipeToMark(reqCnt.source)
+                reqCnt.source.seek(0)
+            else: reqCnt.source = stream
             reqCnt.fetchNextContent = NextContent(reqCnt, self._response, self._processing, self._data, stream)
             reqCnt.previousContent = self._requestCnt
             Chain(self._processing).process(request=req, requestCnt=reqCnt, response=self._response).doAll()
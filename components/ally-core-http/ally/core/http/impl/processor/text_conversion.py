@@ -22,7 +22,9 @@ from ally.http.spec.server import IDecoderHeader, IEncoderHeader
 from ally.internationalization import _
 from babel import numbers as bn, dates as bd
 from babel.core import Locale
+from collections import OrderedDict
 from datetime import datetime
+from threading import Lock
 import logging
 
 # --------------------------------------------------------------------
@@ -119,6 +121,9 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
                DateTime:'short'
                }
     # The default formats.
+    cacheSize = 500
+    # The maximum number of parsed locales and converters kept in cache, the cache is bounded since the languages and
+    # formats are provided by the request headers.
 
     def __init__(self):
         assert isinstance(self.normalizer, Normalizer), 'Invalid normalizer %s' % self.normalizer
@@ -127,8 +132,12 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
         assert isinstance(self.formatContentNameX, str), 'Invalid name content format %s' % self.formatContentNameX
         assert isinstance(self.formats, dict), 'Invalid formats %s' % self.formats
         assert isinstance(self.defaults, dict), 'Invalid defaults %s' % self.defaults
+        assert isinstance(self.cacheSize, int), 'Invalid cache size %s' % self.cacheSize
         super().__init__()
 
+        self._cache = OrderedDict()
+        self._lock = Lock()
+
     def process(self, request:RequestDecode, response:ResponseDecode, **keyargs):
         '''
         @see: HandlerProcessorProceed.process
@@ -147,14 +156,14 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
 
         locale = None
         if RequestDecode.language in request:
-            try: locale = Locale.parse(request.language, sep='-')
-            except: assert log.debug('Invalid request content language %s', request.language) or True
+            locale = self.localeFor(request.language, '-')
+            if locale is None: assert log.debug('Invalid request content language %s', request.language) or True
 
         if locale is None:
             request.language = self.languageDefault
-            locale = Locale.parse(self.languageDefault)
+            locale = self.localeFor(self.languageDefault)
 
-        try: formats = self.processFormats(locale, formats)
+        try: request.converter = self.converterFor(locale, formats)
         except FormatError as e:
             assert isinstance(e, FormatError)
             if response.isSuccess is False: return  # Skip in case the response is in error
@@ -163,7 +172,6 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
             response.errorMessage = 'Bad request content formatting, %s' % e.message
             return
 
-        request.converter = ConverterBabel(locale, formats)
         request.normalizer = self.normalizer
 
         formats = {}
@@ -173,21 +181,21 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
 
         locale = None
         if ResponseDecode.language in response:
-            try: locale = Locale.parse(response.language, sep='-')
-            except: assert log.debug('Invalid response content language %s', response.language) or True
+            locale = self.localeFor(response.language, '-')
+            if locale is None: assert log.debug('Invalid response content language %s', response.language) or True
 
         if locale is None:
             if RequestDecode.accLanguages in request:
                 for lang in request.accLanguages:
-                    try: locale = Locale.parse(lang, sep='-')
-                    except:
+                    locale = self.localeFor(lang, '-')
+                    if locale is None:
                         assert log.debug('Invalid accepted content language %s', lang) or True
                         continue
                     assert log.debug('Accepted language %s for response', locale) or True
                     break
 
             if locale is None:
-                locale = Locale.parse(self.languageDefault)
+                locale = self.localeFor(self.languageDefault)
                 if RequestDecode.accLanguages in request: request.accLanguages.insert(0, self.languageDefault)
                 else: request.accLanguages = [self.languageDefault]
                 if RequestDecode.argumentsOfType in request: request.argumentsOfType[LIST_LOCALE] = request.accLanguages
@@ -198,7 +206,7 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
             if RequestDecode.argumentsOfType in request:
                 request.argumentsOfType[TypeLocale] = response.language
 
-        try: formats = self.processFormats(locale, formats)
+        try: response.converter = self.converterFor(locale, formats)
         except FormatError as e:
             assert isinstance(e, FormatError)
             if response.isSuccess is False: return  # Skip in case the response is in error
@@ -207,11 +215,72 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
             response.errorMessage = 'Bad content formatting for response, %s' % e.message
             return
 
-        response.converter = ConverterBabel(locale, formats)
         response.normalizer = self.normalizer
 
     # ----------------------------------------------------------------
 
+    def localeFor(self, language, sep='_'):
+        '''
+        Provides the parsed locale for the language, the parsed locales are cached.
+
+        @param language: string
+            The language to parse.
+        @param sep: string
+            The separator used in the language.
+        @return: Locale|None
+            The locale or None if the language is not valid.
+        '''
+        key = (Locale, language, sep)
+        locale = self.cached(key)
+        if locale is None:
+            try: locale = Locale.parse(language, sep=sep)
+            except: locale = False
+            self.cache(key, locale)
+        if locale is False: return None
+        return locale
+
+    def converterFor(self, locale, formats):
+        '''
+        Provides the Babel converter for the locale and formats, the converters are cached.
+
+        @param locale: Locale
+            The locale of the converter.
+        @param formats: dictionary{class:string}
+            The custom formats of the converter.
+        @return: ConverterBabel
+            The converter.
+        @raise FormatError: If the formats are not valid.
+        '''
+        assert isinstance(formats, dict), 'Invalid formats %s' % formats
+
+        key = (ConverterBabel, str(locale), frozenset(formats.items()))
+        converter = self.cached(key)
+        if converter is None:
+            converter = ConverterBabel(locale, self.processFormats(locale, formats))
+            self.cache(key, converter)
+        return converter
+
+    def cached(self, key):
+        '''
+        Provides the cached value for the key.
+
+        @return: object|None
+            The cached value or None if there is no value cached for the key.
+        '''
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None: self._cache.move_to_end(key)
+        return value
+
+    def cache(self, key, value):
+        '''
+        Caches the value for the key, the least recently used values are removed if the cache size is exceeded.
+        '''
+        if self.cacheSize <= 0: return
+        with self._lock:
+            self._cache[key] = value
+            while len(self._cache) > self.cacheSize: self._cache.popitem(last=False)
+
     def processFormats(self, locale, formats):
         '''
         Process the formats to a complete list of formats that will be used by conversion.
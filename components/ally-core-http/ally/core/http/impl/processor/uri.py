@@ -19,7 +19,7 @@ from ally.core.spec.resources import ConverterPath, Path, Converter, Normalizer,
 from ally.design.context import Context, requires, defines, optional
 from ally.design.processor import HandlerProcessorProceed
 from ally.http.spec.server import IDecoderHeader
-from ally.support.core.util_resources import findPath
+from ally.support.core.util_resources import RoutingIndex
 from collections import deque
 from urllib.parse import urlencode, urlunsplit, urlsplit, quote, unquote
 import logging
@@ -101,13 +101,18 @@ class URIHandler(HandlerProcessorProceed):
     # The converter path used for handling the URL path.
     headerHost = 'Host'
     # The header in which the host is provided.
+    cacheSize = 1000
+    # The maximum number of resolved resource paths kept in the routing cache.
 
     def __init__(self):
         assert isinstance(self.resourcesRoot, Node), 'Invalid resources node %s' % self.resourcesRoot
         assert isinstance(self.converterPath, ConverterPath), 'Invalid ConverterPath object %s' % self.converterPath
         assert isinstance(self.headerHost, str), 'Invalid string %s' % self.headerHost
+        assert isinstance(self.cacheSize, int), 'Invalid cache size %s' % self.cacheSize
         super().__init__()
 
+        self.routing = RoutingIndex(self.resourcesRoot, self.converterPath, self.cacheSize)
+
     def process(self, request:Request, response:Response, responseCnt:ResponseContent, **keyargs):
         '''
         @see: HandlerProcessorProceed.process
@@ -129,7 +134,7 @@ class URIHandler(HandlerProcessorProceed):
             paths[-1] = paths[-1][0:i]
         paths = [unquote(p) for p in paths if p]
 
-        request.path = findPath(self.resourcesRoot, paths, self.converterPath)
+        request.path = self.routing.findPath(paths)
         assert isinstance(request.path, Path), 'Invalid path %s' % request.path
         if not request.path.node:
             # we stop the chain processing
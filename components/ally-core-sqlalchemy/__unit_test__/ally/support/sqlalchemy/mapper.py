@@ -18,8 +18,10 @@ if True:
 
 from ally.api.config import model
 from ally.api.type import typeFor
+from ally.exception import Ref
 from ally.support.sqlalchemy.mapper import mapperSimple, validate, \
-    DeclarativeMetaModel
+    DeclarativeMetaModel, mapperModel, onModelUnique, onModelForeignKey
+from ally.support.sqlalchemy.session import beginWith, endCurrent, rollback
 from sqlalchemy.dialects.mysql.base import INTEGER
 from sqlalchemy.engine import create_engine
 from sqlalchemy.ext.declarative import declarative_base
@@ -124,6 +126,26 @@ UserWithParent = mapperSimple(UserWithParent, tableUserParent, inherits=UserMapp
 
 # --------------------------------------------------------------------
 
+tableLabel = Table('label', meta,
+                   Column('id', INTEGER(unsigned=True), primary_key=True, key='Id'),
+                   Column('code', String(20), unique=True, key='Code'),
+                   Column('label', String(20), unique=True, key='Label'),
+                   Column('fk_parent_id', INTEGER(unsigned=True), ForeignKey(tableParent.c.Id), key='Parent'))
+
+@model(id='Id')
+class Label:
+    '''
+    A model with nullable unique properties.
+    '''
+    Id = int
+    Code = str
+    Label = str
+    Parent = Parent
+
+LabelMapped = mapperModel(Label, tableLabel)
+
+# --------------------------------------------------------------------
+
 class TestMapping(unittest.TestCase):
 
     def setUp(self):
@@ -209,6 +231,61 @@ class TestMapping(unittest.TestCase):
         self.assertEqual(user.Parent, 1)
         session.close()
 
+class TestValidation(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine('sqlite:///:memory:')
+        meta.create_all(engine)
+        beginWith(sessionmaker(bind=engine))
+        engine.execute(tableParent.insert(), Id=1, Name='parent')
+        engine.execute(tableLabel.insert(), [dict(Id=1, Code='A', Label=None), dict(Id=2, Code='B', Label=None),
+                                             dict(Id=3, Code='C', Label='x')])
+
+    def tearDown(self):
+        endCurrent(rollback)
+
+    def label(self, **values):
+        label = LabelMapped()
+        for name, value in values.items(): setattr(label, name, value)
+        return label
+
+    def failed(self, errors):
+        return [(error.model, error.property) for error in errors]
+
+    def testModelUnique(self):
+        uniques = ['Code', 'Label']
+        errors = []
+        self.assertFalse(onModelUnique(LabelMapped, uniques, self.label(Code='A', Label='x'), errors))
+        self.assertEqual(sorted(self.failed(errors)), [('Label', 'Code'), ('Label', 'Label')])
+
+        # The null values are not reported as duplicates.
+        errors = []
+        self.assertTrue(onModelUnique(LabelMapped, uniques, self.label(Code='D', Label=None), errors))
+        self.assertEqual(errors, [])
+        self.assertIsNone(onModelUnique(LabelMapped, uniques, self.label(Label=None), errors))
+        self.assertEqual(errors, [])
+
+        # The entity being updated is not a duplicate of itself.
+        self.assertTrue(onModelUnique(LabelMapped, uniques, self.label(Id=3, Code='C', Label='x'), errors))
+        self.assertEqual(errors, [])
+
+        # The properties that already have errors are not checked.
+        errors = [Ref('Invalid', ref=LabelMapped.Code)]
+        self.assertFalse(onModelUnique(LabelMapped, uniques, self.label(Code='A', Label='x'), errors))
+        self.assertEqual(self.failed(errors), [('Label', 'Code'), ('Label', 'Label')])
+
+    def testModelForeignKey(self):
+        foreigns = [('Parent', tableParent.c.Id)]
+        errors = []
+        self.assertTrue(onModelForeignKey(LabelMapped, foreigns, self.label(Parent=1), errors))
+        self.assertIsNone(onModelForeignKey(LabelMapped, foreigns, self.label(Parent=None), errors))
+        self.assertIsNone(onModelForeignKey(LabelMapped, foreigns, self.label(Code='A'), errors))
+        self.assertEqual(errors, [])
+
+        self.assertFalse(onModelForeignKey(LabelMapped, foreigns, self.label(Parent=5), errors))
+        self.assertEqual(self.failed(errors), [('Label', 'Parent')])
+        self.assertEqual(errors[0].message, 'Unknown foreign id')
+
 # --------------------------------------------------------------------
 
 if __name__ == '__main__':
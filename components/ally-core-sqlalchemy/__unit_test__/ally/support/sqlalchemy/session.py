@@ -0,0 +1,72 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally core sql alchemy
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides unit testing for the sql alchemy session support.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import model
+from ally.api.type import typeFor
+from ally.support.api.util_service import addChangeListener, \
+    removeChangeListener
+from ally.support.sqlalchemy.session import notifyChangeOnCommit
+from sqlalchemy.engine import create_engine
+from sqlalchemy.orm.session import sessionmaker
+import unittest
+
+# --------------------------------------------------------------------
+
+@model(id='Id')
+class Item:
+    Id = int
+
+# --------------------------------------------------------------------
+
+class TestSession(unittest.TestCase):
+
+    def setUp(self):
+        self.session = sessionmaker(bind=create_engine('sqlite:///:memory:'))()
+        self.changed = []
+        addChangeListener(self.changed.append)
+
+    def tearDown(self):
+        removeChangeListener(self.changed.append)
+        self.session.close()
+
+    def testNotifyOnCommit(self):
+        self.session.execute('SELECT 1')
+        notifyChangeOnCommit(self.session, Item)
+        notifyChangeOnCommit(self.session, Item)
+        self.assertEqual(self.changed, [])
+
+        self.session.commit()
+        self.assertEqual(self.changed, [typeFor(Item).container])
+        self.session.commit()
+        self.assertEqual(len(self.changed), 1)
+
+        self.session.execute('SELECT 1')
+        notifyChangeOnCommit(self.session, Item)
+        self.session.commit()
+        self.assertEqual(len(self.changed), 2)
+
+    def testNoNotifyOnRollback(self):
+        self.session.execute('SELECT 1')
+        notifyChangeOnCommit(self.session, Item)
+        self.session.rollback()
+        self.session.commit()
+        self.assertEqual(self.changed, [])
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,114 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally core sql alchemy
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides testing for the sql alchemy query building.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import model, query
+from ally.api.criteria import AsLikeOrdered, AsEqualOrdered, AsBoolean, \
+    AsRangeOrdered
+from ally.support.sqlalchemy.mapper import mapperModel
+from ally.support.sqlalchemy.util_service import buildQuery, planFor, \
+    buildAllWithCount, isCountOverSupported
+from sqlalchemy.engine import create_engine
+from sqlalchemy.orm.session import sessionmaker
+from sqlalchemy.schema import MetaData, Table, Column
+from sqlalchemy.types import String, Integer, Boolean
+import unittest
+
+# --------------------------------------------------------------------
+
+@model(id='Id')
+class Item:
+    Id = int
+    Name = str
+    Code = str
+    Count = int
+    Active = bool
+
+@query(Item)
+class QItem:
+    name = AsLikeOrdered
+    code = AsEqualOrdered
+    count = AsRangeOrdered
+    active = AsBoolean
+    other = AsLikeOrdered
+
+meta = MetaData()
+table = Table('item', meta,
+              Column('id', Integer, primary_key=True, key='Id'),
+              Column('name', String(255), key='Name'),
+              Column('code', String(255), key='Code'),
+              Column('count', Integer, key='Count'),
+              Column('active', Boolean, key='Active'))
+ItemMapped = mapperModel(Item, table)
+
+# --------------------------------------------------------------------
+
+class TestUtilService(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine('sqlite:///:memory:')
+        meta.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+
+    def tearDown(self):
+        self.session.close()
+
+    def testPlan(self):
+        plan = planFor(QItem, ItemMapped)
+        self.assertIs(planFor(QItem, ItemMapped), plan)
+        # The criteria without a mapped column are not part of the plan.
+        self.assertEqual(sorted(plan), ['active', 'code', 'count', 'name'])
+
+    def testOrdering(self):
+        q = QItem(active=True)
+        q.name.orderAsc()
+        q.code.orderDesc()
+        q.code.priority = 1
+        q.count.start = 10
+
+        sql = str(buildQuery(self.session.query(ItemMapped), q, ItemMapped))
+        self.assertIn('item.count >= ', sql)
+        self.assertIn('item.active = ', sql)
+        self.assertTrue(sql.endswith('ORDER BY item.code DESC, item.name'), sql)
+
+        sql = str(buildQuery(self.session.query(ItemMapped), q, ItemMapped, only=QItem.name))
+        self.assertNotIn('WHERE', sql)
+        self.assertTrue(sql.endswith('ORDER BY item.name'), sql)
+
+        sql = str(buildQuery(self.session.query(ItemMapped), q, ItemMapped, exclude=('code', QItem.active)))
+        self.assertNotIn('item.active = ', sql)
+        self.assertTrue(sql.endswith('ORDER BY item.name'), sql)
+
+    def testAllWithCount(self):
+        for k in range(10): self.session.add(ItemMapped(Name='Item %s' % k, Count=k))
+        self.session.flush()
+        sqlQuery = self.session.query(ItemMapped).filter(ItemMapped.Count >= 3).order_by(ItemMapped.Count)
+
+        countOvers = [False]
+        if isCountOverSupported(sqlQuery): countOvers.append(True)
+        for countOver in countOvers:
+            items, total = buildAllWithCount(sqlQuery, 2, 3, countOver)
+            self.assertEqual(([item.Count for item in items], total), ([5, 6, 7], 7))
+            self.assertEqual(buildAllWithCount(sqlQuery, 20, 3, countOver), ([], 7))
+            self.assertEqual(buildAllWithCount(sqlQuery, None, 0, countOver), ([], 7))
+            self.assertEqual(buildAllWithCount(sqlQuery.filter(ItemMapped.Count > 20), None, None, countOver), ([], 0))
+            items, total = buildAllWithCount(self.session.query(ItemMapped.Name).distinct(), None, 2, countOver)
+            self.assertEqual((len(items), total), (2, 10))
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -16,7 +16,8 @@ from ally.api.operator.type import TypeModel, TypeModelProperty
 from ally.api.type import typeFor
 from ally.container.binder import indexAfter
 from ally.container.binder_op import INDEX_PROP, validateAutoId, \
-    validateRequired, validateMaxLength, validateProperty, validateManaged
+    validateRequired, validateMaxLength, validateManaged, validateModel, \
+    EVENT_MODEL_INSERT_CHECK, EVENT_MODEL_UPDATE_CHECK
 from ally.exception import Ref
 from ally.internationalization import _
 from ally.support.sqlalchemy.descriptor import PropertyAttribute, PropertyHybrid, \
@@ -36,7 +37,8 @@ from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm.mapper import Mapper
 from sqlalchemy.orm.properties import ColumnProperty
 from sqlalchemy.schema import Table, MetaData, Column, ForeignKey
-from sqlalchemy.sql.expression import Executable, ClauseElement, Join
+from sqlalchemy.sql.expression import Executable, ClauseElement, Join, or_, \
+    exists, select
 from sqlalchemy.types import String
 import logging
 
@@ -190,6 +192,8 @@ class DeclarativeMetaModel(DeclarativeMeta):
             if isinstance(value, InstrumentedAttribute): value = PropertyAttribute(typeProperty, value)
             elif isinstance(value, hybrid_property): value = PropertyHybrid(typeProperty, value)
             elif isinstance(value, AssociationProxy): value = PropertyAssociation(typeProperty, value)
+            # The property descriptor is changed so the cached contained descriptors are no longer valid.
+            if '_ally_contained' in self.__dict__: self.__dict__['_ally_contained'].clear()
 
         super().__setattr__(key, value)
 
@@ -225,7 +229,7 @@ def registerValidation(mapped, exclude=None):
     model = typeModel.container
     assert isinstance(model, Model)
 
-    properties = set(model.properties)
+    properties, uniques, foreigns = set(model.properties), [], []
     for cp in mapper.iterate_properties:
         if not isinstance(cp, ColumnProperty): continue
 
@@ -253,8 +257,7 @@ def registerValidation(mapped, exclude=None):
 
                 if isinstance(column.type, String) and column.type.length:
                     validateMaxLength(propRef, column.type.length)
-                if column.unique:
-                    validateProperty(propRef, partial(onPropertyUnique, mapped))
+                if column.unique: uniques.append(prop)
                 if column.foreign_keys:
                     for fk in column.foreign_keys:
                         assert isinstance(fk, ForeignKey)
@@ -262,11 +265,19 @@ def registerValidation(mapped, exclude=None):
                         except AttributeError:
                             raise MappingError('Invalid foreign column for %s, maybe you are not using the meta class'
                                                % prop)
-                        validateProperty(propRef, partial(onPropertyForeignKey, mapped, fkcol), index=INDEX_PROP_FK)
+                        foreigns.append((prop, fkcol))
 
     for prop in properties:
         if not (exclude and prop in exclude): validateManaged(getattr(mapped, prop))
 
+    # The SQL checks are made after the property validations in order to batch them in a single query.
+    if uniques:
+        validateModel(mapped, partial(onModelUnique, mapped, uniques),
+                      (EVENT_MODEL_INSERT_CHECK, EVENT_MODEL_UPDATE_CHECK))
+    if foreigns:
+        validateModel(mapped, partial(onModelForeignKey, mapped, foreigns),
+                      (EVENT_MODEL_INSERT_CHECK, EVENT_MODEL_UPDATE_CHECK), INDEX_PROP_FK)
+
 def mappingFor(mapped):
     '''
     Provides the mapper of the provided mapped class.
@@ -311,6 +322,95 @@ def tableFor(mapped):
 
 # --------------------------------------------------------------------
 
+def onModelUnique(mapped, properties, obj, errors):
+    '''
+    Validation of the sql alchemy unique properties, all the unique properties are checked with a single query.
+    
+    @param mapped: class
+        The mapped model class.
+    @param properties: list[string]
+        The property names to be checked if unique.
+    @param obj: object
+        The entity to check for the properties values.
+    @param errors: list[Ref]
+        The list of errors, the properties that already have errors are not checked.
+    '''
+    assert isclass(mapped), 'Invalid class %s' % mapped
+    assert isinstance(properties, list), 'Invalid properties %s' % properties
+    assert obj is not None, 'None is not a valid object'
+    assert isinstance(errors, list), 'Invalid errors list %s' % errors
+
+    failed = propertiesFailed(mapped, errors)
+    check = []
+    for prop in properties:
+        if prop in failed or getattr(mapped, prop) not in obj: continue
+        value = getattr(obj, prop)
+        # The null values are never duplicates for the SQL unique constraints.
+        if value is not None: check.append((prop, value))
+    if not check: return
+
+    propId = typeFor(mapped).container.propertyId
+    sql = openSession().query(mapped).filter(or_(*(getattr(mapped, prop) == value for prop, value in check)))
+    valid = True
+    for db in sql.all():
+        if getattr(obj, propId) == getattr(db, propId): continue
+        for prop, value in check:
+            if prop not in failed and getattr(db, prop) == value:
+                errors.append(Ref(_('Already an entry with this value'), ref=getattr(mapped, prop)))
+                failed.add(prop)
+                valid = False
+    return valid
+
+def onModelForeignKey(mapped, foreigns, obj, errors):
+    '''
+    Validation of the sql alchemy foreign key properties, all the foreign keys are checked with a single query.
+    
+    @param mapped: class
+        The mapped model class.
+    @param foreigns: list[tuple(string, Column)]
+        The property names that contain foreign keys and the foreign columns used for checking.
+    @param obj: object
+        The entity to check for the properties values.
+    @param errors: list[Ref]
+        The list of errors, the properties that already have errors are not checked.
+    '''
+    assert isclass(mapped), 'Invalid class %s' % mapped
+    assert isinstance(foreigns, list), 'Invalid foreign keys %s' % foreigns
+    assert obj is not None, 'None is not a valid object'
+    assert isinstance(errors, list), 'Invalid errors list %s' % errors
+
+    failed = propertiesFailed(mapped, errors)
+    check = []
+    for prop, foreignColumn in foreigns:
+        assert isinstance(foreignColumn, Column), 'Invalid foreign column %s' % foreignColumn
+        if prop in failed or getattr(mapped, prop) not in obj: continue
+        value = getattr(obj, prop)
+        if value is not None: check.append((prop, exists([foreignColumn]).where(foreignColumn == value)))
+    if not check: return
+
+    row = openSession().execute(select([clause.label('fk%s' % k) for k, (_prop, clause) in enumerate(check)])).first()
+    valid = True
+    for (prop, _clause), found in zip(check, row):
+        if not found and prop not in failed:
+            errors.append(Ref(_('Unknown foreign id'), ref=getattr(mapped, prop)))
+            failed.add(prop)
+            valid = False
+    return valid
+
+def propertiesFailed(mapped, errors):
+    '''
+    Provides the names of the mapped model properties that have errors.
+    
+    @param mapped: class
+        The mapped model class.
+    @param errors: list[Ref]
+        The list of errors.
+    @return: set(string)
+        The property names that have errors.
+    '''
+    name = typeFor(mapped).container.name
+    return {error.property for error in errors if isinstance(error, Ref) and error.model == name and error.property}
+
 def onPropertyUnique(mapped, prop, obj, errors):
     '''
     Validation of a sql alchemy unique property.
@@ -13,7 +13,9 @@ from ally.container.binder import registerProxyBinder, bindBeforeListener, \
     bindAfterListener, bindExceptionListener, indexAfter, INDEX_LOCK_BEGIN, \
     indexBefore, INDEX_LOCK_END
 from ally.exception import DevelError
+from ally.support.api.util_service import notifyChange
 from collections import deque
+from sqlalchemy import event
 from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.orm.session import Session
 import logging
@@ -221,4 +223,39 @@ def commitNow():
         commit(session)
         return True
 
+# --------------------------------------------------------------------
+
+def notifyChangeOnCommit(session, model):
+    '''
+    Notifies the change of the model, @see: notifyChange, only after the session transaction is committed, this way the
+    listeners will not cache data from before the commit. If the transaction is rolled back there is no notification.
+    
+    @param session: Session
+        The session that contains the changes.
+    @param model: Model|class
+        The changed model or model class.
+    '''
+    assert isinstance(session, Session), 'Invalid session %s' % session
+    if not session.__dict__.get('_ally_listen'):
+        # The listeners are registered on the session instance since the class listeners on Session are not propagated
+        # to the session classes created by sessionmaker before the registration.
+        event.listen(session, 'after_commit', _onCommit)
+        event.listen(session, 'after_rollback', _onRollback)
+        session._ally_listen = True
+    try: changed = session._ally_changed
+    except AttributeError: changed = session._ally_changed = []
+    if model not in changed: changed.append(model)
+
+def _onCommit(session):
+    '''
+    Called after a session transaction is committed, notifies the changed models.
+    '''
+    changed = session.__dict__.pop('_ally_changed', None)
+    if changed:
+        for model in changed: notifyChange(model)
 
+def _onRollback(session):
+    '''
+    Called after a session transaction is rolled back, discards the changed models.
+    '''
+    session.__dict__.pop('_ally_changed', None)
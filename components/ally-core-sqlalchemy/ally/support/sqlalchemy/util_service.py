@@ -11,15 +11,31 @@ Provides utility methods for SQL alchemy service implementations.
 
 from ally.api.criteria import AsLike, AsOrdered, AsBoolean, AsEqual, AsDate, \
     AsTime, AsDateTime, AsRange
-from ally.api.operator.type import TypeCriteriaEntry
+from ally.api.operator.type import TypeCriteriaEntry, TypeQuery
 from ally.api.type import typeFor
 from ally.exception import InputError, Ref
 from ally.internationalization import _
 from ally.support.api.util_service import namesForQuery, namesForModel
 from ally.support.sqlalchemy.descriptor import PropertyAttribute
+from inspect import isclass
 from itertools import chain
 from sqlalchemy.exc import IntegrityError, OperationalError
-from sqlalchemy.sql.expression import _Case
+from sqlalchemy.sql.expression import _Case, over, func
+
+# --------------------------------------------------------------------
+
+# The criteria kinds used by the query plans.
+CRITERIA_BOOLEAN = 1
+CRITERIA_LIKE = 2
+CRITERIA_EQUAL = 3
+CRITERIA_RANGE = 4
+
+_plans = {}
+# The compiled query plans indexed by the query class and mapped class.
+
+COUNT_OVER_DIALECTS = {'postgresql': None, 'oracle': None, 'mssql': None, 'mysql': (8, 0), 'sqlite': (3, 25)}
+# The dialects that support the COUNT(*) OVER() window function, as a value the minimum version required for the
+# database server (None if any version is supported).
 
 # --------------------------------------------------------------------
 
@@ -48,6 +64,59 @@ def buildLimits(sqlQuery, offset=None, limit=None):
     if limit is not None: sqlQuery = sqlQuery.limit(limit)
     return sqlQuery
 
+def buildAllWithCount(sqlQuery, offset=None, limit=None, countOver=None):
+    '''
+    Provides the elements of the SQL alchemy query with offset and limit and the total count of elements. If the window
+    functions are used the total count is provided in the same query as the elements using COUNT(*) OVER(), otherwise
+    a separate count query is made.
+
+    @param sqlQuery: SQL alchemy
+        The sql alchemy query to use.
+    @param offset: integer|None
+        The offset to fetch elements from.
+    @param limit: integer|None
+        The limit of elements to get.
+    @param countOver: boolean|None
+        Flag indicating that the window function should be used for the count, if None the window function is used if
+        the query database supports it, @see: isCountOverSupported.
+    @return: tuple(list, integer)
+        The list of all limited elements and the count of the total elements.
+    '''
+    if limit == 0: return [], sqlQuery.count()
+    if countOver is None: countOver = isCountOverSupported(sqlQuery)
+    if countOver:
+        descriptions = sqlQuery.column_descriptions
+        # The window function is used only for single mapped entity queries, also the window function is computed
+        # before the distinct is applied so the count would not be the same.
+        countOver = len(descriptions) == 1 and isclass(descriptions[0]['type']) and not sqlQuery._distinct
+    if not countOver: return buildLimits(sqlQuery, offset, limit).all(), sqlQuery.count()
+
+    rows = buildLimits(sqlQuery.add_columns(over(func.count())), offset, limit).all()
+    if not rows:
+        # There are no rows to provide the count, the offset can be beyond the total count.
+        if offset: return [], sqlQuery.count()
+        return [], 0
+    return [row[0] for row in rows], rows[0][1]
+
+def isCountOverSupported(sqlQuery):
+    '''
+    Checks if the database used by the SQL alchemy query supports the COUNT(*) OVER() window function.
+
+    @param sqlQuery: SQL alchemy
+        The sql alchemy query to check.
+    @return: boolean
+        True if the window function can be used for counting, False otherwise.
+    '''
+    bind = sqlQuery.session.bind if sqlQuery.session is not None else None
+    if bind is None: return False
+    dialect = bind.dialect
+    if dialect.name not in COUNT_OVER_DIALECTS: return False
+    version = COUNT_OVER_DIALECTS[dialect.name]
+    if version is None: return True
+    if dialect.name == 'sqlite': return dialect.dbapi.sqlite_version_info >= version
+    if dialect.server_version_info is None: return False
+    return tuple(dialect.server_version_info[:len(version)]) >= version
+
 def buildQuery(sqlQuery, query, mapped, only=None, exclude=None):
     '''
     Builds the query on the SQL alchemy query.
@@ -67,64 +136,57 @@ def buildQuery(sqlQuery, query, mapped, only=None, exclude=None):
     '''
     assert query is not None, 'A query object is required'
     clazz = query.__class__
-
-    columns, ordered, unordered = {}, [], []
-    for name in namesForModel(mapped):
-        cp, name = getattr(mapped, name), name.lower()
-        if name not in columns and isinstance(cp, (PropertyAttribute, _Case)): columns[name] = cp
-    columns = {criteria:columns.get(criteria.lower()) for criteria in namesForQuery(clazz)}
+    plan = planFor(clazz, mapped)
 
     if only:
         if not isinstance(only, tuple): only = (only,)
         assert not exclude, 'Cannot have only \'%s\' and exclude \'%s\' criteria at the same time' % (only, exclude)
-        onlyColumns = {}
+        entries = []
         for criteria in only:
-            if isinstance(criteria, str):
-                column = columns.get(criteria)
-                assert column is not None, 'Invalid only criteria name \'%s\' for query class %s' % (criteria, clazz)
-                onlyColumns[criteria] = column
-            else:
+            if not isinstance(criteria, str):
                 typ = typeFor(criteria)
                 assert isinstance(typ, TypeCriteriaEntry), 'Invalid only criteria %s' % criteria
-                column = columns.get(criteria)
-                assert column is not None, 'Invalid only criteria \'%s\' for query class %s' % (criteria, clazz)
-                onlyColumns[criteria] = column
-        columns = onlyColumns
+                criteria = typ.name
+            entry = plan.get(criteria)
+            assert entry is not None, 'Invalid only criteria \'%s\' for query class %s' % (criteria, clazz)
+            entries.append(entry)
     elif exclude:
         if not isinstance(exclude, tuple): exclude = (exclude,)
+        excluded = set()
         for criteria in exclude:
-            if isinstance(criteria, str):
-                column = columns.pop(criteria, None)
-                assert column is not None, 'Invalid exclude criteria name \'%s\' for query class %s' % (criteria, clazz)
-            else:
+            if not isinstance(criteria, str):
                 typ = typeFor(criteria)
                 assert isinstance(typ, TypeCriteriaEntry), 'Invalid exclude criteria %s' % criteria
-                column = columns.pop(typ.name, None)
-                assert column is not None, 'Invalid exclude criteria \'%s\' for query class %s' % (criteria, clazz)
+                criteria = typ.name
+            assert criteria in plan, 'Invalid exclude criteria \'%s\' for query class %s' % (criteria, clazz)
+            excluded.add(criteria)
+        entries = [entry for entry in plan.values() if entry[0] not in excluded]
+    else: entries = plan.values()
 
-    for criteria, column in columns.items():
-        if column is None or getattr(clazz, criteria) not in query: continue
+    ordered, unordered = [], []
+    for criteria, descriptor, column, kind, isOrdered in entries:
+        if descriptor not in query: continue
 
         crt = getattr(query, criteria)
-        if isinstance(crt, AsBoolean):
+        if kind == CRITERIA_BOOLEAN:
             assert isinstance(crt, AsBoolean)
             if AsBoolean.value in crt:
                 sqlQuery = sqlQuery.filter(column == crt.value)
-        elif isinstance(crt, AsLike):
+        elif kind == CRITERIA_LIKE:
             assert isinstance(crt, AsLike)
             if AsLike.like in crt: sqlQuery = sqlQuery.filter(column.like(crt.like))
             elif AsLike.ilike in crt: sqlQuery = sqlQuery.filter(column.ilike(crt.ilike))
-        elif isinstance(crt, AsEqual):
+        elif kind == CRITERIA_EQUAL:
             assert isinstance(crt, AsEqual)
             if AsEqual.equal in crt:
                 sqlQuery = sqlQuery.filter(column == crt.equal)
-        elif isinstance(crt, (AsDate, AsTime, AsDateTime, AsRange)):
+        elif kind == CRITERIA_RANGE:
             if crt.__class__.start in crt: sqlQuery = sqlQuery.filter(column >= crt.start)
             elif crt.__class__.until in crt: sqlQuery = sqlQuery.filter(column < crt.until)
             if crt.__class__.end in crt: sqlQuery = sqlQuery.filter(column <= crt.end)
             elif crt.__class__.since in crt: sqlQuery = sqlQuery.filter(column > crt.since)
 
-        if isinstance(crt, AsOrdered):
+        if isOrdered:
             assert isinstance(crt, AsOrdered)
             if AsOrdered.ascending in crt:
                 if AsOrdered.priority in crt and crt.priority:
@@ -132,11 +194,51 @@ def buildQuery(sqlQuery, query, mapped, only=None, exclude=None):
                 else:
                     unordered.append((column, crt.ascending, None))
 
-        ordered.sort(key=lambda pack: pack[2])
-        for column, asc, __ in chain(ordered, unordered):
-            if asc: sqlQuery = sqlQuery.order_by(column)
-            else: sqlQuery = sqlQuery.order_by(column.desc())
+    ordered.sort(key=lambda pack: pack[2])
+    for column, asc, __ in chain(ordered, unordered):
+        if asc: sqlQuery = sqlQuery.order_by(column)
+        else: sqlQuery = sqlQuery.order_by(column.desc())
 
     return sqlQuery
 
+def planFor(clazz, mapped):
+    '''
+    Provides the plan used for building the query on the mapped model class, the plan is compiled at the first use and
+    then cached.
+
+    @param clazz: class
+        The query class.
+    @param mapped: class
+        The mapped model class to use the query on.
+    @return: dictionary{string, tuple(string, object, object, integer, boolean)}
+        The plan containing as a key the criteria name and as a value the criteria name, the criteria descriptor of the
+        query class, the mapped column, the criteria kind and a flag indicating if the criteria is ordered. Only the
+        criteria that have a mapped column are present in the plan.
+    '''
+    plan = _plans.get((clazz, mapped))
+    if plan is not None: return plan
+
+    columns = {}
+    for name in namesForModel(mapped):
+        cp, name = getattr(mapped, name), name.lower()
+        if name not in columns and isinstance(cp, (PropertyAttribute, _Case)): columns[name] = cp
+
+    queryType = typeFor(clazz)
+    assert isinstance(queryType, TypeQuery), 'Invalid query class %s' % clazz
+
+    plan = {}
+    for criteria in namesForQuery(clazz):
+        column = columns.get(criteria.lower())
+        if column is None: continue
+
+        criteriaClass = queryType.query.criterias[criteria]
+        if issubclass(criteriaClass, AsBoolean): kind = CRITERIA_BOOLEAN
+        elif issubclass(criteriaClass, AsLike): kind = CRITERIA_LIKE
+        elif issubclass(criteriaClass, AsEqual): kind = CRITERIA_EQUAL
+        elif issubclass(criteriaClass, (AsDate, AsTime, AsDateTime, AsRange)): kind = CRITERIA_RANGE
+        else: kind = None
+
+        plan[criteria] = (criteria, getattr(clazz, criteria), column, kind, issubclass(criteriaClass, AsOrdered))
 
+    _plans[(clazz, mapped)] = plan
+    return plan
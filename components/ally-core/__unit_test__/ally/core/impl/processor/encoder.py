@@ -39,6 +39,13 @@ class ModelId:
     Flags = List(str)
     ModelKey = ModelKey
 
+@model(id='Id', compact=True)
+class ModelCompact:
+    Id = int
+    Name = str
+    Flags = List(str)
+    ModelKey = ModelKey
+
 # --------------------------------------------------------------------
 
 class TestModel(unittest.TestCase):
@@ -106,6 +113,22 @@ class TestModel(unittest.TestCase):
         resolve.do()
         self.assertFalse(resolve.has())
 
+    def testEncodeCompact(self):
+        transformer = CreateEncoderHandler()
+        ioc.initialize(transformer)
+        render = RenderToObject()
+        context = dict(render=render, converter=ConverterPath(), converterId=ConverterPath(), normalizer=ConverterPath())
+
+        objs = []
+        for clazz in (ModelId, ModelCompact):
+            model = clazz()
+            model.Id, model.Name, model.Flags, model.ModelKey = 12, 'Uau Name', ['1', '2'], 'The key'
+            render.obj = None
+            Resolve(transformer.encoderFor(typeFor(List(clazz)))).request(value=[model], **context).doAll()
+            objs.append(render.obj['%sList' % clazz.__name__])
+        self.assertEqual(objs[0], objs[1])
+        self.assertEqual([{'ModelKey': {'Key': 'The key'}, 'Flags': {'Flags': ['1', '2']}, 'Id': '12',
+                           'Name': 'Uau Name'}], objs[1])
 
 # --------------------------------------------------------------------
 
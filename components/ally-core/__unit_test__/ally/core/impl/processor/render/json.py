@@ -0,0 +1,68 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally core
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides testing for the JSON renderers.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.core.impl.processor.render.json import RenderJSON, RenderJSONBatched
+from ally.core.spec.transform.render import Object, List, Value, renderObject
+from codecs import getwriter
+from io import BytesIO
+import unittest
+
+# --------------------------------------------------------------------
+
+def renderBatched(obj, batchSize=1024, charSet='utf-8'):
+    output = BytesIO()
+    renderObject(obj, RenderJSONBatched(output, charSet, batchSize=batchSize))
+    return output.getvalue()
+
+def renderStream(obj, charSet='utf-8'):
+    output = BytesIO()
+    renderObject(obj, RenderJSON(getwriter(charSet)(output, 'backslashreplace')))
+    return output.getvalue()
+
+def itemsList(count):
+    items = (Object('User', Value('Id', str(k)), Value('Name', 'User ă "%s"' % k),
+                    attributes={'href': 'http://localhost/User/%s' % k}) for k in range(count))
+    return List('UserList', *items, attributes={'total': str(count)})
+
+# --------------------------------------------------------------------
+
+class TestRenderJSON(unittest.TestCase):
+
+    def testRender(self):
+        obj = Object('Data', Value('Name', 'a\nb'), List('Ids', Value('Id', '1'), Value('Id', '2')),
+                     Object('Other', Value('Code', 'x')))
+        content = renderBatched(obj)
+        self.assertEqual(content, renderStream(obj))
+        self.assertEqual(content, b'{"Name":"a\\nb","Ids":{"Ids":["1","2"]},"Other":{"Code":"x"}}')
+
+        obj = itemsList(100)
+        self.assertEqual(renderBatched(obj, 1), renderStream(obj))
+        self.assertEqual(renderBatched(obj), renderStream(obj))
+
+    def testRenderCharSet(self):
+        obj = itemsList(100)
+        for charSet in ('utf-16', 'utf-32', 'ascii'):
+            content = renderBatched(obj, 1, charSet)
+            self.assertEqual(content, renderStream(obj, charSet))
+            self.assertEqual(content, renderBatched(obj, charSet=charSet))
+        # The byte order mark is placed only once at the beginning.
+        self.assertEqual(renderBatched(obj, 1, 'utf-16').decode('utf-16'), renderBatched(obj).decode('utf-8'))
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
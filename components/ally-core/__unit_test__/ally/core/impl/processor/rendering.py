@@ -0,0 +1,75 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally core
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides testing for the rendering negotiation.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.container import ioc
+from ally.core.impl.processor.render.json import RenderJSONHandler
+from ally.core.impl.processor.render.xml import RenderXMLHandler
+from ally.core.impl.processor.rendering import RenderingHandler
+from ally.design.context import Context, defines
+from ally.design.processor import Assembly, Chain, NO_VALIDATION
+import unittest
+
+# --------------------------------------------------------------------
+
+class Request(Context):
+    accTypes = defines(list)
+    accCharSets = defines(list)
+
+# --------------------------------------------------------------------
+
+class TestRendering(unittest.TestCase):
+
+    def setUp(self):
+        self.renderJSON = RenderJSONHandler()
+        self.renderJSON.contentTypes = {'json': 'application/json'}
+        ioc.initialize(self.renderJSON)
+        renderXML = RenderXMLHandler()
+        renderXML.contentTypes = {'xml': None}
+        ioc.initialize(renderXML)
+        renderingAssembly = Assembly()
+        renderingAssembly.add(self.renderJSON, renderXML)
+
+        self.handler = RenderingHandler()
+        self.handler.renderingAssembly = renderingAssembly
+        self.handler.contentTypeDefaults = ['json']
+        self.handler.charSetDefault = 'UTF-8'
+        ioc.initialize(self.handler)
+
+        assembly = Assembly()
+        assembly.add(self.handler)
+        self.processing = assembly.create(NO_VALIDATION, request=Request)
+
+    def execute(self, accTypes=None, accCharSets=None, type=None):
+        request, response = self.processing.contexts['request'](), self.processing.contexts['response']()
+        responseCnt = self.processing.contexts['responseCnt']()
+        request.accTypes, request.accCharSets = accTypes, accCharSets
+        if type: responseCnt.type = type
+        Chain(self.processing).process(request=request, response=response, responseCnt=responseCnt).doAll()
+        return responseCnt.type, responseCnt.charSet, response.renderFactory.func.__self__, response.isSuccess
+
+    def testNegotiate(self):
+        for _k in range(2):
+            self.assertEqual(self.execute(['xml'], ['unknown', 'ISO-8859-1'])[:2], ('xml', 'ISO-8859-1'))
+            self.assertEqual(self.execute(['unknown']),
+                             ('application/json', 'UTF-8', self.renderJSON, None))
+            self.assertEqual(self.execute(type='unknown')[::3], ('application/json', False))
+        self.assertEqual(len(self.handler._negotiated), 3)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
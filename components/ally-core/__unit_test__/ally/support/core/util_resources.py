@@ -0,0 +1,71 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally core
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides testing for the resources routing.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import model
+from ally.api.type import typeFor, Input
+from ally.core.impl.node import NodeRoot, NodePath, NodeProperty, \
+    MatchProperty
+from ally.core.spec.resources import ConverterPath
+from ally.support.core.util_resources import findPath, RoutingIndex
+from collections import deque
+import unittest
+
+# --------------------------------------------------------------------
+
+@model(id='Id')
+class Item:
+    Id = int
+
+# --------------------------------------------------------------------
+
+class TestRouting(unittest.TestCase):
+
+    def setUp(self):
+        self.root = NodeRoot()
+        for k in range(300): NodePath(self.root, True, 'Service%s' % k)
+        self.items = NodePath(self.root, True, 'Item')
+        self.item = NodeProperty(self.items, Input('id', typeFor(Item.Id)))
+        self.converterPath = ConverterPath()
+
+    def assertSamePath(self, path, expected):
+        self.assertIs(path.node, expected.node)
+        self.assertEqual([str(match) for match in path.matches], [str(match) for match in expected.matches])
+
+    def testFindPath(self):
+        routing = RoutingIndex(self.root, self.converterPath)
+        for elements in (['Item', '12'], ['Item'], ['Service7'], ['Item', 'x'], ['Unknown'], []):
+            paths, expected = deque(elements), deque(elements)
+            self.assertSamePath(routing.findPath(paths), findPath(self.root, expected, self.converterPath))
+            self.assertEqual(paths, expected)
+
+        path = routing.findPath(['Item', '12'])
+        self.assertIs(path.node, self.item)
+        match = path.matches[-1]
+        self.assertIsInstance(match, MatchProperty)
+        match.value = 13
+        self.assertEqual(routing.findPath(['Item', '12']).matches[-1].value, 12)
+
+    def testIndexUpdate(self):
+        routing = RoutingIndex(self.root, self.converterPath)
+        self.assertIsNone(routing.findPath(['Item', '12', 'Sub']).node)
+        sub = NodePath(self.item, False, 'Sub')
+        self.assertIs(routing.findPath(['Item', '12', 'Sub']).node, sub)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
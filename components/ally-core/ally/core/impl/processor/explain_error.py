@@ -13,8 +13,8 @@ from ally.container.ioc import injected
 from ally.core.spec.transform.render import Object, Value, renderObject
 from ally.design.context import Context, requires, defines, optional
 from ally.design.processor import HandlerProcessorProceed
+from ally.support.util_io import OutputChunks
 from collections import Iterable, Callable
-from io import BytesIO
 import logging
 
 # --------------------------------------------------------------------
@@ -79,10 +79,10 @@ class ExplainErrorHandler(HandlerProcessorProceed):
             if Response.errorDetails in response:
                 errors.append(Object('details', response.errorDetails))
 
-            output = BytesIO()
+            output = OutputChunks()
             render = response.renderFactory(output)
             renderObject(Object('error', *errors), render)
+            output.close()
 
-            content = output.getvalue()
-            responseCnt.length = len(content)
-            responseCnt.source = (output.getvalue(),)
+            responseCnt.length = output.length
+            responseCnt.source = output.chunks
@@ -13,7 +13,7 @@ from .base import RenderBaseHandler
 from ally.container.ioc import injected
 from ally.core.spec.transform.render import IRender
 from ally.support.util_io import IOutputStream
-from codecs import getwriter
+from codecs import getwriter, getincrementalencoder
 from collections import deque
 from json.encoder import encode_basestring
 
@@ -28,9 +28,13 @@ class RenderJSONHandler(RenderBaseHandler):
 
     encodingError = 'backslashreplace'
     # The encoding error resolving.
+    batchSize = 1024
+    # The number of JSON fragments to collect before encoding them in the output, if 0 then the fragments are written
+    # one by one through a stream writer.
 
     def __init__(self):
         assert isinstance(self.encodingError, str), 'Invalid string %s' % self.encodingError
+        assert isinstance(self.batchSize, int), 'Invalid batch size %s' % self.batchSize
         super().__init__()
 
     def renderFactory(self, charSet, output):
@@ -40,6 +44,7 @@ class RenderJSONHandler(RenderBaseHandler):
         assert isinstance(charSet, str), 'Invalid char set %s' % charSet
         assert isinstance(output, IOutputStream), 'Invalid content output stream %s' % output
 
+        if self.batchSize > 0: return RenderJSONBatched(output, charSet, self.encodingError, self.batchSize)
         return RenderJSON(getwriter(charSet)(output, self.encodingError))
 
 # --------------------------------------------------------------------
@@ -149,3 +154,145 @@ class RenderJSON(IRender):
                 out.write(encode_basestring(attrName))
                 out.write(':')
                 out.write(encode_basestring(attrValue))
+
+# --------------------------------------------------------------------
+
+class RenderJSONBatched(IRender):
+    '''
+    Renderer for JSON that collects the JSON fragments and encodes them in the output in batches, this way the encoding
+    is not made for every small fragment as it happens when using a stream writer.
+    '''
+    __slots__ = ('output', 'encoder', 'batchSize', 'fragments', 'names', 'isObject', 'inObject', 'isFirst')
+
+    def __init__(self, output, charSet, encodingError='backslashreplace', batchSize=1024):
+        '''
+        Construct the batched JSON renderer.
+        
+        @param output: IOutputStream
+            The output stream to place the encoded JSON.
+        @param charSet: string
+            The character set used for encoding the JSON.
+        @param encodingError: string
+            The encoding error resolving.
+        @param batchSize: integer
+            The number of fragments to collect before encoding them in the output.
+        '''
+        assert isinstance(output, IOutputStream), 'Invalid content output stream %s' % output
+        assert isinstance(charSet, str), 'Invalid char set %s' % charSet
+        assert isinstance(encodingError, str), 'Invalid string %s' % encodingError
+        assert isinstance(batchSize, int) and batchSize > 0, 'Invalid batch size %s' % batchSize
+
+        self.output = output
+        # A single encoder is used for all the batches so the byte order mark is placed only at the beginning.
+        self.encoder = getincrementalencoder(charSet)(encodingError)
+        self.batchSize = batchSize
+        self.fragments = []
+        self.names = {}
+        self.isObject = deque()
+        self.inObject = False
+        self.isFirst = True
+
+    def value(self, name, value):
+        '''
+        @see: IRender.value
+        '''
+        assert self.isObject, 'No container for value'
+        assert isinstance(name, str), 'Invalid name %s' % name
+        assert isinstance(value, str), 'Invalid value %s' % value
+        fragments = self.fragments
+
+        if self.isFirst: self.isFirst = False
+        else: fragments.append(',')
+        if self.inObject: fragments.append(self.encodeName(name))
+        # In a collection the values are placed directly.
+        fragments.append(encode_basestring(value))
+
+    def objectStart(self, name, attributes=None):
+        '''
+        @see: IRender.objectStart
+        '''
+        self.openObject(name, attributes)
+        self.isObject.appendleft(True)
+        self.inObject = True
+
+    def objectEnd(self):
+        '''
+        @see: IRender.objectEnd
+        '''
+        assert self.isObject, 'No object to end'
+        isObject = self.isObject.popleft()
+        assert isObject, 'No object to end'
+
+        self.fragments.append('}')
+        self.closeObject()
+
+    def collectionStart(self, name, attributes=None):
+        '''
+        @see: IRender.collectionStart
+        '''
+        assert isinstance(name, str), 'Invalid name %s' % name
+        fragments = self.fragments
+
+        self.openObject(name, attributes)
+        if not self.isFirst: fragments.append(',')
+        fragments.append(encode_basestring(name))
+        fragments.append(':[')
+        self.isFirst = True
+        self.isObject.appendleft(False)
+        self.inObject = False
+
+    def collectionEnd(self):
+        '''
+        @see: IRender.collectionEnd
+        '''
+        assert self.isObject, 'No collection to end'
+        isObject = self.isObject.popleft()
+        assert not isObject, 'No collection to end'
+
+        self.fragments.append(']}')
+        self.closeObject()
+
+    # ----------------------------------------------------------------
+
+    def encodeName(self, name):
+        '''
+        Provides the encoded JSON name, the names are cached since the same names are used for every rendered model.
+        '''
+        encoded = self.names.get(name)
+        if encoded is None: encoded = self.names[name] = encode_basestring(name) + ':'
+        return encoded
+
+    def openObject(self, name, attributes=None):
+        '''
+        Used to open a JSON object.
+        '''
+        assert isinstance(name, str), 'Invalid name %s' % name
+        assert attributes is None or isinstance(attributes, dict), 'Invalid attributes %s' % attributes
+        fragments = self.fragments
+
+        if not self.isFirst: fragments.append(',')
+        if self.inObject: fragments.append(self.encodeName(name))
+
+        fragments.append('{')
+        self.isFirst = True
+        if attributes:
+            for attrName, attrValue in attributes.items():
+                assert isinstance(attrName, str), 'Invalid attribute name %s' % attrName
+                assert isinstance(attrValue, str), 'Invalid attribute value %s' % attrValue
+
+                if self.isFirst: self.isFirst = False
+                else: fragments.append(',')
+                fragments.append(self.encodeName(attrName))
+                fragments.append(encode_basestring(attrValue))
+
+    def closeObject(self):
+        '''
+        Used after closing a JSON object or collection, encodes the collected fragments if the batch is full or the JSON
+        is finalized.
+        '''
+        self.isFirst = False
+        if self.isObject: self.inObject = self.isObject[0]
+        else: self.inObject = False
+        if not self.isObject or len(self.fragments) >= self.batchSize:
+            self.output.write(self.encoder.encode(''.join(self.fragments), not self.isObject))
+            del self.fragments[:]
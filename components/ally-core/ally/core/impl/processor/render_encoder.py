@@ -14,8 +14,8 @@ from ally.core.spec.transform.exploit import Resolve
 from ally.core.spec.transform.render import IRender
 from ally.design.context import defines, Context, requires, optional
 from ally.design.processor import HandlerProcessorProceed
+from ally.support.util_io import OutputChunks
 from collections import Callable, Iterable
-from io import BytesIO
 import logging
 
 # --------------------------------------------------------------------
@@ -59,7 +59,7 @@ class RenderEncoderHandler(HandlerProcessorProceed):
     allowChunked = False
     # Flag indicating that a chuncked transfer is allowed, more or less if this is false a length is a must.
     bufferSize = 1024
-    # The buffer size used in the generator returned chuncks.
+    # The minimum size of the rendered chuncks.
     
     
     def __init__(self):
@@ -78,31 +78,29 @@ class RenderEncoderHandler(HandlerProcessorProceed):
         if Response.encoder not in response: return  # Skip in case there is no encoder to render
         assert callable(response.renderFactory), 'Invalid response renderer factory %s' % response.renderFactory
 
-        output = BytesIO()
+        output = OutputChunks(self.bufferSize)
         render = response.renderFactory(output)
         assert isinstance(render, IRender), 'Invalid render %s' % render
 
         resolve = Resolve(response.encoder).request(value=response.obj, render=render, **response.encoderData or {})
 
         if not self.allowChunked and ResponseContent.length not in responseCnt:
-    
+            # The rendered chunks are delivered as they are, no need to join them in a single content.
             while resolve.has(): resolve.do()
-            content = output.getvalue()
-            responseCnt.length = len(content)
-            responseCnt.source = (content,)
             output.close()
+            responseCnt.length = output.length
+            responseCnt.source = output.chunks
         else:
-            responseCnt.source = self.renderAsGenerator(resolve, output, self.bufferSize)
+            responseCnt.source = self.renderAsGenerator(resolve, output)
 
-    def renderAsGenerator(self, resolve, output, bufferSize):
+    def renderAsGenerator(self, resolve, output):
         '''
         Create a generator for rendering the encoder.
         '''
+        assert isinstance(output, OutputChunks), 'Invalid output %s' % output
+        chunks = output.chunks
         while resolve.has():
-            if output.tell() >= bufferSize:
-                yield output.getvalue()
-                output.seek(0)
-                output.truncate()
+            while chunks: yield chunks.popleft()
             resolve.do()
-        yield output.getvalue()
         output.close()
+        while chunks: yield chunks.popleft()
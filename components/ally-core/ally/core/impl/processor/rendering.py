@@ -15,6 +15,8 @@ from ally.design.context import Context, defines, optional
 from ally.design.processor import Assembly, Handler, Processing, NO_VALIDATION, \
     Chain, Function
 from ally.exception import DevelError
+from collections import OrderedDict, Callable
+from threading import Lock
 import codecs
 import itertools
 
@@ -36,6 +38,10 @@ class Response(Context):
     code = defines(int)
     isSuccess = defines(bool)
     text = defines(str)
+    renderFactory = defines(Callable, doc='''
+    @rtype: callable(IOutputStream) -> IRender
+    The renderer factory to be used for the response.
+    ''')
 
 class ResponseContent(Context):
     '''
@@ -67,12 +73,16 @@ class RenderingHandler(Handler):
     renderingAssembly = Assembly
     # The render processors, if a processor is successful in the rendering factory creation process it has to stop the 
     # chain execution.
+    cacheSize = 500
+    # The maximum number of negotiation results to be cached, the results are cached for each distinct accepted content
+    # types, accepted character sets, content type and character set.
 
     def __init__(self):
         assert isinstance(self.renderingAssembly, Assembly), 'Invalid renders assembly %s' % self.renderingAssembly
         assert isinstance(self.contentTypeDefaults, (list, tuple)), \
         'Invalid default content type %s' % self.contentTypeDefaults
         assert isinstance(self.charSetDefault, str), 'Invalid default character set %s' % self.charSetDefault
+        assert isinstance(self.cacheSize, int), 'Invalid cache size %s' % self.cacheSize
 
         renderingProcessing = self.renderingAssembly.create(NO_VALIDATION, request=Request,
                                                             response=Response, responseCnt=ResponseContent)
@@ -80,6 +90,8 @@ class RenderingHandler(Handler):
         super().__init__(Function(renderingProcessing.contexts, self.process))
 
         self._renderingProcessing = renderingProcessing
+        self._negotiated = OrderedDict()
+        self._lock = Lock()
 
     def process(self, chain, request, response, responseCnt, **keyargs):
         '''
@@ -91,7 +103,39 @@ class RenderingHandler(Handler):
         assert isinstance(responseCnt, ResponseContent), 'Invalid response content %s' % responseCnt
 
         chain.proceed()
-        
+
+        key = (tuple(request.accTypes or ()), tuple(request.accCharSets or ()),
+               responseCnt.type if ResponseContent.type in responseCnt else None,
+               responseCnt.charSet if ResponseContent.charSet in responseCnt else None)
+        with self._lock:
+            negotiated = self._negotiated.get(key)
+            if negotiated is not None: self._negotiated.move_to_end(key)
+
+        if negotiated is None:
+            negotiated = self.negotiate(request, response, responseCnt, **keyargs)
+            if self.cacheSize > 0:
+                with self._lock:
+                    self._negotiated[key] = negotiated
+                    while len(self._negotiated) > self.cacheSize: self._negotiated.popitem(last=False)
+
+        responseCnt.charSet, responseCnt.type, response.renderFactory, unsupported = negotiated
+        if unsupported is not None and response.isSuccess is not False:
+            response.code, response.isSuccess = UNKNOWN_ENCODING
+            response.text = 'Content type \'%s\' not supported for rendering' % unsupported
+
+    # ----------------------------------------------------------------
+
+    def negotiate(self, request, response, responseCnt, **keyargs):
+        '''
+        Negotiates the character set and content type for the response by walking the rendering chains.
+
+        @return: tuple(string, string, callable, string|None)
+            The negotiated character set, content type, render factory and the requested content type if this type is
+            not supported for rendering.
+        '''
+        assert isinstance(request, Request), 'Invalid request %s' % request
+        assert isinstance(responseCnt, ResponseContent), 'Invalid response content %s' % responseCnt
+
         # Resolving the character set
         if ResponseContent.charSet in responseCnt:
             try: codecs.lookup(responseCnt.charSet)
@@ -106,14 +150,11 @@ class RenderingHandler(Handler):
                 break
             else: responseCnt.charSet = self.charSetDefault
 
-        resolved = False
+        resolved, unsupported = False, None
         if ResponseContent.type in responseCnt:
             renderChain = Chain(self._renderingProcessing)
             renderChain.process(request=request, response=response, responseCnt=responseCnt, **keyargs)
-            if renderChain.doAll().isConsumed():
-                if response.isSuccess is not False:
-                    response.code, response.isSuccess = UNKNOWN_ENCODING
-                    response.text = 'Content type \'%s\' not supported for rendering' % responseCnt.type
+            if renderChain.doAll().isConsumed(): unsupported = responseCnt.type
             else: resolved = True
 
         if not resolved:
@@ -126,3 +167,5 @@ class RenderingHandler(Handler):
             else:
                 raise DevelError('There is no renderer available, this is more likely a setup issues since the '
                                  'default content types should have resolved the renderer')
+
+        return responseCnt.charSet, responseCnt.type, response.renderFactory, unsupported
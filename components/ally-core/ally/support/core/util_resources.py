@@ -16,9 +16,11 @@ from ally.api.type import typeFor, Input
 from ally.core.impl.invoker import InvokerRestructuring, InvokerCall
 from ally.core.impl.node import NodePath, NodeProperty, MatchProperty
 from ally.core.spec.resources import Match, Node, Path, ConverterPath, \
-    IResourcesRegister, Invoker, PathExtended
+    IResourcesRegister, Invoker, PathExtended, INodeChildListener, \
+    INodeInvokerListener
 from ally.support.util import immut
-from collections import deque, Iterable
+from collections import deque, Iterable, OrderedDict
+from threading import Lock
 
 # --------------------------------------------------------------------
 
@@ -135,6 +137,133 @@ def findPath(node, paths, converterPath):
 
     return Path(matches)
 
+class RoutingIndex(INodeChildListener, INodeInvokerListener):
+    '''
+    Provides the routing index for finding the resource paths, the path nodes children are indexed by the normalized
+    name and the other children are tried in order after the path nodes. The index also caches the resolved paths for the
+    most recently requested path elements, the index is kept up to date by listening to the nodes structure.
+    '''
+
+    def __init__(self, root, converterPath, cacheSize=1000):
+        '''
+        Construct the routing index.
+        
+        @param root: Node
+            The root node to index.
+        @param converterPath: ConverterPath
+            The converter path used in handling the path elements.
+        @param cacheSize: integer
+            The maximum number of resolved paths to cache, 0 for no caching.
+        '''
+        assert isinstance(root, Node), 'Invalid root node %s' % root
+        assert isinstance(converterPath, ConverterPath), 'Invalid converter path %s' % converterPath
+        assert isinstance(cacheSize, int) and cacheSize >= 0, 'Invalid cache size %s' % cacheSize
+        self.root = root
+        self.converterPath = converterPath
+        self.cacheSize = cacheSize
+
+        self._children = {}
+        self._paths = OrderedDict()
+        self._lock = Lock()
+        root.addStructureListener(self)
+
+    def findPath(self, paths):
+        '''
+        Finds the resource node for the provided request path.
+        @see: findPath
+        
+        @param paths: deque[string]|Iterable[string]
+            The path elements identifying a resource to be searched for, if a deque is provided it will be consumed
+            of every path element that was successfully identified.
+        @return: Path
+            The path leading to the node that provides the resource.
+        '''
+        if not isinstance(paths, deque):
+            assert isinstance(paths, Iterable), 'Invalid iterable paths %s' % paths
+            paths = deque(paths)
+        assert isinstance(paths, deque), 'Invalid paths %s' % paths
+
+        if len(paths) == 0: return Path([], self.root)
+
+        key = tuple(paths)
+        with self._lock:
+            resolved = self._paths.get(key)
+            if resolved is not None: self._paths.move_to_end(key)
+
+        if resolved is None:
+            resolved = self._resolve(deque(paths))
+            if self.cacheSize:
+                with self._lock:
+                    self._paths[key] = resolved
+                    while len(self._paths) > self.cacheSize: self._paths.popitem(last=False)
+
+        matches, node, consumed = resolved
+        for _k in range(consumed): paths.popleft()
+        # The cached matches are cloned since the matches of a path can be updated.
+        return Path([match.clone() for match in matches], node)
+
+    def onChildAdded(self, node, child):
+        '''
+        @see: INodeChildListener.onChildAdded
+        '''
+        with self._lock:
+            self._children.pop(id(node), None)
+            self._paths.clear()
+
+    def onInvokerChange(self, node, old, new):
+        '''
+        @see: INodeInvokerListener.onInvokerChange
+        '''
+        with self._lock: self._paths.clear()
+
+    # ----------------------------------------------------------------
+
+    def _resolve(self, paths):
+        '''
+        Resolves the path elements using the index.
+        
+        @return: tuple(list[Match], Node|None, integer)
+            A tuple containing the matches, the found node (None if the path elements have not been fully recognized)
+            and the number of path elements that have been recognized.
+        '''
+        assert isinstance(paths, deque), 'Invalid paths %s' % paths
+        total, node, matches = len(paths), self.root, []
+        found = pushMatch(matches, node.tryMatch(self.converterPath, paths))
+        while found and len(paths) > 0:
+            names, others = self._childrenOf(node)
+            child = names.get(paths[0])
+            if child is not None:
+                paths.popleft()
+                pushMatch(matches, child.newMatch())
+                node = child
+                continue
+
+            found = False
+            for child in others:
+                assert isinstance(child, Node)
+                if pushMatch(matches, child.tryMatch(self.converterPath, paths)):
+                    node = child
+                    found = True
+                    break
+
+        return matches, node if len(paths) == 0 else None, total - len(paths)
+
+    def _childrenOf(self, node):
+        '''
+        Provides the indexed children of the node.
+        
+        @return: tuple(dictionary{string: NodePath}, list[Node])
+            The path nodes indexed by the normalized name and the other nodes in the matching order.
+        '''
+        indexed = self._children.get(id(node))
+        if indexed is None:
+            names, others = {}, []
+            for child in node.children:
+                if isinstance(child, NodePath): names[self.converterPath.normalize(child.name)] = child
+                else: others.append(child)
+            indexed = self._children[id(node)] = (names, others)
+        return indexed
+
 def findGetModel(fromPath, typeModel):
     '''
     Finds the path for the first Node that provides a get for the name. The search is made based
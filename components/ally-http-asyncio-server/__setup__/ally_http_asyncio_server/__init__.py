@@ -0,0 +1,19 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Contains setup and configuration files for the HTTP REST server.
+'''
+
+from .. import ally_http
+
+# --------------------------------------------------------------------
+
+NAME = 'ally HTTP asyncio server'
+GROUP = ally_http.GROUP
+VERSION = '1.0'
+DESCRIPTION = 'Provides the HTTP asyncio server'
@@ -0,0 +1,38 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides the setup patch when the server is run with ally core http.
+'''
+
+from ..ally_http import server_type
+from ally.container import ioc
+import logging
+
+# --------------------------------------------------------------------
+
+log = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------
+
+try: from .. import ally_core_http
+except ImportError: log.info('No REST core available thus skip the resources patching specific for asyncio')
+else:
+    ally_core_http = ally_core_http # Just to avoid the import warning
+    # ----------------------------------------------------------------
+    
+    from ..ally_core.processor import assemblyResources, parser
+    from ..ally_core_http.processor import updateAssemblyResourcesForHTTP
+    from ..ally_http_asyncore_server.patch_ally_http_core import asyncoreContent
+
+    # ----------------------------------------------------------------
+    
+    @ioc.after(updateAssemblyResourcesForHTTP)
+    def updateAssemblyResourcesForHTTPAsyncio():
+        # The asyncio server uses the same content readers as the asyncore server.
+        if server_type() == 'asyncio':
+            assemblyResources().add(asyncoreContent(), before=parser())
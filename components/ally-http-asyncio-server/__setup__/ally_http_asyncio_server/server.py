@@ -0,0 +1,31 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Runs the asyncio py web server.
+'''
+
+from ..ally_http import server_type, server_version, server_host, server_port
+from ..ally_http.server import pathAssemblies
+from ally.container import ioc
+from threading import Thread
+
+# --------------------------------------------------------------------
+
+ioc.doc(server_type, '''
+    "asyncio" - server made based on asyncio package, fast (runs on a single CPU) and keeps the connections alive, it
+                also supports pipelined requests, requires python 3.4 or later
+''')
+
+# --------------------------------------------------------------------
+
+@ioc.start
+def runServer():
+    if server_type() == 'asyncio':
+        from ally.http.server import server_asyncio
+        args = pathAssemblies(), server_version(), server_host(), server_port()
+        Thread(name='HTTP server thread', target=server_asyncio.run, args=args).start()
@@ -0,0 +1,224 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides testing for the asyncio server protocol.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.design.context import Context, requires, defines, optional
+from ally.design.processor import HandlerProcessor, HandlerProcessorProceed, \
+    Assembly, Chain, NO_VALIDATION
+from ally.http.impl.processor.asyncore_content import ReaderInMemory
+from ally.http.server.server_asyncio import RequestProtocol, AsyncioServer, \
+    RequestContentHTTPAsyncio
+from ally.http.spec.server import RequestHTTP, ResponseHTTP, ResponseContentHTTP
+from ally.support.util_io import IInputStream
+from collections import Callable, Iterable
+import asyncio
+import re
+import unittest
+
+# --------------------------------------------------------------------
+
+class Request(Context):
+    methodName = requires(str)
+    uri = requires(str)
+    headers = requires(dict)
+
+class RequestContent(Context):
+    length = defines(int)
+    contentReader = defines(Callable)
+    source = optional(IInputStream)
+
+class Response(Context):
+    code = defines(int)
+    isSuccess = defines(bool)
+    headers = defines(dict)
+
+class ResponseContent(Context):
+    source = defines(Iterable)
+
+class HandlerContent(HandlerProcessor):
+
+    def process(self, chain, request:Request, requestCnt:RequestContent, **keyargs):
+        assert isinstance(chain, Chain)
+        chain.proceed()
+        if request.methodName == 'POST':
+            length = request.headers.get('Content-Length')
+            if length is not None: requestCnt.length = int(length)
+            requestCnt.contentReader = ReaderInMemory(chain, requestCnt)
+
+class HandlerRespond(HandlerProcessorProceed):
+
+    def process(self, request:Request, requestCnt:RequestContent, response:Response, responseCnt:ResponseContent,
+                **keyargs):
+        content = b''
+        if requestCnt.source is not None: content = requestCnt.source.read()
+        content = b'%s %s [%s]' % (request.methodName.encode(), request.uri.encode(), content)
+
+        response.code, response.isSuccess = 200, True
+        if request.uri == 'chunked': responseCnt.source = (bytes((byte,)) for byte in content)
+        else:
+            response.headers = {'Content-Length': str(len(content))}
+            responseCnt.source = (content,)
+        if request.uri == 'close': response.headers['Connection'] = 'TE, Close'
+        elif request.uri == 'keep': response.headers['Connection'] = 'Keep-Alive'
+
+class Transport:
+
+    def __init__(self):
+        self.data = bytearray()
+        self.closed = self.paused = False
+
+    def write(self, data): self.data.extend(data)
+
+    def writelines(self, lines):
+        for data in lines: self.write(data)
+
+    def close(self): self.closed = True
+
+    def pause_reading(self): self.paused = True
+
+    def resume_reading(self): self.paused = False
+
+    def get_extra_info(self, name): return None
+
+# --------------------------------------------------------------------
+
+class TestServerAsyncio(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        assembly = Assembly()
+        assembly.add(HandlerContent(), HandlerRespond())
+        processing = assembly.create(NO_VALIDATION, request=RequestHTTP, requestCnt=RequestContentHTTPAsyncio,
+                                     response=ResponseHTTP, responseCnt=ResponseContentHTTP)
+        self.server = AsyncioServer(self.loop, [(re.compile('^resources(/|$)'), processing)], 'Test', RequestProtocol)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def connect(self):
+        protocol, transport = self.server(), Transport()
+        protocol.connection_made(transport)
+        return protocol, transport
+
+    def responses(self, transport):
+        return [response.split(b'\r\n\r\n', 1) for response in
+                re.split(b'(?=HTTP/1.1 )', bytes(transport.data)) if response]
+
+    def assertResponse(self, response, status, body, *headers):
+        head, content = response
+        self.assertTrue(head.startswith(status), head)
+        for header in headers: self.assertIn(header, head.split(b'\r\n'))
+        self.assertEqual(content, body)
+
+    def testKeepAlive(self):
+        protocol, transport = self.connect()
+        protocol.data_received(b'GET /resources/A HTTP/1.1\r\nHost: x\r\n\r\n')
+        protocol.data_received(b'GET /resources/B HTTP/1.1\r\nHost: x\r\n\r\n')
+        self.assertFalse(transport.closed)
+
+        first, second = self.responses(transport)
+        self.assertResponse(first, b'HTTP/1.1 200', b'GET A []', b'Content-Length: 8', b'Connection: keep-alive')
+        self.assertResponse(second, b'HTTP/1.1 200', b'GET B []', b'Connection: keep-alive')
+
+        del transport.data[:]
+        protocol.data_received(b'GET /resources/C HTTP/1.1\r\nConnection: close\r\n\r\n')
+        self.assertResponse(self.responses(transport)[0], b'HTTP/1.1 200', b'GET C []', b'Connection: close')
+        self.assertTrue(transport.closed)
+
+    def testResponseConnection(self):
+        protocol, transport = self.connect()
+        protocol.data_received(b'GET /resources/keep HTTP/1.1\r\n\r\n')
+        head, _content = self.responses(transport)[0]
+        self.assertEqual([line for line in head.split(b'\r\n') if line.startswith(b'Connection:')],
+                         [b'Connection: Keep-Alive'])
+        self.assertFalse(transport.closed)
+
+        del transport.data[:]
+        protocol.data_received(b'GET /resources/close HTTP/1.1\r\n\r\nGET /resources/A HTTP/1.1\r\n\r\n')
+        responses = self.responses(transport)
+        self.assertEqual(len(responses), 1)
+        head, _content = responses[0]
+        self.assertEqual([line for line in head.split(b'\r\n') if line.startswith(b'Connection:')],
+                         [b'Connection: TE, Close'])
+        self.assertTrue(transport.closed)
+
+    def testPipelining(self):
+        protocol, transport = self.connect()
+        protocol.data_received(b'GET /resources/A HTTP/1.1\r\n\r\nPOST /resources/B HTTP/1.1\r\nContent-Length: 3'
+                               b'\r\n\r\nabcGET /resources/C HTTP/1.1\r\n\r\n')
+        responses = self.responses(transport)
+        self.assertEqual([content for _head, content in responses], [b'GET A []', b'POST B [abc]', b'GET C []'])
+
+        del transport.data[:]
+        protocol.data_received(b'POST /resources/D HTTP/1.1\r\nContent-Length: 4\r\n\r\nab')
+        self.assertEqual(transport.data, b'')
+        protocol.data_received(b'cd')
+        self.assertResponse(self.responses(transport)[0], b'HTTP/1.1 200', b'POST D [abcd]')
+
+    def testContentWithoutLength(self):
+        protocol, transport = self.connect()
+        protocol.data_received(b'POST /resources/A HTTP/1.1\r\n\r\n')
+        self.assertResponse(self.responses(transport)[0], b'HTTP/1.1 200', b'POST A []', b'Connection: keep-alive')
+        self.assertFalse(transport.closed)
+
+    def testNotFound(self):
+        protocol, transport = self.connect()
+        protocol.data_received(b'POST /other HTTP/1.1\r\nContent-Length: 3\r\n\r\nabcGET /resources/A HTTP/1.1\r\n\r\n')
+        notFound, found = self.responses(transport)
+        self.assertResponse(notFound, b'HTTP/1.1 404', b'', b'Content-Length: 0')
+        self.assertResponse(found, b'HTTP/1.1 200', b'GET A []')
+
+    def testChunked(self):
+        protocol, transport = self.connect()
+        protocol.data_received(b'GET /resources/chunked HTTP/1.1\r\n\r\n')
+        head, content = self.responses(transport)[0]
+        self.assertIn(b'Transfer-Encoding: chunked', head.split(b'\r\n'))
+        self.assertTrue(content.startswith(b'1\r\nG\r\n1\r\nE\r\n'), content)
+        self.assertTrue(content.endswith(b'1\r\n]\r\n0\r\n\r\n'), content)
+
+        del transport.data[:]
+        protocol.data_received(b'GET /resources/chunked HTTP/1.0\r\n\r\n')
+        self.assertResponse(self.responses(transport)[0], b'HTTP/1.1 200', b'GET chunked []', b'Connection: close')
+        self.assertTrue(transport.closed)
+
+    def testEndOfFile(self):
+        protocol, transport = self.connect()
+        protocol.pause_writing()
+        protocol.data_received(b'GET /resources/chunked HTTP/1.1\r\n\r\n')
+        self.assertTrue(protocol.eof_received())
+        self.assertFalse(transport.closed)
+        self.assertFalse(self.responses(transport)[0][1].endswith(b'0\r\n\r\n'))
+
+        protocol.resume_writing()
+        head, content = self.responses(transport)[0]
+        self.assertIn(b'Transfer-Encoding: chunked', head.split(b'\r\n'))
+        self.assertTrue(content.endswith(b'0\r\n\r\n'), content)
+        self.assertTrue(transport.closed)
+
+        protocol, transport = self.connect()
+        protocol.data_received(b'GET /resources/A HTTP/1.1\r\n\r\n')
+        self.assertFalse(protocol.eof_received())
+
+    def testBadRequest(self):
+        protocol, transport = self.connect()
+        protocol.data_received(b'GARBAGE\r\n\r\n')
+        self.assertResponse(self.responses(transport)[0], b'HTTP/1.1 400', b'', b'Connection: close')
+        self.assertTrue(transport.closed)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,515 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides the asyncio web server based on the python asyncio protocols, the server supports HTTP/1.1 persistent
+connections and pipelining.
+'''
+
+from ally.design.context import optional
+from ally.design.processor import Processing, Assembly, ONLY_AVAILABLE, \
+    CREATE_REPORT, Chain
+from ally.http.spec.server import RequestHTTP, ResponseHTTP, RequestContentHTTP, \
+    ResponseContentHTTP, METHOD_UNKNOWN, METHODS
+from ally.support.util_io import IInputStream, readGenerator
+from collections import Callable
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qsl
+import asyncio
+import logging
+import re
+
+# --------------------------------------------------------------------
+
+log = logging.getLogger(__name__)
+
+# Constants used in indicating the protocol stage.
+STAGE_HEADERS = 1
+STAGE_CONTENT = 2
+STAGE_PROCESS = 3
+
+# --------------------------------------------------------------------
+
+class RequestContentHTTPAsyncio(RequestContentHTTP):
+    '''
+    The request content context.
+    '''
+    # ---------------------------------------------------------------- Optional
+    contentReader = optional(Callable, doc='''
+    @rtype: Callable
+    The content reader callable used for pushing data from the asyncio protocol. Once the reader is finalized it will
+    return a chain that is used for further request processing.
+    ''')
+
+# --------------------------------------------------------------------
+
+class RequestProtocol(asyncio.Protocol):
+    '''
+    Request protocol implementation based on @see: asyncio.Protocol.
+    The protocol parses the HTTP requests received on a connection one after another, so a connection is kept alive
+    and the pipelined requests are processed in the order that they have been received, the responses with unknown
+    length are delivered using the chunked transfer encoding.
+    '''
+
+    bufferSize = 10 * 1024
+    # The buffer size used for reading the response sources.
+    maximumRequestSize = 100 * 1024
+    # The maximum request headers size, 100 kilobytes
+    maximumBufferSize = 1024 * 1024
+    # The maximum size of the buffered data after which the reading is paused until the current request is processed.
+    keepAliveTimeout = 15
+    # The timeout in seconds after which an idle persistent connection is closed.
+    requestTerminator = b'\r\n\r\n'
+    # Terminator that signals the http request is complete
+
+    def __init__(self, server):
+        '''
+        Construct the request protocol.
+
+        @param server: AsyncioServer
+            The server that created the protocol.
+        '''
+        assert isinstance(server, AsyncioServer), 'Invalid server %s' % server
+        self.server = server
+
+        self._transport = None
+        self._buffer = bytearray()
+        self._stage = STAGE_HEADERS
+        self._advancing = False
+        self._readingPaused = False
+        self._writingPaused = False
+        self._idle = None
+        self._eof = False
+
+        self._reader = None
+        self._remaining = None
+        self._discard = 0
+        self._keepAlive = False
+        self._source = None
+        self._chunked = False
+
+    def connection_made(self, transport):
+        '''
+        @see: asyncio.BaseProtocol.connection_made
+        '''
+        self._transport = transport
+        self._idleStart()
+
+    def connection_lost(self, exc):
+        '''
+        @see: asyncio.BaseProtocol.connection_lost
+        '''
+        self._idleStop()
+        self._transport = None
+        self._source = None
+
+    def data_received(self, data):
+        '''
+        @see: asyncio.Protocol.data_received
+        '''
+        self._idleStop()
+        self._buffer.extend(data)
+        if len(self._buffer) > self.maximumBufferSize and not self._readingPaused:
+            self._readingPaused = True
+            self._transport.pause_reading()
+        self._advance()
+        # While waiting for more request data the idle timeout also applies.
+        if self._stage != STAGE_PROCESS and self._transport is not None: self._idleStart()
+
+    def eof_received(self):
+        '''
+        @see: asyncio.Protocol.eof_received
+        '''
+        self._eof = True
+        if self._stage == STAGE_PROCESS:
+            # The connection is closed after the response in progress is delivered, @see: _finalize
+            return True  # We keep the transport open in order to deliver the response.
+
+    def pause_writing(self):
+        '''
+        @see: asyncio.BaseProtocol.pause_writing
+        '''
+        self._writingPaused = True
+
+    def resume_writing(self):
+        '''
+        @see: asyncio.BaseProtocol.resume_writing
+        '''
+        self._writingPaused = False
+        self._write()
+
+    # ----------------------------------------------------------------
+
+    def _advance(self):
+        '''
+        Advances the processing of the buffered data, this method is safe to be called when already advancing.
+        '''
+        if self._advancing: return
+        self._advancing = True
+        try:
+            while self._transport is not None:
+                if self._stage == STAGE_HEADERS:
+                    if self._discard:
+                        count = min(self._discard, len(self._buffer))
+                        del self._buffer[:count]
+                        self._discard -= count
+                        if self._discard: break
+
+                    index = self._buffer.find(self.requestTerminator)
+                    if index < 0:
+                        if len(self._buffer) > self.maximumRequestSize:
+                            self._respondError(400, 'Request to long')
+                        break
+
+                    index += len(self.requestTerminator)
+                    head = bytes(self._buffer[:index])
+                    del self._buffer[:index]
+                    self._process(head)
+
+                elif self._stage == STAGE_CONTENT:
+                    if not self._buffer: break
+                    count = min(self._remaining, len(self._buffer))
+                    data = bytes(self._buffer[:count])
+                    del self._buffer[:count]
+                    self._remaining -= count
+                    self._content(data)
+
+                else: break
+
+            if self._readingPaused and self._transport is not None and len(self._buffer) <= self.maximumBufferSize:
+                self._readingPaused = False
+                self._transport.resume_reading()
+        except:
+            log.exception('A problem occurred while processing the request from \'%s\'' % self._peer())
+            if self._transport is not None: self._transport.close()
+        finally: self._advancing = False
+
+    def _process(self, head):
+        '''
+        Process the request for the provided request head.
+
+        @param head: bytes
+            The request line and headers.
+        '''
+        assert isinstance(head, bytes), 'Invalid head %s' % head
+
+        lines = head.decode('iso-8859-1').split('\r\n')
+        requestLine = lines[0].split()
+        if len(requestLine) != 3 or not requestLine[2].startswith('HTTP/'):
+            self._respondError(400, 'Bad request syntax')
+            return
+        method, path, version = requestLine
+
+        headers, headersLower = {}, {}
+        for line in lines[1:]:
+            if not line: continue
+            name, _sep, value = line.partition(':')
+            if not _sep:
+                self._respondError(400, 'Bad header syntax')
+                return
+            name, value = name.strip(), value.strip()
+            if name in headers: headers[name] = '%s, %s' % (headers[name], value)
+            else: headers[name] = value
+            headersLower[name.lower()] = headers[name]
+
+        connection = headersLower.get('connection', '').lower()
+        if version == 'HTTP/1.1': self._keepAlive = 'close' not in connection
+        else: self._keepAlive = 'keep-alive' in connection
+        self._chunked = version == 'HTTP/1.1'
+
+        length = headersLower.get('content-length')
+        if length is not None:
+            try: length = int(length)
+            except ValueError:
+                self._respondError(400, 'Invalid content length')
+                return
+        elif 'transfer-encoding' in headersLower:
+            self._respondError(411, 'Chunked request content is not supported')
+            return
+
+        method = method.upper()
+        if method not in METHODS: method = METHOD_UNKNOWN
+
+        url = urlparse(path)
+        path = url.path.lstrip('/')
+        for regex, processing in self.server.pathProcessing:
+            match = regex.match(path)
+            if match:
+                uriRoot = path[:match.end()]
+                if not uriRoot.endswith('/'): uriRoot += '/'
+
+                assert isinstance(processing, Processing), 'Invalid processing %s' % processing
+                req, reqCnt = processing.contexts['request'](), processing.contexts['requestCnt']()
+                rsp, rspCnt = processing.contexts['response'](), processing.contexts['responseCnt']()
+
+                assert isinstance(req, RequestHTTP), 'Invalid request %s' % req
+                assert isinstance(reqCnt, RequestContentHTTPAsyncio), 'Invalid request content %s' % reqCnt
+                assert isinstance(rsp, ResponseHTTP), 'Invalid response %s' % rsp
+                assert isinstance(rspCnt, ResponseContentHTTP), 'Invalid response content %s' % rspCnt
+
+                req.scheme, req.uriRoot, req.uri = 'http', uriRoot, path[match.end():]
+                req.parameters = parse_qsl(url.query, True, False)
+                break
+        else:
+            self._discard = length or 0
+            self._respond(404)
+            return
+
+        req.methodName = method
+        req.headers = headers
+
+        self._stage = STAGE_PROCESS
+        chain = Chain(processing)
+        chain.process(request=req, requestCnt=reqCnt, response=rsp, responseCnt=rspCnt)
+        chain.callBack(lambda: self._respondFor(rsp, rspCnt))
+
+        while True:
+            if not chain.do(): break
+            if reqCnt.contentReader is not None:
+                self._stage = STAGE_CONTENT
+                self._reader = reqCnt.contentReader
+                # Under HTTP/1.1 a request without a content length and transfer encoding has no content.
+                self._remaining = length or 0
+                if not self._remaining: self._content(b'')
+                return
+
+        # There is no reader for the content so we need to skip it.
+        self._discard = length or 0
+
+    def _content(self, data):
+        '''
+        Pushes the content data to the reader.
+
+        @param data: bytes
+            The content data, empty bytes if the content is finalized.
+        '''
+        assert self._reader is not None, 'No reader available'
+        chain = self._reader(data)
+        if chain is None and self._remaining == 0: chain = self._reader(b'')
+        if chain is not None:
+            assert isinstance(chain, Chain), 'Invalid chain %s' % chain
+            self._reader = self._remaining = None
+            self._stage = STAGE_PROCESS
+            chain.doAll()
+
+    # ----------------------------------------------------------------
+
+    def _respondFor(self, rsp, rspCnt):
+        '''
+        Respond based on the provided response contexts.
+        '''
+        assert isinstance(rsp, ResponseHTTP), 'Invalid response %s' % rsp
+        assert isinstance(rspCnt, ResponseContentHTTP), 'Invalid response content %s' % rspCnt
+        assert isinstance(rsp.code, int), 'Invalid response code %s' % rsp.code
+
+        if rspCnt.source is not None:
+            if isinstance(rspCnt.source, IInputStream): source = readGenerator(rspCnt.source, self.bufferSize)
+            else: source = rspCnt.source
+        else: source = None
+
+        self._respond(rsp.code, rsp.text if ResponseHTTP.text in rsp else None,
+                      rsp.headers if ResponseHTTP.headers in rsp else None, source)
+
+    def _respondError(self, code, text):
+        '''
+        Respond with the provided error and close the connection.
+        '''
+        self._keepAlive = False
+        self._respond(code, text)
+
+    def _respond(self, code, text=None, headers=None, source=None):
+        '''
+        Writes the response status and headers and starts writing the response content.
+
+        @param code: integer
+            The response status code.
+        @param text: string|None
+            The response status text.
+        @param headers: dictionary{string, string}|None
+            The response headers.
+        @param source: Iterable|None
+            The response content.
+        '''
+        assert isinstance(code, int), 'Invalid code %s' % code
+        if self._transport is None: return
+        self._stage = STAGE_PROCESS
+
+        if text is None:
+            text = BaseHTTPRequestHandler.responses.get(code)
+            text = text[0] if text else ''
+
+        lines = ['HTTP/1.1 %s %s' % (code, text), 'Server: %s' % self.server.serverVersion,
+                 'Date: %s' % formatdate(usegmt=True)]
+        hasLength, connection = False, None
+        if headers:
+            for name, value in headers.items():
+                nameLower = name.lower()
+                if nameLower == 'content-length': hasLength = True
+                elif nameLower == 'connection':
+                    # The connection header is written after deciding if the connection is kept alive.
+                    connection = value
+                    continue
+                lines.append('%s: %s' % (name, value))
+        closing = connection is not None and 'close' in (token.strip().lower() for token in connection.split(','))
+        # The processors can require the connection to be closed after the response.
+        if closing: self._keepAlive = False
+
+        self._chunked = chunked = self._chunked and source is not None and not hasLength
+        if source is None:
+            if not hasLength and code != 204 and code != 304: lines.append('Content-Length: 0')
+        elif chunked: lines.append('Transfer-Encoding: chunked')
+        elif not hasLength: self._keepAlive = False  # The end of content is provided by closing the connection.
+
+        if self._keepAlive and self._eof and not self._buffer: self._keepAlive = False  # No more requests to come
+        if self._keepAlive: lines.append('Connection: %s' % (connection or 'keep-alive'))
+        elif closing: lines.append('Connection: %s' % connection)
+        else: lines.append('Connection: close')
+        lines.append('\r\n')
+
+        self._transport.write('\r\n'.join(lines).encode('iso-8859-1'))
+        self._source = iter(source) if source is not None else None
+        self._write()
+
+    def _write(self):
+        '''
+        Writes the response content as long as the transport allows writing.
+        '''
+        while self._source is not None and not self._writingPaused:
+            try: data = next(self._source)
+            except StopIteration:
+                self._source = None
+                if self._chunked: self._transport.write(b'0\r\n\r\n')
+                break
+            if not data: continue
+            if self._chunked: self._transport.writelines((('%x\r\n' % len(data)).encode(), data, b'\r\n'))
+            else: self._transport.write(data)
+
+        if self._source is None and self._transport is not None: self._finalize()
+
+    def _finalize(self):
+        '''
+        Finalizes the current request, the connection is either closed or made ready for the next request.
+        '''
+        if not self._keepAlive or (self._eof and not self._buffer):
+            self._transport.close()
+            self._transport = None
+            return
+        self._stage = STAGE_HEADERS
+        self._idleStart()
+        # If already advancing the pipelined requests are processed by the advancing loop.
+        if self._buffer: self._advance()
+
+    # ----------------------------------------------------------------
+
+    def _idleStart(self):
+        '''
+        Starts the idle timeout for the connection.
+        '''
+        self._idleStop()
+        self._idle = self.server.loop.call_later(self.keepAliveTimeout, self._idleTimeout)
+
+    def _idleStop(self):
+        '''
+        Stops the idle timeout for the connection.
+        '''
+        if self._idle is not None:
+            self._idle.cancel()
+            self._idle = None
+
+    def _idleTimeout(self):
+        '''
+        Called whenever the connection has been idle for to long.
+        '''
+        self._idle = None
+        if self._stage != STAGE_PROCESS and self._transport is not None:
+            assert log.debug('Closing idle connection from \'%s\'', self._peer()) or True
+            self._transport.close()
+
+    def _peer(self):
+        '''
+        Provides the peer address of the connection.
+        '''
+        if self._transport is None: return None
+        return self._transport.get_extra_info('peername')
+
+# --------------------------------------------------------------------
+
+class AsyncioServer:
+    '''
+    The asyncio server that provides the protocols for the connections.
+    '''
+
+    def __init__(self, loop, pathProcessing, serverVersion, protocolFactory):
+        '''
+        Construct the server.
+
+        @param loop: asyncio.AbstractEventLoop
+            The event loop of the server.
+        @param pathProcessing: list[tuple(regex, Processing)]
+            A list that contains tuples having on the first position a regex for matching a path, and the second value
+            the processing for handling the path.
+        @param serverVersion: string
+            The server version name.
+        @param protocolFactory: callable(AsyncioServer)
+            The factory that provides the connection protocols, takes as argument the server.
+        '''
+        assert isinstance(loop, asyncio.AbstractEventLoop), 'Invalid loop %s' % loop
+        assert isinstance(pathProcessing, list), 'Invalid path processing %s' % pathProcessing
+        assert isinstance(serverVersion, str), 'Invalid server version %s' % serverVersion
+        assert callable(protocolFactory), 'Invalid protocol factory %s' % protocolFactory
+
+        self.loop = loop
+        self.pathProcessing = pathProcessing
+        self.serverVersion = serverVersion
+        self.protocolFactory = protocolFactory
+
+    def __call__(self):
+        '''
+        Provides a new protocol for a connection.
+        '''
+        return self.protocolFactory(self)
+
+# --------------------------------------------------------------------
+
+def run(pathAssemblies, server_version, host='', port=80):
+    '''
+    Run the asyncio server.
+
+    @param pathAssemblies: list[(regex, Assembly)]
+        A list that contains tuples having on the first position a string pattern for matching a path, and as a value
+        the assembly to be used for creating the context for handling the request for the path.
+    '''
+    assert isinstance(pathAssemblies, list), 'Invalid path assemblies %s' % pathAssemblies
+    pathProcessing = []
+    for pattern, assembly in pathAssemblies:
+        assert isinstance(pattern, str), 'Invalid pattern %s' % pattern
+        assert isinstance(assembly, Assembly), 'Invalid assembly %s' % assembly
+
+        processing, report = assembly.create(ONLY_AVAILABLE, CREATE_REPORT,
+                                             request=RequestHTTP, requestCnt=RequestContentHTTPAsyncio,
+                                             response=ResponseHTTP, responseCnt=ResponseContentHTTP)
+
+        log.info('Assembly report for pattern \'%s\':\n%s', pattern, report)
+        pathProcessing.append((re.compile(pattern), processing))
+
+    loop, listener = asyncio.new_event_loop(), None
+    asyncio.set_event_loop(loop)
+    try:
+        server = AsyncioServer(loop, pathProcessing, server_version, RequestProtocol)
+        listener = loop.run_until_complete(loop.create_server(server, host, port, backlog=1024))
+        print('=' * 50, 'Started Asyncio REST API server...')
+        loop.run_forever()
+    except KeyboardInterrupt:
+        print('=' * 50, '^C received, shutting down server')
+    except:
+        log.exception('=' * 50 + ' The server has stooped')
+    finally:
+        if listener is not None:
+            listener.close()
+            loop.run_until_complete(listener.wait_closed())
+        loop.close()
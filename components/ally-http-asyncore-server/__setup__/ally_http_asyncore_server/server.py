@@ -14,20 +14,46 @@ from ..ally_http.server import pathAssemblies
 from ally.container import ioc
 from ally.http.server import server_asyncore
 from threading import Thread
+import os
+import signal
 
 # --------------------------------------------------------------------
 
 @ioc.replace(server_type)
 def server_type_asyncore():
     '''
-    "asyncore" - server made based on asyncore package, fast (runs on a single CPU) and reliable.
+    "asyncore" - server made based on asyncore package, fast (runs on a single CPU, unless workers are configured) and
+    reliable.
     '''
     return 'asyncore'
 
+@ioc.config
+def server_workers() -> int:
+    '''
+    The number of worker processes for the asyncore server, if 0 the server runs in the application process, otherwise
+    the application process forks a supervisor process that forks the workers sharing the server socket and respawns
+    them if they crash. Sending a SIGHUP signal to the application process gracefully restarts the workers and a SIGTERM
+    or SIGINT gracefully stops them. Only available on POSIX systems.
+    '''
+    return 0
+
 # --------------------------------------------------------------------
 
 @ioc.start
 def runServer():
     if server_type() == 'asyncore':
         args = pathAssemblies(), server_version(), server_host(), server_port()
-        Thread(name='HTTP server thread', target=server_asyncore.run, args=args).start()
+        if server_workers() > 0:
+            supervisor = server_asyncore.Supervisor(server_workers())
+            # The supervisor process needs to be forked and the signal handlers registered from the main thread.
+            server_asyncore.run(*args, supervisor=supervisor)
+            
+            def terminate(signum, frame):
+                supervisor.stop()
+                signal.signal(signum, signal.SIG_DFL)
+                os.kill(os.getpid(), signum)
+            signal.signal(signal.SIGHUP, lambda signum, frame: supervisor.restart())
+            signal.signal(signal.SIGTERM, terminate)
+            signal.signal(signal.SIGINT, terminate)
+            Thread(name='HTTP server supervisor thread', target=supervisor.wait).start()
+        else: Thread(name='HTTP server thread', target=server_asyncore.run, args=args).start()
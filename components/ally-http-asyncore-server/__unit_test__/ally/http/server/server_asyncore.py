@@ -0,0 +1,291 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides testing for the asyncore server request handler.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.design.context import Context, requires, defines, optional
+from ally.design.processor import HandlerProcessor, HandlerProcessorProceed, \
+    Assembly, Chain, NO_VALIDATION
+from ally.http.impl.processor.asyncore_content import ReaderInMemory
+from ally.http.server.server_asyncore import RequestHandler, AsyncServer, \
+    RequestContentHTTPAsyncore, ResponseContentHTTPAsyncore, chunkedGenerator, \
+    Supervisor
+from ally.http.spec.server import RequestHTTP, ResponseHTTP
+from ally.support.util_io import IInputStream
+from ally.support.util_sys import addForkListener, removeForkListener
+from collections import Callable, Iterable
+from http.client import HTTPConnection
+from tempfile import TemporaryDirectory
+import os
+import re
+import signal
+import time
+import unittest
+
+# --------------------------------------------------------------------
+
+class Request(Context):
+    methodName = requires(str)
+    uri = requires(str)
+    headers = requires(dict)
+
+class RequestContent(Context):
+    length = defines(int)
+    contentReader = defines(Callable)
+    source = optional(IInputStream)
+
+class Response(Context):
+    code = defines(int)
+    isSuccess = defines(bool)
+    headers = defines(dict)
+
+class ResponseContent(Context):
+    source = defines(Iterable)
+    length = defines(int)
+
+class HandlerContent(HandlerProcessor):
+
+    def process(self, chain, request:Request, requestCnt:RequestContent, **keyargs):
+        assert isinstance(chain, Chain)
+        chain.proceed()
+        if request.methodName == 'POST':
+            length = request.headers.get('Content-Length')
+            if length is not None: requestCnt.length = int(length)
+            requestCnt.contentReader = ReaderInMemory(chain, requestCnt)
+
+class HandlerRespond(HandlerProcessorProceed):
+
+    def process(self, request:Request, requestCnt:RequestContent, response:Response, responseCnt:ResponseContent,
+                **keyargs):
+        content = b''
+        if requestCnt.source is not None: content = requestCnt.source.read()
+        content = b'%s %s [%s]' % (request.methodName.encode(), request.uri.encode(), content)
+        if request.uri == 'pid': content = str(os.getpid()).encode()
+
+        response.code, response.isSuccess, response.headers = 200, True, {}
+        if request.uri == 'close': response.headers['Connection'] = 'TE, Close'
+        if request.uri == 'chunked': responseCnt.source = (bytes((byte,)) for byte in content)
+        else: responseCnt.source, responseCnt.length = (content,), len(content)
+
+class Socket:
+
+    def __init__(self):
+        self.data = bytearray()
+        self.closed = False
+
+    def setblocking(self, flag): pass
+
+    def fileno(self): return id(self)
+
+    def getpeername(self): return ('127.0.0.1', 1000)
+
+    def send(self, data):
+        self.data.extend(data)
+        return len(data)
+
+    def close(self): self.closed = True
+
+# --------------------------------------------------------------------
+
+def createServer():
+    assembly = Assembly()
+    assembly.add(HandlerContent(), HandlerRespond())
+    processing = assembly.create(NO_VALIDATION, request=RequestHTTP, requestCnt=RequestContentHTTPAsyncore,
+                                 response=ResponseHTTP, responseCnt=ResponseContentHTTPAsyncore)
+    return AsyncServer(('127.0.0.1', 0), [(re.compile('^resources(/|$)'), processing)], RequestHandler)
+
+# --------------------------------------------------------------------
+
+class TestServerAsyncore(unittest.TestCase):
+
+    def setUp(self):
+        self.server = createServer()
+
+    def tearDown(self):
+        self.server.close()
+
+    def connect(self):
+        sock = Socket()
+        return RequestHandler(self.server, sock, ('127.0.0.1', 1000)), sock
+
+    def send(self, handler, data):
+        handler.handle_data(data)
+        # Emulates the asyncore loop writing while the handler has something to write.
+        while handler.connected and handler.writable(): handler.handle_write()
+
+    def responses(self, sock):
+        return [response.split(b'\r\n\r\n', 1) for response in
+                re.split(b'(?=HTTP/1.1 )', bytes(sock.data)) if response]
+
+    def assertResponse(self, response, status, body, *headers):
+        head, content = response
+        self.assertTrue(head.startswith(status), head)
+        for header in headers: self.assertIn(header, head.split(b'\r\n'))
+        self.assertEqual(content, body)
+
+    def testKeepAlive(self):
+        handler, sock = self.connect()
+        self.send(handler, b'GET /resources/A HTTP/1.1\r\nHost: x\r\n\r\n')
+        self.assertEqual(handler.stage, 1)
+        self.send(handler, b'GET /resources/B HTTP/1.1\r\nHost: x\r\n\r\n')
+        self.assertFalse(sock.closed)
+
+        first, second = self.responses(sock)
+        self.assertResponse(first, b'HTTP/1.1 200', b'GET A []', b'Content-Length: 8')
+        self.assertResponse(second, b'HTTP/1.1 200', b'GET B []')
+
+        del sock.data[:]
+        self.send(handler, b'GET /resources/C HTTP/1.1\r\nConnection: close\r\n\r\n')
+        self.assertResponse(self.responses(sock)[0], b'HTTP/1.1 200', b'GET C []', b'Connection: close')
+        self.assertTrue(sock.closed)
+
+    def testResponseConnectionClose(self):
+        handler, sock = self.connect()
+        self.send(handler, b'GET /resources/close HTTP/1.1\r\n\r\nGET /resources/A HTTP/1.1\r\n\r\n')
+        responses = self.responses(sock)
+        self.assertEqual(len(responses), 1)
+        self.assertResponse(responses[0], b'HTTP/1.1 200', b'GET close []', b'Connection: TE, Close')
+        self.assertTrue(sock.closed)
+
+    def testPipelining(self):
+        handler, sock = self.connect()
+        self.send(handler, b'GET /resources/A HTTP/1.1\r\n\r\nPOST /resources/B HTTP/1.1\r\nContent-Length: 3'
+                  b'\r\n\r\nabcGET /resources/C HTTP/1.1\r\n\r\n')
+        self.assertEqual([content for _head, content in self.responses(sock)],
+                         [b'GET A []', b'POST B [abc]', b'GET C []'])
+
+        del sock.data[:]
+        self.send(handler, b'POST /resources/D HTTP/1.1\r\nContent-Length: 4\r\n\r\nab')
+        self.assertEqual(sock.data, b'')
+        self.send(handler, b'cd')
+        self.assertResponse(self.responses(sock)[0], b'HTTP/1.1 200', b'POST D [abcd]')
+        self.assertFalse(sock.closed)
+
+    def testContentWithoutLength(self):
+        handler, sock = self.connect()
+        self.send(handler, b'POST /resources/A HTTP/1.1\r\n\r\nGET /resources/B HTTP/1.1\r\n\r\n')
+        self.assertEqual([content for _head, content in self.responses(sock)], [b'POST A []', b'GET B []'])
+        self.assertFalse(sock.closed)
+
+        del sock.data[:]
+        self.send(handler, b'POST /resources/C HTTP/1.1\r\nContent-Length: 0\r\n\r\n')
+        self.assertResponse(self.responses(sock)[0], b'HTTP/1.1 200', b'POST C []')
+        self.assertFalse(sock.closed)
+
+    def testContentDiscard(self):
+        handler, sock = self.connect()
+        self.send(handler, b'PUT /other HTTP/1.1\r\nContent-Length: 10\r\n\r\n01234')
+        self.assertResponse(self.responses(sock)[0], b'HTTP/1.1 404', b'', b'Content-Length: 0')
+        self.assertEqual(handler._contentDiscard, 5)
+
+        self.send(handler, b'56789GET /resources/A HTTP/1.1\r\n\r\n')
+        self.assertEqual(handler._contentDiscard, 0)
+        self.assertResponse(self.responses(sock)[1], b'HTTP/1.1 200', b'GET A []')
+
+        # The content of a request that has no content reader is also discarded.
+        del sock.data[:]
+        self.send(handler, b'GET /resources/B HTTP/1.1\r\nContent-Length: 3\r\n\r\nxyzGET /resources/C HTTP/1.1\r\n\r\n')
+        self.assertEqual([content for _head, content in self.responses(sock)], [b'GET B []', b'GET C []'])
+        self.assertFalse(sock.closed)
+
+    def testChunked(self):
+        handler, sock = self.connect()
+        self.send(handler, b'GET /resources/chunked HTTP/1.1\r\n\r\n')
+        head, content = self.responses(sock)[0]
+        self.assertIn(b'Transfer-Encoding: chunked', head.split(b'\r\n'))
+        self.assertTrue(content.startswith(b'1\r\nG\r\n1\r\nE\r\n'), content)
+        self.assertTrue(content.endswith(b'1\r\n]\r\n0\r\n\r\n'), content)
+        self.assertFalse(sock.closed)
+
+        del sock.data[:]
+        self.send(handler, b'GET /resources/chunked HTTP/1.0\r\n\r\n')
+        self.assertResponse(self.responses(sock)[0], b'HTTP/1.1 200', b'GET chunked []', b'Connection: close')
+        self.assertTrue(sock.closed)
+
+    def testChunkedGenerator(self):
+        self.assertEqual(b''.join(chunkedGenerator([b'abc', b'', b'0123456789abcdef'])),
+                         b'3\r\nabc\r\n10\r\n0123456789abcdef\r\n0\r\n\r\n')
+        self.assertEqual(b''.join(chunkedGenerator(())), b'0\r\n\r\n')
+
+@unittest.skipUnless(hasattr(os, 'fork'), 'Requires fork')
+class TestSupervisor(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = TemporaryDirectory()
+        addForkListener(self.forked)
+        server = createServer()
+        self.port = server.socket.getsockname()[1]
+
+        self.supervisor = Supervisor(1)
+        self.supervisor.timeout = self.supervisor.respawnDelay = 0.05
+        self.supervisor.start(server)
+
+    def tearDown(self):
+        removeForkListener(self.forked)
+        if self.supervisor._process is not None:
+            self.supervisor.stop()
+            self.supervisor.wait()
+        self.folder.cleanup()
+
+    def forked(self):
+        open(os.path.join(self.folder.name, str(os.getpid())), 'w').close()
+
+    def pid(self):
+        # The listening socket is kept by the supervisor so the connections wait for the respawned workers.
+        connection = HTTPConnection('127.0.0.1', self.port, timeout=10)
+        try:
+            connection.request('GET', '/resources/pid')
+            return int(connection.getresponse().read())
+        finally: connection.close()
+
+    def testSupervise(self):
+        worker = self.pid()
+        self.assertNotIn(worker, (os.getpid(), self.supervisor._process))
+        self.assertEqual(self.pid(), worker)
+        # The fork listeners are notified only in the supervisor process.
+        self.assertEqual(os.listdir(self.folder.name), [str(self.supervisor._process)])
+
+    def testRespawn(self):
+        worker = self.pid()
+        os.kill(worker, signal.SIGKILL)
+        respawned = self.pid()
+        self.assertNotEqual(respawned, worker)
+        self.assertEqual(self.pid(), respawned)
+
+    def testRestart(self):
+        worker = self.pid()
+        self.supervisor.restart()
+        for _k in range(100):
+            restarted = self.pid()
+            if restarted != worker: break
+            time.sleep(0.05)
+        self.assertNotEqual(restarted, worker)
+
+    def testStop(self):
+        process, worker = self.supervisor._process, self.pid()
+        self.supervisor.stop()
+        self.supervisor.wait()
+        self.assertIsNone(self.supervisor._process)
+        self.assertRaises(OSError, os.kill, process, 0)
+        for _k in range(100):
+            try: os.kill(worker, 0)
+            except OSError: break
+            time.sleep(0.05)
+        else: self.fail('The worker %s is still running' % worker)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -14,15 +14,24 @@ from ally.design.processor import Processing, Assembly, ONLY_AVAILABLE, \
     CREATE_REPORT, Chain
 from ally.http.spec.server import RequestHTTP, ResponseHTTP, RequestContentHTTP, \
     ResponseContentHTTP, METHOD_UNKNOWN, METHODS
-from ally.support.util_io import IInputStream, readGenerator
+from ally.support.util_io import IInputStream, FileBacked, readGenerator
+from ally.support.util_sys import notifyFork
 from asyncore import dispatcher, loop
-from collections import Callable, deque
+from collections import Callable, Iterable, deque
 from http.server import BaseHTTPRequestHandler
 from io import BytesIO
+from threading import active_count
 from urllib.parse import urlparse, parse_qsl
+import errno
 import logging
+import os
 import re
+import signal
 import socket
+import time
+
+try: from os import sendfile
+except ImportError: sendfile = None  # The platform does not support sending files directly from the kernel.
 
 # --------------------------------------------------------------------
 
@@ -32,6 +41,8 @@ log = logging.getLogger(__name__)
 WRITE_BYTES = 1
 WRITE_ITER = 2
 WRITE_CLOSE = 3
+WRITE_RESET = 4
+WRITE_FILE = 5
 
 # --------------------------------------------------------------------
 
@@ -46,19 +57,37 @@ class RequestContentHTTPAsyncore(RequestContentHTTP):
     return a chain that is used for further request processing.
     ''')
 
+class ResponseContentHTTPAsyncore(ResponseContentHTTP):
+    '''
+    The response content context.
+    '''
+    # ---------------------------------------------------------------- Optional
+    length = optional(int, doc='''
+    @rtype: integer
+    The response content length in bytes, if not known the content will be delivered using the chunked transfer
+    encoding.
+    ''')
+
 # --------------------------------------------------------------------
 
 class RequestHandler(dispatcher, BaseHTTPRequestHandler):
     '''
     Request handler implementation based on @see: async_chat and @see: BaseHTTPRequestHandler.
     The async chat request handler. It relays for the HTTP processing on the @see: BaseHTTPRequestHandler,
-    and uses the async_chat to asynchronous communication.
+    and uses the async_chat to asynchronous communication. The connections are kept alive if the client allows it,
+    and the responses that have an unknown length are delivered using the chunked transfer encoding.
     '''
     
+    protocol_version = 'HTTP/1.1'
+    # The protocol version used for the responses, also allows the persistent connections.
     bufferSize = 10 * 1024
     # The buffer size used for reading and writing.
+    sendfileSize = 1024 * 1024
+    # The maximum size sent at once for the file backed content delivered using sendfile.
     maximumRequestSize = 100 * 1024
     # The maximum request size, 100 kilobytes
+    keepAliveTimeout = 15
+    # The timeout in seconds after which an idle persistent connection is closed.
     requestTerminator = b'\r\n\r\n'
     # Terminator that signals the http request is complete 
 
@@ -81,18 +110,8 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         self.client_address = address
         self.connection = request
         
-        self.request_version = 'HTTP/1.1'
-        self.requestline = 0
-        
-        self._stage = 1
-        self.rfile = BytesIO()
-        self._readCarry = None
-        self._reader = None
-
-        self.wfile = BytesIO()
         self._writeq = deque()
-        
-        self._next(1)
+        self._reset()
         
     def handle_read(self):
         '''
@@ -103,10 +122,20 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
             log.exception('Exception occurred while reading the content from \'%s\'' % self.connection)
             self.close()
             return
+        self.lastActivity = time.time()
         self.handle_data(data)
     
     def handle_error(self):
         log.exception('A problem occurred in the server')
+        
+    def close(self):
+        '''
+        @see: dispatcher.close
+        '''
+        while self._writeq:
+            what, content = self._writeq.popleft()
+            if what == WRITE_FILE: content[0].close()
+        dispatcher.close(self)
     
     def end_headers(self):
         '''
@@ -114,7 +143,7 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         '''
         super().end_headers()
         self._writeq.append((WRITE_BYTES, memoryview(self.wfile.getvalue())))
-        self.wfile = None
+        self.wfile = BytesIO()
 
     def log_message(self, format, *args):
         '''
@@ -125,6 +154,17 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         # creates a big delay whenever the request is made from a non localhost client.
         assert log.debug(format, *args) or True
         
+    def isIdle(self, now):
+        '''
+        Checks if the connection is idle waiting for a request for more then the keep alive timeout.
+        
+        @param now: float
+            The current time.
+        @return: boolean
+            True if the connection is idle, False otherwise.
+        '''
+        return self.stage == 1 and now - self.lastActivity > self.keepAliveTimeout
+
     # ----------------------------------------------------------------
     
     def _next(self, stage):
@@ -132,10 +172,43 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         Proceed to next stage.
         '''
         assert isinstance(stage, int), 'Invalid stage %s' % stage
+        self.stage = stage
         self.readable = getattr(self, '_%s_readable' % stage, None)
         self.handle_data = getattr(self, '_%s_handle_data' % stage, None)
         self.writable = getattr(self, '_%s_writable' % stage, None)
         self.handle_write = getattr(self, '_%s_handle_write' % stage, None)
+        
+    def _reset(self):
+        '''
+        Resets the handler in order to receive a new request on the same connection.
+        '''
+        self.request_version = 'HTTP/1.1'
+        self.requestline = 0
+        self.close_connection = True
+        
+        self.rfile = BytesIO()
+        self._readCarry = None
+        self._reader = None
+        self._contentRemaining = None
+        self._contentDiscard = 0
+        self._pending = None
+
+        self.wfile = BytesIO()
+        self.lastActivity = time.time()
+        
+        self._next(1)
+        
+    def _respondEnd(self):
+        '''
+        Queues the end of the response, either closing the connection or reseting the handler for a new request.
+        '''
+        if self.wfile.tell():
+            # Content written directly by the base request handler, as an example when sending errors.
+            self._writeq.append((WRITE_BYTES, memoryview(self.wfile.getvalue())))
+            self.wfile = BytesIO()
+        if self.close_connection: self._writeq.append((WRITE_CLOSE, None))
+        else: self._writeq.append((WRITE_RESET, None))
+        self._next(3)  # Now we proceed to write stage
           
     # ----------------------------------------------------------------
     
@@ -149,6 +222,14 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         '''
         Handle the data as being part of the request.
         '''
+        if self._contentDiscard:
+            # Skipping the content of the previous request that has not been used.
+            if len(data) <= self._contentDiscard:
+                self._contentDiscard -= len(data)
+                return
+            data = data[self._contentDiscard:]
+            self._contentDiscard = 0
+        
         if self._readCarry is not None: data = self._readCarry + data
         index = data.find(self.requestTerminator)
         requestTerminatorLen = len(self.requestTerminator)
@@ -158,8 +239,13 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
             self.rfile.write(data[:index])
             self.rfile.seek(0)
             self.raw_requestline = self.rfile.readline()
-            self.parse_request()
+            parsed = self.parse_request()
             self.rfile = None
+            if not parsed:
+                # The error response has been already provided by the parsing.
+                self.close_connection = True
+                self._respondEnd()
+                return
             
             method = self.command
             if method:
@@ -168,15 +254,20 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
             else: method = METHOD_UNKNOWN
             self._process(method)
             
-            if index < len(data) and self.handle_data: self.handle_data(data[index:])
+            if index < len(data):
+                if self.stage == 1: self.handle_data(data[index:])
+                elif self.stage == 2: self._2_handle_data(data[index:])
+                else: self._pending = data[index:]  # Pipelined data used after the response is delivered.
         else:
             self._readCarry = data[-requestTerminatorLen:]
             self.rfile.write(data[:-requestTerminatorLen])
             
             if self.rfile.tell() > self.maximumRequestSize:
+                self.close_connection = True
                 self.send_response(400, 'Request to long')
+                self.send_header('Content-Length', '0')
                 self.end_headers()
-                self.close()
+                self._respondEnd()
                 
     def _1_writable(self):
         '''
@@ -197,7 +288,13 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         Handle the data as being part of the request.
         '''
         assert self._reader is not None, 'No reader available'
-        chain = self._reader(data)
+        if len(data) > self._contentRemaining:
+            self._pending = data[self._contentRemaining:]
+            data = data[:self._contentRemaining]
+        self._contentRemaining -= len(data)
+        
+        chain = self._reader(data) if data else None
+        if chain is None and self._contentRemaining == 0: chain = self._reader(b'')
         if chain is not None:
             assert isinstance(chain, Chain), 'Invalid chain %s' % chain
             self._reader = None
@@ -231,8 +328,11 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         assert self._writeq, 'Nothing to write'
         
         what, content = self._writeq[0]
-        assert what in (WRITE_ITER, WRITE_BYTES, WRITE_CLOSE), 'Invalid what %s' % what
-        if what == WRITE_ITER:
+        assert what in (WRITE_ITER, WRITE_BYTES, WRITE_CLOSE, WRITE_RESET, WRITE_FILE), 'Invalid what %s' % what
+        if what == WRITE_FILE:
+            self._sendFile(content)
+            return
+        elif what == WRITE_ITER:
             try: data = memoryview(next(content))
             except StopIteration:
                 del self._writeq[0]
@@ -241,6 +341,13 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         elif what == WRITE_CLOSE:
             self.close()
             return
+        elif what == WRITE_RESET:
+            del self._writeq[0]
+            pending, discard = self._pending, self._contentDiscard
+            self._reset()
+            self._contentDiscard = discard
+            if pending: self.handle_data(pending)
+            return
         
         dataLen = len(data)
         try:
@@ -255,10 +362,42 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
             elif what == WRITE_BYTES: self._writeq[0] = (WRITE_BYTES, data[sent:])
         else:
             if what == WRITE_BYTES: del self._writeq[0]
+            
+    def _sendFile(self, content):
+        '''
+        Sends a chunk of the file backed content directly from the file descriptor.
+        
+        @param content: list[FileBacked, integer, integer]
+            The file backed source, the offset in the file and the remaining length to be sent.
+        '''
+        source, offset, remaining = content
+        try: sent = sendfile(self.socket.fileno(), source.fileno(), offset, min(remaining, self.sendfileSize))
+        except (OSError, socket.error) as e:
+            if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR): return
+            log.exception('Exception occurred while sending the file to the connection \'%s\'' % self.connection)
+            self.close()
+            return
+        if sent == 0:
+            log.error('The file for \'%s\' ended before the expected length, closing connection', self.connection)
+            self.close()
+            return
+        
+        content[1], content[2] = offset + sent, remaining - sent
+        if content[2] == 0:
+            del self._writeq[0]
+            source.close()
         
     # ----------------------------------------------------------------
     
     def _process(self, method):
+        length = self.headers.get('Content-Length')
+        if length is not None:
+            try: length = int(length)
+            except ValueError: length = None
+        if length is None and 'Transfer-Encoding' in self.headers:
+            # We cannot know where the request content ends so we cannot reuse the connection.
+            self.close_connection = True
+        
         url = urlparse(self.path)
         path = url.path.lstrip('/')
         for regex, processing in self.server.pathProcessing:
@@ -274,15 +413,17 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
                 assert isinstance(req, RequestHTTP), 'Invalid request %s' % req
                 assert isinstance(reqCnt, RequestContentHTTPAsyncore), 'Invalid request content %s' % reqCnt
                 assert isinstance(rsp, ResponseHTTP), 'Invalid response %s' % rsp
-                assert isinstance(rspCnt, ResponseContentHTTP), 'Invalid response content %s' % rspCnt
+                assert isinstance(rspCnt, ResponseContentHTTPAsyncore), 'Invalid response content %s' % rspCnt
 
                 req.scheme, req.uriRoot, req.uri = 'http', uriRoot, path[match.end():]
                 req.parameters = parse_qsl(url.query, True, False)
                 break
         else:
+            self._contentDiscard = length or 0
             self.send_response(404)
+            self.send_header('Content-Length', '0')
             self.end_headers()
-            self.close()
+            self._respondEnd()
             return
 
         req.methodName = method
@@ -291,33 +432,66 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         def respond():
             assert isinstance(rsp.code, int), 'Invalid response code %s' % rsp.code
     
-            if ResponseHTTP.headers in rsp:
-                for name, value in rsp.headers.items(): self.send_header(name, value)
-    
             if ResponseHTTP.text in rsp: self.send_response(rsp.code, rsp.text)
             else: self.send_response(rsp.code)
+            
+            hasLength = hasConnection = False
+            if ResponseHTTP.headers in rsp:
+                for name, value in rsp.headers.items():
+                    nameLower = name.lower()
+                    if nameLower == 'content-length': hasLength = True
+                    elif nameLower == 'connection':
+                        hasConnection = True
+                        # The processors can require the connection to be closed after the response.
+                        if 'close' in (token.strip().lower() for token in value.split(',')): self.close_connection = True
+                    self.send_header(name, value)
+            if not hasLength and rspCnt.length is not None:
+                self.send_header('Content-Length', str(rspCnt.length))
+                hasLength = True
     
-            self.end_headers()
-    
+            write = None
             if rspCnt.source is not None:
-                if isinstance(rspCnt.source, IInputStream): source = readGenerator(rspCnt.source, self.bufferSize)
-                else: source = rspCnt.source
+                source = rspCnt.source
+                if hasLength and sendfile is not None and isinstance(source, FileBacked):
+                    assert isinstance(source, FileBacked)
+                    fileLength = rspCnt.length if source.length is None else source.length
+                    if fileLength is not None: write = (WRITE_FILE, [source, source.offset, fileLength])
+                
+                if write is None and isinstance(source, IInputStream):
+                    source = readGenerator(source, self.bufferSize)
+                
+                if not hasLength:
+                    if self.request_version == 'HTTP/1.1':
+                        self.send_header('Transfer-Encoding', 'chunked')
+                        source = chunkedGenerator(source)
+                    else: self.close_connection = True  # The content end is provided by closing the connection.
+            elif not hasLength and rsp.code not in (204, 304): self.send_header('Content-Length', '0')
+                
+            if hasConnection: pass
+            elif self.close_connection: self.send_header('Connection', 'close')
+            elif self.request_version != 'HTTP/1.1': self.send_header('Connection', 'keep-alive')
+            self.end_headers()
     
-                self._writeq.append((WRITE_ITER, iter(source)))
-            self._writeq.append((WRITE_CLOSE, None))
+            if write: self._writeq.append(write)
+            elif rspCnt.source is not None: self._writeq.append((WRITE_ITER, iter(source)))
+            self._respondEnd()
             
         chain = Chain(processing)
         chain.process(request=req, requestCnt=reqCnt, response=rsp, responseCnt=rspCnt)
         chain.callBack(respond)
         
         while True:
-            if not chain.do():
-                self._next(3)  # Now we proceed to write stage
-                break
+            if not chain.do(): break
             if reqCnt.contentReader is not None:
                 self._next(2)  # Now we proceed to read stage
                 self._reader = reqCnt.contentReader
-                break
+                # A request without a content length and transfer encoding has no content.
+                self._contentRemaining = length or 0
+                if not self._contentRemaining: self._2_handle_data(b'')
+                return
+            
+        # There is no reader for the content so we need to skip it.
+        self._contentDiscard = length or 0
 
 # --------------------------------------------------------------------
 
@@ -327,6 +501,8 @@ class AsyncServer(dispatcher):
     '''
     timeout = 10.0
     # The timeout for select loop.
+    evictInterval = 1.0
+    # The minimum interval in seconds between checking for idle connections.
 
     def __init__(self, serverAddress, pathProcessing, requestHandlerFactory):
         '''
@@ -350,6 +526,7 @@ class AsyncServer(dispatcher):
         self.serverAddress = serverAddress
         self.pathProcessing = pathProcessing
         self.requestHandlerFactory = requestHandlerFactory
+        self._evictAt = 0
         
         self.create_socket(socket.AF_INET, socket.SOCK_STREAM)
         self.set_reuse_addr()
@@ -361,13 +538,14 @@ class AsyncServer(dispatcher):
         @see: dispatcher.handle_accept
         '''
         try:
-            request, address = self.accept()
+            pair = self.accept()
         except socket.error:
             log.exception('A problem occurred while waiting connections')
             return
-        except TypeError:
-            log.exception('A EWOULDBLOCK problem occurred while waiting connections')
-            return
+        # If there is no pair it means a EWOULDBLOCK problem occurred, this is normal when the connection has been
+        # accepted by another worker process that shares the listening socket.
+        if pair is None: return
+        request, address = pair
         # creates an instance of the handler class to handle the request/response
         # on the incoming connection
         self.requestHandlerFactory(self, request, address)
@@ -376,7 +554,20 @@ class AsyncServer(dispatcher):
         '''
         Loops and servers the connections.
         '''
-        loop(self.timeout, map=self.map)
+        while self.map:
+            loop(self.timeout, map=self.map, count=1)
+            self.evictIdle()
+
+    def evictIdle(self):
+        '''
+        Closes the persistent connections that have been idle for to long.
+        '''
+        now = time.time()
+        if now < self._evictAt: return
+        self._evictAt = now + self.evictInterval
+
+        for handler in list(self.map.values()):
+            if isinstance(handler, RequestHandler) and handler.isIdle(now): handler.close()
             
     def serve_limited(self, count):
         '''
@@ -387,14 +578,212 @@ class AsyncServer(dispatcher):
 
 # --------------------------------------------------------------------
 
-def run(pathAssemblies, server_version, host='', port=80):
+class Supervisor:
+    '''
+    Supervisor for the pre fork mode of the asyncore server. The supervisor runs in its own process, forked from the
+    application main thread, and forks the worker processes that share the listening socket of the server and each runs
+    its own asyncore loop, the workers that stop are respawned. The supervisor process runs only the thread that forked
+    it, so all the workers are forked from a single threaded process and no lock held by other application threads is
+    inherited by the workers.
+    !!! Attention the workers are forked from the process that has already deployed the application so any resource
+    (like database connections) opened before the fork is shared by all the workers, the fork listeners are notified in
+    the supervisor process in order to release such resources, @see: ally.support.util_sys.addForkListener.
+    '''
+    timeout = 1.0
+    # The timeout for the worker select loop, also the interval at which the workers and supervisor check if they should
+    # stop.
+    respawnDelay = 1.0
+    # The delay in seconds before respawning a worker that has crashed, this is to avoid continuous forking.
+    stopTimeout = 30.0
+    # The maximum time in seconds allowed for a worker that is stopping to finalize the ongoing connections.
+
+    def __init__(self, workers):
+        '''
+        Construct the supervisor.
+        
+        @param workers: integer
+            The number of worker processes to be forked.
+        '''
+        assert isinstance(workers, int) and workers > 0, 'Invalid workers count %s' % workers
+        self.workers = workers
+
+        self._process = None
+        self._pids = set()
+        self._stopped = False
+        self._serving = False
+
+    def start(self, server):
+        '''
+        Forks the supervisor process for the provided server, this method needs to be called from the application main
+        thread before the other threads are started. The server is closed in the application process, only the workers
+        accept connections on the shared listening socket.
+        
+        @param server: AsyncServer
+            The server that has the listening socket shared by the workers.
+        '''
+        assert isinstance(server, AsyncServer), 'Invalid server %s' % server
+        assert self._process is None, 'The supervisor is already started'
+        if active_count() > 1:
+            log.warning('Forking the asyncore server supervisor while other %s threads are running',
+                        active_count() - 1)
+
+        pid = os.fork()
+        if pid == 0: self._supervise(server)
+        self._process = pid
+        log.info('Started asyncore server supervisor with pid %s', pid)
+        dispatcher.close(server)
+
+    def wait(self):
+        '''
+        Waits in the application process for the supervisor process to stop.
+        '''
+        while self._process is not None:
+            try: os.waitpid(self._process, 0)
+            except OSError as e:
+                if e.errno == errno.EINTR: continue
+                if e.errno != errno.ECHILD: raise
+            self._process = None
+
+    def supervise(self, server):
+        '''
+        Forks the workers for the provided server and supervises them until the supervisor is stopped, this method
+        blocks until all the workers are stopped. The workers are also stopped if the process that started the
+        supervisor stops.
+        
+        @param server: AsyncServer
+            The server that has the listening socket shared by the workers.
+        '''
+        assert isinstance(server, AsyncServer), 'Invalid server %s' % server
+
+        parent = os.getppid()
+        while True:
+            while not self._stopped and len(self._pids) < self.workers:
+                pid = os.fork()
+                if pid == 0: self._work(server)
+                self._pids.add(pid)
+                log.info('Started asyncore server worker with pid %s', pid)
+
+            if not self._pids: break
+            try: pid, status = os.waitpid(-1, os.WNOHANG)
+            except OSError as e:
+                if e.errno == errno.EINTR: continue
+                if e.errno == errno.ECHILD: break
+                raise
+            if pid == 0:
+                if not self._stopped and os.getppid() != parent:
+                    log.error('The application process has stopped, stopping the asyncore server workers')
+                    self.stop()
+                time.sleep(self.timeout)
+                continue
+            self._pids.discard(pid)
+
+            if self._stopped: log.info('Stopped asyncore server worker with pid %s', pid)
+            elif os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0:
+                log.info('Restarting asyncore server worker with pid %s', pid)
+            else:
+                log.error('The asyncore server worker with pid %s has crashed with status %s, respawning', pid, status)
+                time.sleep(self.respawnDelay)
+
+        server.close()
+
+    def restart(self):
+        '''
+        Gracefully restarts the workers, the workers will stop accepting connections and finalize the ongoing ones,
+        after a worker stopped a new one is forked in its place.
+        '''
+        if self._process is not None: self._kill(signal.SIGHUP)
+        else: self._signal(signal.SIGTERM)
+
+    def stop(self):
+        '''
+        Gracefully stops the workers, no new workers are forked after the current workers stopped.
+        '''
+        if self._process is not None: self._kill(signal.SIGTERM)
+        else:
+            self._stopped = True
+            self._signal(signal.SIGTERM)
+
+    # ----------------------------------------------------------------
+
+    def _kill(self, signum):
+        '''
+        Sends the signal to the supervisor process.
+        '''
+        try: os.kill(self._process, signum)
+        except OSError: log.warning('Cannot signal the asyncore server supervisor with pid %s', self._process)
+
+    def _signal(self, signum):
+        '''
+        Sends the signal to all the workers.
+        '''
+        for pid in list(self._pids):
+            try: os.kill(pid, signum)
+            except OSError: self._pids.discard(pid)
+
+    def _supervise(self, server):
+        '''
+        Runs the supervisor for the provided server, this method is executed only in the supervisor process and it will
+        never return, the supervisor process is exited at the end.
+        '''
+        assert isinstance(server, AsyncServer), 'Invalid server %s' % server
+        status = 1
+        try:
+            signal.signal(signal.SIGHUP, lambda signum, frame: self.restart())
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+            signal.signal(signal.SIGINT, lambda signum, frame: self.stop())
+            notifyFork()
+
+            self.supervise(server)
+            status = 0
+        except:
+            log.exception('The asyncore server supervisor %s has stopped', os.getpid())
+        finally: os._exit(status)
+
+    def _work(self, server):
+        '''
+        Runs the worker loop for the provided server, this method is executed only in the worker process and it will
+        never return, the worker process is exited at the end.
+        '''
+        assert isinstance(server, AsyncServer), 'Invalid server %s' % server
+        status = 1
+        try:
+            self._pids.clear()
+            self._serving = True
+            signal.signal(signal.SIGTERM, lambda signum, frame: setattr(self, '_serving', False))
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+            parent = os.getppid()
+            while self._serving and os.getppid() == parent:
+                loop(self.timeout, True, server.map, 1)
+                server.evictIdle()
+
+            # We stop accepting connections and finalize the ongoing ones.
+            server.close()
+            stopAt = time.time() + self.stopTimeout
+            while server.map and time.time() < stopAt:
+                loop(self.timeout, True, server.map, 1)
+                server.evictIdle()
+            status = 0
+        except:
+            log.exception('The asyncore server worker %s has stopped', os.getpid())
+        finally: os._exit(status)
+
+# --------------------------------------------------------------------
+
+def run(pathAssemblies, server_version, host='', port=80, supervisor=None):
     '''
     Run the basic server.
     
     @param pathAssemblies: list[(regex, Assembly)]
         A list that contains tuples having on the first position a string pattern for matching a path, and as a value 
         the assembly to be used for creating the context for handling the request for the path.
+    @param supervisor: Supervisor|None
+        The supervisor to run the server in pre fork mode, if None the server runs in the current process. The supervisor
+        process is forked from the calling thread, so in pre fork mode this function needs to be called from the main
+        thread and it returns once the supervisor is started, @see: Supervisor.start.
     '''
+    assert supervisor is None or isinstance(supervisor, Supervisor), 'Invalid supervisor %s' % supervisor
     assert isinstance(pathAssemblies, list), 'Invalid path assemblies %s' % pathAssemblies
     RequestHandler.server_version = server_version
     pathProcessing = []
@@ -404,13 +793,17 @@ def run(pathAssemblies, server_version, host='', port=80):
 
         processing, report = assembly.create(ONLY_AVAILABLE, CREATE_REPORT,
                                              request=RequestHTTP, requestCnt=RequestContentHTTPAsyncore,
-                                             response=ResponseHTTP, responseCnt=ResponseContentHTTP)
+                                             response=ResponseHTTP, responseCnt=ResponseContentHTTPAsyncore)
 
         log.info('Assembly report for pattern \'%s\':\n%s', pattern, report)
         pathProcessing.append((re.compile(pattern), processing))
         
     try:
         server = AsyncServer((host, port), pathProcessing, RequestHandler)
+        if supervisor is not None:
+            supervisor.start(server)
+            print('=' * 50, 'Started Async REST API server with %s workers...' % supervisor.workers)
+            return
         print('=' * 50, 'Started Async REST API server...')
 #        import profile
 #        profile.runctx('server.serve_limited(1000)', globals(), locals(), 'profiler.data')
@@ -422,4 +815,19 @@ def run(pathAssemblies, server_version, host='', port=80):
         log.exception('=' * 50 + ' The server has stooped')
         try: server.close()
         except: pass
-        
+
+# --------------------------------------------------------------------
+
+def chunkedGenerator(source):
+    '''
+    Provides the chunked transfer encoding for the provided source.
+    
+    @param source: Iterable(bytes)
+        The source to provide the chunks for.
+    @return: Iterator(bytes)
+        The chunks encoded data.
+    '''
+    assert isinstance(source, Iterable), 'Invalid source %s' % source
+    for data in source:
+        if data: yield b''.join((('%x\r\n' % len(data)).encode(), data, b'\r\n'))
+    yield b'0\r\n\r\n'
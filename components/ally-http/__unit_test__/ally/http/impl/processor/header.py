@@ -0,0 +1,87 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides testing for the headers handling.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.container import ioc
+from ally.http.impl.processor.header import HeaderHandler, DecoderHeader
+from collections import deque
+import unittest
+
+# --------------------------------------------------------------------
+
+class TestHeader(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = HeaderHandler()
+        ioc.initialize(self.handler)
+
+    def testParse(self):
+        value = 'text/html;q=0.8, application/json;charset="utf-8";level'
+        parsed = self.handler.parse(value)
+        self.assertEqual(parsed, (('text/html', {'q': '0.8'}),
+                                  ('application/json', {'charset': 'utf-8', 'level': None})))
+        self.assertIs(self.handler.parse(value), parsed)
+
+        decoder = DecoderHeader(self.handler, {'Accept': value})
+        first, second = decoder.decode('Accept'), decoder.decode('accept')
+        self.assertEqual(first, second)
+        self.assertEqual(first, list(parsed))
+        for (_val, attributes), (_other, attributesOther) in zip(first, second):
+            self.assertIsNot(attributes, attributesOther)
+
+        # Altering the decoded attributes does not alter the cached values.
+        first[0][1]['q'] = '1'
+        self.assertEqual(decoder.decode('accept')[0], ('text/html', {'q': '0.8'}))
+        self.assertEqual(self.handler.parse(value)[0], ('text/html', {'q': '0.8'}))
+
+    def testParseCacheSize(self):
+        self.handler.cacheSize = 2
+        for value in ('a', 'b', 'c'): self.handler.parse(value)
+        self.assertEqual(list(self.handler._parsed), ['b', 'c'])
+
+        # The recently used values are kept.
+        parsed = self.handler.parse('b')
+        self.handler.parse('d')
+        self.assertEqual(list(self.handler._parsed), ['b', 'd'])
+        self.assertIs(self.handler.parse('b'), parsed)
+
+        self.handler.cacheSize = 0
+        self.handler._parsed.clear()
+        self.handler.parse('e')
+        self.assertEqual(len(self.handler._parsed), 0)
+
+    def testReadParameters(self):
+        parameters = [('Accept', 'text/html'), ('offset', '10'), ('accept', 'text/plain;q=0.5'), ('X-Other', 'x')]
+        decoder = DecoderHeader(self.handler, {'Accept': 'application/json'}, parameters)
+
+        values = decoder.readParameters('accept')
+        self.assertEqual(values, deque(['text/html', 'text/plain;q=0.5']))
+        self.assertEqual(parameters, [('offset', '10'), ('X-Other', 'x')])
+        self.assertIs(decoder.readParameters('accept'), values)
+
+        self.assertEqual(decoder.readParameters('missing'), deque())
+        self.assertEqual(parameters, [('offset', '10'), ('X-Other', 'x')])
+
+        self.assertEqual(decoder.retrieve('Accept'), 'text/html,text/plain;q=0.5')
+        self.assertEqual(decoder.decode('x-other'), [('x', {})])
+        self.assertEqual(parameters, [('offset', '10')])
+
+        self.assertIsNone(DecoderHeader(self.handler, {}).readParameters('accept'))
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -13,7 +13,8 @@ from ally.container.ioc import injected
 from ally.design.context import Context, defines, requires, optional
 from ally.design.processor import HandlerProcessorProceed
 from ally.http.spec.server import IDecoderHeader, IEncoderHeader
-from collections import deque, Iterable
+from collections import deque, Iterable, OrderedDict
+from threading import Lock
 import re
 
 # --------------------------------------------------------------------
@@ -63,18 +64,24 @@ class HeaderHandler(HandlerProcessorProceed):
     # The separator used between the attributes and value.
     separatorValue = '='
     # The separator used between attribute name and attribute value.
+    cacheSize = 500
+    # The maximum number of parsed header values kept in the cache.
 
     def __init__(self):
         assert isinstance(self.useParameters, bool), 'Invalid use parameters flag %s' % self.useParameters
         assert isinstance(self.separatorMain, str), 'Invalid main separator %s' % self.separatorMain
         assert isinstance(self.separatorAttr, str), 'Invalid attribute separator %s' % self.separatorAttr
         assert isinstance(self.separatorValue, str), 'Invalid value separator %s' % self.separatorValue
+        assert isinstance(self.cacheSize, int), 'Invalid cache size %s' % self.cacheSize
         super().__init__()
 
         self.reSeparatorMain = re.compile(self.separatorMain)
         self.reSeparatorAttr = re.compile(self.separatorAttr)
         self.reSeparatorValue = re.compile(self.separatorValue)
 
+        self._parsed = OrderedDict()
+        self._lock = Lock()
+
     def process(self, request:Request, response:Response, **keyargs):
         '''
         @see: HandlerProcessorProceed.process
@@ -93,13 +100,48 @@ class HeaderHandler(HandlerProcessorProceed):
             if response.headers: response.encoderHeader.headers.update(response.headers)
             response.headers = response.encoderHeader.headers
 
+    # ----------------------------------------------------------------
+
+    def parse(self, value):
+        '''
+        Parses the provided header value, the parsed values are cached by the raw value since the same header values
+        are repeated across requests.
+        
+        @param value: string
+            The value to parse.
+        @return: tuple(tuple(string, dictionary{string, string}))
+            The parsed values, the attributes dictionaries are shared so they should not be altered.
+        '''
+        assert isinstance(value, str), 'Invalid value %s' % value
+        with self._lock:
+            parsed = self._parsed.get(value)
+            if parsed is not None:
+                self._parsed.move_to_end(value)
+                return parsed
+
+        parsed = []
+        for values in self.reSeparatorMain.split(value):
+            valAttr = self.reSeparatorAttr.split(values)
+            attributes = {}
+            for k in range(1, len(valAttr)):
+                val = self.reSeparatorValue.split(valAttr[k])
+                attributes[val[0].strip()] = val[1].strip().strip('"') if len(val) > 1 else None
+            parsed.append((valAttr[0].strip(), attributes))
+        parsed = tuple(parsed)
+
+        if self.cacheSize:
+            with self._lock:
+                self._parsed[value] = parsed
+                while len(self._parsed) > self.cacheSize: self._parsed.popitem(last=False)
+        return parsed
+
 # --------------------------------------------------------------------
 
 class DecoderHeader(IDecoderHeader):
     '''
     Implementation for @see: IDecoderHeader.
     '''
-    __slots__ = ('handler', 'headers', 'parameters', 'parametersUsed')
+    __slots__ = ('handler', 'headers', 'parameters', 'parametersUsed', 'parametersIndex')
 
     def __init__(self, handler, headers, parameters=None):
         '''
@@ -119,7 +161,7 @@ class DecoderHeader(IDecoderHeader):
         self.handler = handler
         self.headers = {hname.lower():hvalue for hname, hvalue in headers.items()}
         self.parameters = parameters
-        if parameters: self.parametersUsed = {}
+        if parameters: self.parametersUsed, self.parametersIndex = {}, None
 
     def retrieve(self, name):
         '''
@@ -163,17 +205,11 @@ class DecoderHeader(IDecoderHeader):
             The parsed values, if parsed is provided then it will be the same list.
         '''
         assert isinstance(value, str), 'Invalid value %s' % value
-        handler = self.handler
-        assert isinstance(handler, HeaderHandler)
+        assert isinstance(self.handler, HeaderHandler)
 
         parsed = [] if parsed is None else parsed
-        for values in handler.reSeparatorMain.split(value):
-            valAttr = handler.reSeparatorAttr.split(values)
-            attributes = {}
-            for k in range(1, len(valAttr)):
-                val = handler.reSeparatorValue.split(valAttr[k])
-                attributes[val[0].strip()] = val[1].strip().strip('"') if len(val) > 1 else None
-            parsed.append((valAttr[0].strip(), attributes))
+        # The attributes are copied since the cached parsed values are shared.
+        parsed.extend((val, dict(attributes)) for val, attributes in self.handler.parse(value))
         return parsed
 
     def readParameters(self, name):
@@ -192,13 +228,18 @@ class DecoderHeader(IDecoderHeader):
 
         value = self.parametersUsed.get(name)
         if value is None:
-            value, k = deque(), 0
-            while k < len(self.parameters):
-                if self.parameters[k][0].lower() == name:
-                    value.append(self.parameters[k][1])
-                    del self.parameters[k]
-                    k -= 1
-                k += 1
+            if self.parametersIndex is None:
+                # The parameters are indexed in a single pass by the lower case name.
+                self.parametersIndex = {}
+                for pname, pvalue in self.parameters:
+                    pname = pname.lower()
+                    values = self.parametersIndex.get(pname)
+                    if values is None: values = self.parametersIndex[pname] = deque()
+                    values.append(pvalue)
+
+            value = self.parametersIndex.pop(name, None)
+            if value is None: value = deque()
+            else: self.parameters[:] = [param for param in self.parameters if param[0].lower() != name]
             self.parametersUsed[name] = value
 
         return value
@@ -15,4 +15,7 @@ INTERNAL_ERROR = (500, False) # HTTP code 500 Internal Server Error
 INVALID_REQUEST = (400, False)  # HTTP code 400 Bad Request
 INVALID_HEADER_VALUE = (400, False) # HTTP code 400 Bad Request
 PATH_NOT_FOUND = (404, False)  # HTTP code 404 Not Found
+RANGE_NOT_SATISFIABLE = (416, False)  # HTTP code 416 Requested Range Not Satisfiable
 
+PARTIAL_CONTENT = (206, True)  # HTTP code 206 Partial Content
+NOT_MODIFIED = (304, True)  # HTTP code 304 Not Modified
@@ -16,7 +16,8 @@ if True:
 
 # --------------------------------------------------------------------
 
-from ally.container.binder import bindLock, clearBindings
+from ally.container.binder import bindLock, clearBindings, \
+    bindBeforeListener, bindAfterListener, registerProxyBinder
 from ally.container.proxy import createProxy, ProxyWrapper
 import unittest
 
@@ -71,6 +72,37 @@ class TestBinder(unittest.TestCase):
         proxy.methodLocked(self, lock, count=0)
         self.assertTrue(lock.count == 0)
 
+    def testBindCompiled(self):
+        AProxy = createProxy(A)
+
+        proxy = AProxy(ProxyWrapper(A()))
+
+        assert isinstance(proxy, A)
+
+        registerProxyBinder(proxy)
+        lock, calls = Lock(), []
+        proxy.methodNotLocked(self, lock)
+
+        bindBeforeListener(proxy, lambda args, keyargs: calls.append('proxy before'))
+        bindAfterListener(proxy.methodNotLocked, lambda value: calls.append('call after'))
+        proxy.methodNotLocked(self, lock)
+        self.assertEqual(calls, ['proxy before', 'call after'])
+
+        del calls[:]
+        bindBeforeListener(proxy.methodNotLocked, lambda args, keyargs: args.append(lock) and False)
+        proxy.methodNotLocked(self)
+        self.assertEqual(calls, ['proxy before', 'call after'])
+
+        del calls[:]
+        bindBeforeListener(proxy, lambda args, keyargs: False)
+        self.assertIsNone(proxy.methodNotLocked(self))
+        self.assertEqual(calls, ['proxy before'])
+
+        del calls[:]
+        clearBindings(proxy)
+        proxy.methodNotLocked(self)
+        self.assertEqual(calls, ['call after'])
+
 # --------------------------------------------------------------------
 
 if __name__ == '__main__':
@@ -17,7 +17,7 @@ if True:
 # --------------------------------------------------------------------
 
 from ally.container.proxy import ProxyFilter, createProxy, ProxyWrapper, \
-    registerProxyHandler
+    registerProxyHandler, IProxyHandler
 import unittest
 
 # --------------------------------------------------------------------
@@ -35,6 +35,15 @@ class B(A):
     def methodB(self):
         return 'B.methodB'
 
+class HandlerCount(IProxyHandler):
+
+    def __init__(self):
+        self.count = 0
+
+    def handle(self, execution):
+        self.count += 1
+        return execution.invoke()
+
 # --------------------------------------------------------------------
 
 class TestProxy(unittest.TestCase):
@@ -84,6 +93,27 @@ class TestProxy(unittest.TestCase):
         self.assertTrue(proxy.methodA() == 'A.methodA')
         self.assertTrue(proxy.methodB() == 'B.methodB')
 
+    def testCompiledProxy(self):
+        BProxy = createProxy(B)
+
+        handler = HandlerCount()
+        proxy = BProxy(ProxyWrapper(B()))
+        assert isinstance(proxy, B)
+        self.assertTrue(proxy.methodA() == 'B.methodA')
+
+        registerProxyHandler(ProxyFilter(handler, 'methodB'), proxy)
+        self.assertTrue(proxy.methodA() == 'B.methodA')
+        self.assertTrue(proxy.methodB() == 'B.methodB')
+        self.assertTrue(handler.count == 1)
+
+        registerProxyHandler(handler, proxy)
+        self.assertTrue(proxy.methodB() == 'B.methodB')
+        self.assertTrue(handler.count == 3)
+
+        proxy = BProxy(ProxyFilter(ProxyWrapper(B()), 'methodA'))
+        assert isinstance(proxy, B)
+        self.assertRaises(AttributeError, proxy.methodB)
+
 # --------------------------------------------------------------------
 
 if __name__ == '__main__': unittest.main()
@@ -0,0 +1,122 @@
+'''
+Created on Oct 18, 2026
+
+@package: ally utilities
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides testing for the compiled processing chains.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.design.context import Context, requires, defines
+from ally.design.processor import HandlerProcessorProceed, HandlerProcessor, \
+    Assembly, Chain, ChainCompiled, ProcessingCompiled, COMPILED
+import unittest
+
+# --------------------------------------------------------------------
+
+class Data(Context):
+    value = defines(int)
+    trace = defines(list)
+
+class DataRequired(Context):
+    value = requires(int)
+    trace = requires(list)
+
+class HandlerStart(HandlerProcessorProceed):
+
+    def process(self, data:Data, **keyargs):
+        data.value = 0
+        data.trace = []
+
+class HandlerIncrement(HandlerProcessorProceed):
+
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+
+    def process(self, data:DataRequired, **keyargs):
+        data.value += 1
+        data.trace.append(self.name)
+
+class HandlerStop(HandlerProcessor):
+
+    def process(self, chain, data:DataRequired, **keyargs):
+        data.trace.append('stop')
+
+class HandlerCallBack(HandlerProcessor):
+
+    def process(self, chain, data:DataRequired, **keyargs):
+        chain.callBack(lambda: data.trace.append('callBack'))
+
+class HandlerBranch(HandlerProcessor):
+
+    def __init__(self, processing):
+        super().__init__()
+        self.processing = processing
+
+    def process(self, chain, data:DataRequired, **keyargs):
+        data.trace.append('branch')
+        chain.branch(self.processing)
+
+class HandlerError(HandlerProcessor):
+
+    def process(self, chain, data:DataRequired, **keyargs):
+        chain.callBackError(lambda: data.trace.append('error'))
+        raise ValueError()
+
+# --------------------------------------------------------------------
+
+def execute(chainClass, processing):
+    data = processing.contexts['data']()
+    chain = chainClass(processing).process(data=data).doAll()
+    return data.trace, chain.isConsumed()
+
+# --------------------------------------------------------------------
+
+class TestProcessor(unittest.TestCase):
+
+    def testCompiled(self):
+        assembly = Assembly()
+        assembly.add(HandlerStart(), HandlerCallBack(), HandlerIncrement('a'), HandlerIncrement('b'))
+        processing = assembly.create(COMPILED, data=Data)
+        self.assertIsInstance(processing, ProcessingCompiled)
+        self.assertEqual(execute(Chain, processing), (['a', 'b', 'callBack'], True))
+        self.assertEqual(execute(ChainCompiled, processing), (['a', 'b', 'callBack'], True))
+
+    def testCompiledStop(self):
+        assembly = Assembly()
+        assembly.add(HandlerStart(), HandlerIncrement('a'), HandlerStop(), HandlerIncrement('b'))
+        processing = assembly.create(COMPILED, data=Data)
+        self.assertEqual(execute(Chain, processing), (['a', 'stop'], False))
+        self.assertEqual(execute(ChainCompiled, processing), (['a', 'stop'], False))
+
+    def testCompiledBranch(self):
+        assemblyBranch = Assembly()
+        assemblyBranch.add(HandlerIncrement('c'))
+        processingBranch = assemblyBranch.create(COMPILED, data=Data)
+
+        assembly = Assembly()
+        assembly.add(HandlerStart(), HandlerIncrement('a'), HandlerBranch(processingBranch), HandlerIncrement('b'))
+        processing = assembly.create(COMPILED, data=Data)
+        self.assertEqual(execute(Chain, processing), (['a', 'branch', 'c'], True))
+        self.assertEqual(execute(ChainCompiled, processing), (['a', 'branch', 'c'], True))
+
+    def testCompiledError(self):
+        assembly = Assembly()
+        assembly.add(HandlerStart(), HandlerCallBack(), HandlerError(), HandlerIncrement('a'))
+        processing = assembly.create(COMPILED, data=Data)
+        self.assertEqual(execute(Chain, processing), (['error', 'callBack'], False))
+        self.assertEqual(execute(ChainCompiled, processing), (['error', 'callBack'], False))
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
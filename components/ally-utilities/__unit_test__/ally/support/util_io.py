@@ -0,0 +1,76 @@
+'''
+Created on Oct 18, 2026
+
+@package: utilities
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Testing for the I/O utilities.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.support.util_io import FileBacked, StreamRange, IInputStream, IClosable, \
+    IOutputStream, OutputChunks, readGenerator
+from codecs import getwriter
+from io import BytesIO
+from tempfile import TemporaryFile
+import unittest
+
+# --------------------------------------------------------------------
+
+class TestUtilIO(unittest.TestCase):
+
+    def testFileBacked(self):
+        with TemporaryFile() as f:
+            f.write(b'0123456789')
+            f.seek(0)
+
+            source = FileBacked(f)
+            self.assertTrue(isinstance(source, IInputStream))
+            self.assertTrue(isinstance(source, IClosable))
+            self.assertEqual(source.fileno(), f.fileno())
+            self.assertEqual(source.read(), b'0123456789')
+
+    def testFileBackedRange(self):
+        with TemporaryFile() as f:
+            f.write(b'0123456789')
+
+            source = FileBacked(f, 2, 5)
+            self.assertEqual((source.offset, source.length), (2, 5))
+            self.assertEqual(b''.join(readGenerator(source, 2)), b'23456')
+            self.assertTrue(f.closed)
+
+    def testStreamRange(self):
+        class NotSeekable(BytesIO):
+            def seekable(self): return False
+
+        for stream in (BytesIO(b'0123456789'), NotSeekable(b'0123456789')):
+            source = StreamRange(stream, 3, 4)
+            self.assertEqual(source.read(1), b'3')
+            self.assertEqual(source.read(), b'456')
+            self.assertEqual(source.read(), b'')
+
+    def testOutputChunks(self):
+        output = OutputChunks(4)
+        self.assertTrue(isinstance(output, IOutputStream))
+        for data in (b'01', b'234', b'5', b'6789', b'a'): output.write(data)
+        self.assertEqual(list(output.chunks), [b'01234', b'56789'])
+        output.close()
+        self.assertEqual((list(output.chunks), output.length), ([b'01234', b'56789', b'a'], 11))
+
+        output = OutputChunks()
+        writer = getwriter('utf-8')(output)
+        writer.write('\u0103la')
+        output.close()
+        self.assertEqual((b''.join(output.chunks), output.length), ('\u0103la'.encode('utf-8'), 4))
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
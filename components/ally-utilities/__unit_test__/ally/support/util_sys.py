@@ -16,7 +16,12 @@ if True:
 
 # --------------------------------------------------------------------
 
-from ally.support.util_sys import validateTypeFor
+from ally.support.util_sys import validateTypeFor, searchPaths, \
+    useModulesIndex, ModulesIndex
+from os.path import join, isfile
+from tempfile import TemporaryDirectory
+import os
+import sys
 import unittest
 
 # --------------------------------------------------------------------
@@ -38,6 +43,33 @@ class TestSys(unittest.TestCase):
         self.assertRaises(ValueError, setattr, a, 'a', 'ola')
         a.a = 12
 
+    def testModulesIndex(self):
+        with TemporaryDirectory() as folder:
+            os.makedirs(join(folder, 'indexed_test', 'sub'))
+            for path in (('__init__.py',), ('module.py',), ('sub', '__init__.py'), ('sub', 'other.py')):
+                with open(join(folder, 'indexed_test', *path), 'w'): pass
+            pathIndex = join(folder, 'modules.index')
+            sys.path.append(folder)
+            try:
+                useModulesIndex(pathIndex)
+                found = searchPaths('indexed_test.**')
+                self.assertEqual(sorted(found), [(False, 'indexed_test.module'), (False, 'indexed_test.sub.other'),
+                                                 (True, 'indexed_test.sub')])
+                self.assertTrue(isfile(pathIndex))
+                self.assertEqual(ModulesIndex(pathIndex).modulesIn(join(folder, 'indexed_test', 'sub')),
+                                 [('other', False, join(folder, 'indexed_test', 'sub'))])
+
+                useModulesIndex(pathIndex)
+                self.assertEqual(searchPaths('indexed_test.**'), found)
+
+                with open(join(folder, 'indexed_test', 'sub', 'added.py'), 'w'): pass
+                stat = os.stat(join(folder, 'indexed_test', 'sub'))
+                os.utime(join(folder, 'indexed_test', 'sub'), (stat.st_atime, stat.st_mtime + 10))
+                self.assertIn((False, 'indexed_test.sub.added'), searchPaths('indexed_test.sub.*'))
+            finally:
+                sys.path.remove(folder)
+                useModulesIndex(None)
+
 # --------------------------------------------------------------------
 
 if __name__ == '__main__': unittest.main()
@@ -9,8 +9,8 @@ Created on Aug 24, 2011
 Provides implementations for easy binding of listeners to any objects also provides the means of integrating with proxies.
 '''
 
-from .proxy import IProxyHandler, Execution, ProxyCall, analyzeProxy, \
-    registerProxyHandler, hasProxyHandler
+from .proxy import IProxyHandlerCompilable, Execution, ProxyCall, Proxy, \
+    analyzeProxy, registerProxyHandler, hasProxyHandler, resetCompiled
 from abc import ABCMeta
 
 # --------------------------------------------------------------------
@@ -32,6 +32,9 @@ EVENT_EXCEPTION_CALL = 'exception'
 indexes = [INDEX_LOCK_BEGIN, INDEX_DEFAULT, INDEX_LOCK_END]
 # The list of known indexes in their priority order.
 
+KEY_COMPILED = object()
+# The key used in the listeners dictionary for keeping the compiled listeners, @see: compiledFor
+
 # --------------------------------------------------------------------
 
 class BindableSupportMeta(ABCMeta):
@@ -119,6 +122,8 @@ def bindListener(to, key, listener, index=INDEX_DEFAULT):
     assert addlist, 'At least one listener is required'
     assert isinstance(index, str), 'Invalid index %s' % index
     if index not in indexes: raise ValueError('Unknown index %s' % index)
+    to._ally_listeners.pop(KEY_COMPILED, None)
+    if isinstance(to, (Proxy, ProxyCall)): resetCompiled(to)
     for key in keys:
         listeners = to._ally_listeners.get(key)
         if listeners:
@@ -148,8 +153,52 @@ def clearBindings(to, *keys):
         except AttributeError: pass
     else:
         try:
+            to._ally_listeners.pop(KEY_COMPILED, None)
             for key in keys: to._ally_listeners.pop(key, None)
         except AttributeError: pass
+    if isinstance(to, (Proxy, ProxyCall)): resetCompiled(to)
+
+def listenersFor(to, key):
+    '''
+    Provides the listeners having the specified key in the order in which they are called.
+    
+    @param to: object
+        The object to provide the listeners for.
+    @param key: object immutable
+        The key of the listeners.
+    @return: list[callable]
+        The listeners for the key, empty list if there are no listeners.
+    '''
+    assert isinstance(to, BindableSupport), 'The object %s is not bindeable' % to
+
+    try: listeners = to._ally_listeners.get(key)
+    except AttributeError: return []
+    if not listeners: return []
+    return [listener for index in indexes for listener in listeners.get(index, ())]
+
+def compiledFor(to, key, compiler):
+    '''
+    Provides the compiled listeners for the key. The compiled listeners are created only once by the compiler and then
+    kept on the bindable object until the bindings of the object are changed.
+    
+    @param to: object
+        The object to provide the compiled listeners for.
+    @param key: object immutable
+        The key of the compiled listeners.
+    @param compiler: callable(object) -> object
+        The compiler called with the bindable object in order to create the compiled listeners.
+    @return: object
+        The compiled listeners as returned by the compiler.
+    '''
+    assert isinstance(to, BindableSupport), 'The object %s is not bindeable' % to
+    assert callable(compiler), 'Invalid compiler %s' % compiler
+
+    compiled = to._ally_listeners.get(KEY_COMPILED)
+    if compiled is None: compiled = to._ally_listeners[KEY_COMPILED] = {}
+    try: return compiled[key]
+    except KeyError: pass
+    value = compiled[key] = compiler(to)
+    return value
 
 def callListeners(to, key, *args):
     '''
@@ -221,9 +270,9 @@ def registerProxyBinder(proxy):
     proxy, _method = analyzeProxy(proxy)
     if not hasProxyHandler(BINDING_HANDLER, proxy): registerProxyHandler(BINDING_HANDLER, proxy)
 
-class BindingHandler(IProxyHandler):
+class BindingHandler(IProxyHandlerCompilable):
     '''
-    Provides a @see: IProxyHandler implementation in order to execute binded listeners. 
+    Provides a @see: IProxyHandlerCompilable implementation in order to execute binded listeners. 
     '''
 
     def handle(self, execution):
@@ -247,6 +296,35 @@ class BindingHandler(IProxyHandler):
                 callListeners(proxyCall, EVENT_EXCEPTION_CALL, e)
             raise
 
+    def compile(self, proxyCall, follow):
+        '''
+        @see: IProxyHandlerCompilable.compile
+        
+        The listeners of the proxy and of the proxy call are flattened in their calling order, the compiled call is
+        reset whenever the bindings are changed.
+        '''
+        assert isinstance(proxyCall, ProxyCall), 'Invalid proxy call %s' % proxyCall
+        proxy = proxyCall.proxy
+        before = listenersFor(proxy, EVENT_BEFORE_CALL) + listenersFor(proxyCall, EVENT_BEFORE_CALL)
+        after = listenersFor(proxy, EVENT_AFTER_CALL) + listenersFor(proxyCall, EVENT_AFTER_CALL)
+        exception = listenersFor(proxy, EVENT_EXCEPTION_CALL) + listenersFor(proxyCall, EVENT_EXCEPTION_CALL)
+        if not (before or after or exception): return follow
+
+        def call(*args, **keyargs):
+            args = list(args)  # The before listeners can alter the arguments
+            try:
+                for listener in before:
+                    if listener(args, keyargs) == False: return
+                value = follow(*args, **keyargs)
+                for listener in after:
+                    if listener(value) == False: break
+                return value
+            except Exception as e:
+                for listener in exception:
+                    if listener(e) == False: break
+                raise
+        return call
+
 
 BINDING_HANDLER = BindingHandler()
 # The single proxy binder handler that solver the listener calls.
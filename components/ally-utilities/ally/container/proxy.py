@@ -127,6 +127,7 @@ def registerProxyHandler(proxyHandler, proxy):
     if method: proxyHandler = ProxyFilter(proxyHandler, method)
     assert isinstance(proxy, Proxy)
     proxy._proxy_handlers.insert(0, proxyHandler)
+    resetCompiled(proxy)
 
 def hasProxyHandler(proxyHandler, proxy):
     '''
@@ -142,6 +143,63 @@ def hasProxyHandler(proxyHandler, proxy):
     assert isinstance(proxy, Proxy)
     return proxyHandler in proxy._proxy_handlers
 
+def resetCompiled(proxy):
+    '''
+    Resets the compiled calls of the provided proxy, the calls are compiled again on the next invoking. This needs to be
+    called whenever something that is used in compiling the calls has been changed.
+    
+    @param proxy: @see: analyzeProxy
+        If a proxy call is provided than only the compiled call for that method is reset.
+    '''
+    proxy, method = analyzeProxy(proxy)
+    assert isinstance(proxy, Proxy)
+    if method:
+        call = proxy._proxy_calls.get(method)
+        if call: call._compiled = None
+    else:
+        for call in proxy._proxy_calls.values(): call._compiled = None
+
+def compileCall(proxyCall):
+    '''
+    Compiles the proxy handlers of the provided proxy call into a single callable. The @see: IProxyHandlerCompilable
+    handlers are compiled directly, the other handlers are processed using an @see: Execution that follows with the
+    compiled call of the next handlers.
+    
+    @param proxyCall: ProxyCall
+        The proxy call to compile.
+    @return: callable(*args, **keyargs)
+        The compiled call.
+    '''
+    assert isinstance(proxyCall, ProxyCall), 'Invalid proxy call %s' % proxyCall
+
+    def unresolved(*args, **keyargs):
+        raise AttributeError('No proxy handler resolves method %r' % proxyCall.proxyMethod.name)
+    compiled = unresolved
+    for handler in reversed(proxyCall.proxy._proxy_handlers):
+        if isinstance(handler, IProxyHandlerCompilable): compiled = handler.compile(proxyCall, compiled)
+        else: compiled = compileExecution(proxyCall, handler, compiled)
+        assert callable(compiled), 'Invalid compiled call %s' % compiled
+    return compiled
+
+def compileExecution(proxyCall, proxyHandler, follow):
+    '''
+    Compiles a call that processes the provided proxy handler using an @see: Execution.
+    
+    @param proxyCall: ProxyCall
+        The proxy call to compile for.
+    @param proxyHandler: IProxyHandler
+        The proxy handler to process.
+    @param follow: callable(*args, **keyargs)
+        The compiled call to be invoked when the proxy handler continues the execution.
+    @return: callable(*args, **keyargs)
+        The compiled call.
+    '''
+    assert isinstance(proxyHandler, IProxyHandler), 'Invalid proxy handler %s' % proxyHandler
+    handlerFollow = ProxyCompiled(follow)
+    def execute(*args, **keyargs):
+        return Execution(proxyCall, deque((proxyHandler, handlerFollow)), args, keyargs).invoke()
+    return execute
+
 # --------------------------------------------------------------------
 
 class Execution:
@@ -236,12 +294,15 @@ class ProxyCall:
         self.proxyMethod = proxyMethod
 
         self._ally_listeners = {} # This will allow the proxy method to be binded with listeners
+        self._compiled = None # The compiled call, @see: compileCall
 
     def __call__(self, *args, **keyargs):
         '''
         @see: Callable.__call__
         '''
-        return Execution(self, deque(self.proxy._proxy_handlers), args, keyargs).invoke()
+        compiled = self._compiled
+        if compiled is None: compiled = self._compiled = compileCall(self)
+        return compiled(*args, **keyargs)
 
 class ProxyMethod:
     '''
@@ -302,7 +363,26 @@ class IProxyHandler(metaclass=abc.ABCMeta):
             The return value for the execution.
         '''
 
-class ProxyWrapper(IProxyHandler):
+class IProxyHandlerCompilable(IProxyHandler):
+    '''
+    API class for proxy handlers that can compile their handling for a proxy call, this way the proxy call is invoked
+    directly without the overhead of an execution.
+    '''
+
+    @abc.abstractclassmethod
+    def compile(self, proxyCall, follow):
+        '''
+        Compiles the handling for the proxy call.
+        
+        @param proxyCall: ProxyCall
+            The proxy call to compile the handling for.
+        @param follow: callable(*args, **keyargs)
+            The compiled call of the following proxy handlers, this is the equivalent of @see: Execution.invoke.
+        @return: callable(*args, **keyargs)
+            The compiled call.
+        '''
+
+class ProxyWrapper(IProxyHandlerCompilable):
     '''
     Provides a @see: IProxyHandler implementation that just delegates the functionality to a wrapped object.
     '''
@@ -328,7 +408,19 @@ class ProxyWrapper(IProxyHandler):
             raise AttributeError('The proxy wrapped %s has no method %r' % (self._wrapped, execution.methodName))
         return method(*execution.args, **execution.keyargs)
 
-class ProxyFilter(IProxyHandler):
+    def compile(self, proxyCall, follow):
+        '''
+        @see: IProxyHandlerCompilable.compile
+        '''
+        assert isinstance(proxyCall, ProxyCall), 'Invalid proxy call %s' % proxyCall
+        method = getattr(self._wrapped, proxyCall.proxyMethod.name, None)
+        if method: return method
+
+        def missing(*args, **keyargs):
+            raise AttributeError('The proxy wrapped %s has no method %r' % (self._wrapped, proxyCall.proxyMethod.name))
+        return missing
+
+class ProxyFilter(IProxyHandlerCompilable):
     '''
     Provides a @see: IProxyHandler implementation that filters the execution based on the method name and delivers the
     execution to proxy handlers assigned to that method name.
@@ -361,3 +453,34 @@ class ProxyFilter(IProxyHandler):
             execution.handlers.appendleft(self._proxyHandler)
         return execution.invoke()
 
+    def compile(self, proxyCall, follow):
+        '''
+        @see: IProxyHandlerCompilable.compile
+        '''
+        assert isinstance(proxyCall, ProxyCall), 'Invalid proxy call %s' % proxyCall
+        if proxyCall.proxyMethod.name not in self._methodNames: return follow
+        if isinstance(self._proxyHandler, IProxyHandlerCompilable):
+            return self._proxyHandler.compile(proxyCall, follow)
+        return compileExecution(proxyCall, self._proxyHandler, follow)
+
+class ProxyCompiled(IProxyHandler):
+    '''
+    Provides a @see: IProxyHandler implementation that delegates the execution to a compiled call.
+    '''
+
+    def __init__(self, compiled):
+        '''
+        Construct the compiled proxy.
+        
+        @param compiled: callable(*args, **keyargs)
+            The compiled call to delegate to.
+        '''
+        assert callable(compiled), 'Invalid compiled call %s' % compiled
+        self._compiled = compiled
+
+    def handle(self, execution):
+        '''
+        @see: IProxyHandler.handle
+        '''
+        assert isinstance(execution, Execution), 'Invalid execution %s' % execution
+        return self._compiled(*execution.args, **execution.keyargs)
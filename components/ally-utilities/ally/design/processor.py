@@ -164,6 +164,19 @@ class ContextualProceed(Processor):
         cd = function.__code__
         super().__init__(Contextual.contextsFrom(fnArgs.args[1:], fnArgs.annotations), call, function.__name__,
                          cd.co_filename, cd.co_firstlineno)
+        self.function = function
+
+    def register(self, processing):
+        '''
+        @see: Processor.register
+        
+        Also registers the function that is not wrapped in the chain proceeding call if the processing is a compiled
+        processing.
+        '''
+        super().register(processing)
+        if isinstance(processing, ProcessingCompiled):
+            assert isinstance(processing, ProcessingCompiled)
+            processing.proceeds[self.call] = self.function
 
 # --------------------------------------------------------------------
 
@@ -190,7 +203,40 @@ class Processing:
 
         self.contexts = contexts
         self.calls = deque()
+
+class ProcessingCompiled(Processing):
+    '''
+    Processing that besides the processor's calls contains also the steps that are used by the compiled chains, the
+    steps are created once for the processing and then used by all the chains, basically the processors that always
+    proceed will be called directly without passing through the chain.
+    !!! Attention, never ever use a processing in multiple threads, only one thread is allowed to execute 
+    a processing at one time.
+    '''
+    __slots__ = ('proceeds', '_steps')
+
+    def __init__(self, contexts):
+        '''
+        Construct the compiled processing.
+        @see: Processing.__init__
+        '''
+        super().__init__(contexts)
+
+        self.proceeds = {}
+        self._steps = None
+
+    def steps(self):
+        '''
+        Provides the steps of the processing.
         
+        @return: tuple(tuple(callable, callable|None))
+            The steps of the processing, each step is a tuple containing on the first position the chain call of the
+            processor and on the second position the function to be called directly if the processor always proceeds,
+            None otherwise.
+        '''
+        if self._steps is None or len(self._steps) != len(self.calls):
+            self._steps = tuple((call, self.proceeds.get(call)) for call in self.calls)
+        return self._steps
+
 class Chain:
     '''
     A chain that contains a list of processors (callables) that are executed one by one. Each processor will have
@@ -362,6 +408,99 @@ class Chain:
         '''
         return self._consumed
 
+class ChainCompiled(Chain):
+    '''
+    A chain that executes the steps of a compiled processing. The steps are not copied for each chain, the chain just
+    keeps the index of the current step, and the processors that always proceed are called directly with the key
+    arguments without going through the chain proceeding call.
+    '''
+    __slots__ = ('_steps', '_index')
+
+    def __init__(self, processing):
+        '''
+        Initializes the chain with the compiled processing to be executed.
+        
+        @param processing: ProcessingCompiled|Processing
+            The processing to be handled by the chain, if is not a compiled processing then all the processors calls
+            will be executed through the chain.
+        '''
+        self._steps = stepsFor(processing)
+        self._index = 0
+        self._callBacks = deque()
+        self._callBacksErrors = deque()
+        self._keyargs = None
+        self._consumed = False
+
+    def branch(self, processing):
+        '''
+        @see: Chain.branch
+        '''
+        assert self._keyargs is not None, 'Cannot branch if no process is called'
+        self._steps = stepsFor(processing)
+        self._index = 0
+        self._proceed = True
+        return self
+
+    def do(self):
+        '''
+        @see: Chain.do
+        '''
+        assert self._keyargs is not None, 'Cannot proceed if no process is called'
+        assert self._index < len(self._steps), 'Nothing to execute'
+        assert self._proceed, 'Cannot proceed if no process is called'
+
+        call, function = self._steps[self._index]
+        self._index += 1
+        assert log.debug('Processing %s', call) or True
+        try:
+            if function is None:
+                self._proceed = False
+                call(self, **self._keyargs)
+            else: function(**self._keyargs)
+        except:
+            if self._callBacksErrors:
+                self._proceed = False
+                while self._callBacksErrors: self._callBacksErrors.pop()()
+            else: raise
+
+        assert log.debug('Processing finalized \'%s\'', call) or True
+        if self._proceed:
+            assert log.debug('Proceed signal received, continue execution') or True
+            if self._index < len(self._steps): return True
+            assert log.debug('Processing finalized by consuming') or True
+            self._consumed = True
+            self._keyargs = None
+        else:
+            self._steps, self._index = (), 0
+            self._keyargs = None
+        while self._callBacks: self._callBacks.pop()()
+        return False
+
+    def doAll(self):
+        '''
+        @see: Chain.doAll
+        '''
+        do = self.do
+        while do(): pass
+        return self
+
+def stepsFor(processing):
+    '''
+    Provides the steps to be executed by a compiled chain for the provided processing.
+    
+    @param processing: ProcessingCompiled|Processing
+        The processing to provide the steps for.
+    @return: tuple(tuple(callable, callable|None))
+        The steps for the processing, @see: ProcessingCompiled.steps
+    '''
+    if isinstance(processing, ProcessingCompiled):
+        assert isinstance(processing, ProcessingCompiled)
+        return processing.steps()
+    assert isinstance(processing, Processing), 'Invalid processing %s' % processing
+    if __debug__:
+        for call in processing.calls: assert callable(call), 'Invalid processor call %s' % call
+    return tuple((call, None) for call in processing.calls)
+
 # --------------------------------------------------------------------
 
 class Handler(metaclass=abc.ABCMeta):
@@ -430,6 +569,9 @@ ONLY_AVAILABLE = 1 << 3
 # Assembly create flag that dictates that only the available processors should be used.
 CREATE_REPORT = 1 << 4
 # Assembly create flag that dictates that a report should be created, this will modify the return value for the create.
+COMPILED = 1 << 5
+# Assembly create flag that dictates that a compiled processing should be created, the compiled processing needs to be
+# executed with a compiled chain.
 
 class AssemblyError(Exception):
     '''
@@ -513,9 +655,10 @@ class Assembly:
             Flags that dictate the behavior of the processing creation.
         @param contexts: key arguments of ContextMetaClass
             Key arguments that have as a value the context classes that the processing chain will be used with.
-        @return: Processing|tuple of two
-            processing: Processing
-            A processing created based on the current structure of the assembly.
+        @return: Processing|ProcessingCompiled|tuple of two
+            processing: Processing|ProcessingCompiled
+            A processing created based on the current structure of the assembly, if the COMPILED flag is provided
+            then a compiled processing is created that should be used with a compiled chain.
             report: string
             A text containing the report for the processing creation
         '''
@@ -558,7 +701,8 @@ class Assembly:
 
         if not processors: raise AssemblyError('No processors available to create a processing')
 
-        processing = Processing(assContext.create())
+        if flag & COMPILED: processing = ProcessingCompiled(assContext.create())
+        else: processing = Processing(assContext.create())
         for processor in processors:
             assert isinstance(processor, Processor), 'Invalid processor %s' % processor
             processor.register(processing)
@@ -10,7 +10,7 @@ Provides utility functions for handling I/O operations.
 '''
 
 from ally.zip.util_zip import normOSPath, getZipFilePath, ZIPSEP
-from collections import Iterable
+from collections import Iterable, deque
 from datetime import datetime
 from genericpath import isdir, exists
 from os import stat, makedirs
@@ -157,6 +157,170 @@ class ReplaceInFile:
 
     def __getattr__(self, name): return getattr(self._fileObj, name)
 
+class FileBacked:
+    '''
+    Marks a stream that is backed by a file from the file system, the servers that recognize this stream can deliver
+    the content directly from the file descriptor (as an example using os.sendfile) instead of reading it in chunks.
+    '''
+
+    __slots__ = ['_fileObj', 'offset', 'length', '_remaining']
+
+    def __init__(self, fileObj, offset=0, length=None):
+        '''
+        Construct the file backed stream.
+
+        @param fileObj: file
+            The file object opened in byte mode, needs to provide a file descriptor.
+        @param offset: integer
+            The offset in the file from where the content starts.
+        @param length: integer|None
+            The length of the content starting from the offset, None for the content up until the end of file.
+        '''
+        assert fileObj, 'A file object is required %s' % fileObj
+        assert isinstance(fileObj, IInputStream), 'Invalid file object %s' % fileObj
+        assert isinstance(offset, int) and offset >= 0, 'Invalid offset %s' % offset
+        assert length is None or (isinstance(length, int) and length >= 0), 'Invalid length %s' % length
+        self._fileObj = fileObj
+        self.offset = offset
+        self.length = length
+
+        self._remaining = length
+        if offset: fileObj.seek(offset)
+
+    def fileno(self):
+        '''
+        Provides the file descriptor.
+        '''
+        return self._fileObj.fileno()
+
+    def read(self, nbytes=None):
+        '''
+        @see: IInputStream.read
+        '''
+        if self._remaining is None: return self._fileObj.read(nbytes)
+        if nbytes is None or nbytes < 0 or nbytes > self._remaining: nbytes = self._remaining
+        data = self._fileObj.read(nbytes)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        '''
+        @see: IClosable.close
+        '''
+        self._fileObj.close()
+
+    def __enter__(self): return self
+
+    def __exit__(self, *args): self.close()
+
+    def __getattr__(self, name): return getattr(self._fileObj, name)
+
+class StreamRange:
+    '''
+    Provides the reading of a range from a stream, the stream is positioned at the range start by reading if it
+    cannot seek.
+    '''
+
+    __slots__ = ['_fileObj', '_remaining']
+
+    def __init__(self, fileObj, offset, length):
+        '''
+        Construct the stream range.
+
+        @param fileObj: IInputStream
+            The stream to read the range from.
+        @param offset: integer
+            The offset in the stream from where the range starts.
+        @param length: integer
+            The length of the range.
+        '''
+        assert fileObj, 'A file object is required %s' % fileObj
+        assert isinstance(fileObj, IInputStream), 'Invalid file object %s' % fileObj
+        assert isinstance(offset, int) and offset >= 0, 'Invalid offset %s' % offset
+        assert isinstance(length, int) and length >= 0, 'Invalid length %s' % length
+        self._fileObj = fileObj
+        self._remaining = length
+
+        if offset:
+            if getattr(fileObj, 'seekable', lambda: False)(): fileObj.seek(offset)
+            else:
+                while offset > 0:
+                    skipped = len(fileObj.read(min(offset, 65536)))
+                    if not skipped: break
+                    offset -= skipped
+
+    def read(self, nbytes=None):
+        '''
+        @see: IInputStream.read
+        '''
+        if nbytes is None or nbytes < 0 or nbytes > self._remaining: nbytes = self._remaining
+        if not nbytes: return b''
+        data = self._fileObj.read(nbytes)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        '''
+        @see: IClosable.close
+        '''
+        self._fileObj.close()
+
+    def __enter__(self): return self
+
+    def __exit__(self, *args): self.close()
+
+class OutputChunks:
+    '''
+    Provides an output stream that collects the written bytes in chunks, a chunk is made whenever the written bytes
+    reach the chunk size. The chunks can be removed while writing in order to stream the content without keeping all
+    of it in memory, or can be used as they are for an iterable content with a known length.
+    '''
+
+    __slots__ = ['chunkSize', 'length', 'chunks', '_buffer']
+
+    def __init__(self, chunkSize=1024):
+        '''
+        Construct the chunks output.
+
+        @param chunkSize: integer
+            The minimum size of the made chunks, except the last one.
+        @ivar length: integer
+            The total number of bytes written.
+        @ivar chunks: deque(bytes)
+            The made chunks.
+        '''
+        assert isinstance(chunkSize, int) and chunkSize > 0, 'Invalid chunk size %s' % chunkSize
+        self.chunkSize = chunkSize
+        self.length = 0
+        self.chunks = deque()
+
+        self._buffer = bytearray()
+
+    def write(self, data):
+        '''
+        @see: IOutputStream.write
+        '''
+        self.length += len(data)
+        buffer = self._buffer
+        buffer.extend(data)
+        if len(buffer) >= self.chunkSize:
+            self.chunks.append(bytes(buffer))
+            del buffer[:]
+
+    def flush(self):
+        '''
+        Makes a chunk from the bytes written since the last chunk.
+        '''
+        if self._buffer:
+            self.chunks.append(bytes(self._buffer))
+            del self._buffer[:]
+
+    def close(self):
+        '''
+        @see: IClosable.close
+        '''
+        self.flush()
+
 def pipe(srcFileObj, dstFileObj, bufferSize=1024):
     '''
     Copy the content from a source file to a destination file
@@ -12,9 +12,11 @@ Provides utility functions for handling system packages/modules/classes.
 from collections import deque
 from inspect import isclass, ismodule, stack, isfunction, getsourcelines, \
     getsourcefile
-from os.path import dirname, relpath
+from os.path import dirname, relpath, exists
 from pkgutil import iter_modules, get_importer, iter_importers, \
     iter_importer_modules
+import os
+import pickle
 import re
 import sys
 
@@ -217,12 +219,22 @@ def searchPaths(pattern):
         A dictionary containing as a key a tuple with a flag indicating that the full name is a package and as a second value the package/module full path,
         and as a value a list of paths where this package/module is defined.
     '''
+    modules = _searchPaths(pattern)
+    _modulesIndex.save()
+    return modules
+
+def _searchPaths(pattern):
+    '''
+    Finds all modules/packages available in the sys.path that respect the provided pattern, the modules of the packages
+    are provided by the modules index.
+    @see: searchPaths
+    '''
     assert isinstance(pattern, str), 'Invalid module pattern %s' % pattern
     modules, importers = {}, None
     k = pattern.rfind('.')
     if k >= 0:
         name = pattern[k + 1:]
-        parent = searchPaths(pattern[:k])
+        parent = _searchPaths(pattern[:k])
 
         if name == '**':
             while parent:
@@ -230,9 +242,7 @@ def searchPaths(pattern):
                 isPackage, pckg = keyPack
                 for path in pckgPaths:
                     if isPackage:
-                        moduleImporter = get_importer(path)
-                        for modulePath, isPkg in iter_importer_modules(moduleImporter):
-                            path = dirname(moduleImporter.find_module(modulePath).get_filename(modulePath))
+                        for modulePath, isPkg, path in _modulesIndex.modulesIn(path):
                             keyPack = (isPkg, pckg + ('.' if pckg else '') + modulePath)
                             if isPkg:
                                 paths = parent.get(keyPack)
@@ -249,10 +259,8 @@ def searchPaths(pattern):
                 isPackage, pckg = keyPack
                 for path in pckgPaths:
                     if isPackage:
-                        moduleImporter = get_importer(path)
-                        for modulePath, isPkg in iter_importer_modules(moduleImporter):
+                        for modulePath, isPkg, path in _modulesIndex.modulesIn(path):
                             if matcher.match(modulePath):
-                                path = dirname(moduleImporter.find_module(modulePath).get_filename(modulePath))
                                 keyPack = (isPkg, pckg + ('.' if pckg else '') + modulePath)
                                 paths = modules.get(keyPack)
                                 if paths is None: paths = modules[keyPack] = []
@@ -286,6 +294,96 @@ def searchPaths(pattern):
 
     return modules
 
+def useModulesIndex(path):
+    '''
+    Uses for the modules search an index that is persisted on disk at the provided path, the index is loaded from the
+    path if there is one and is updated whenever the modules of a package path have changed.
+    
+    @param path: string|None
+        The path of the index file, if None the index is only kept in memory.
+    '''
+    global _modulesIndex
+    assert path is None or isinstance(path, str), 'Invalid index path %s' % path
+    _modulesIndex = ModulesIndex(path)
+
+class ModulesIndex:
+    '''
+    Provides the index of the modules found in package paths, the index for a package path is valid as long as the
+    modification time of the package folder, or of the egg that contains the package, is not changed. The index can be
+    persisted on disk in order to be used when the application is started again.
+    '''
+    __slots__ = ('path', 'modified', '_paths')
+
+    def __init__(self, path=None):
+        '''
+        Construct the modules index.
+        
+        @param path: string|None
+            The path of the index file, if None the index is only kept in memory.
+        @ivar modified: boolean
+            Flag indicating that the index has been changed since it was loaded or saved.
+        '''
+        assert path is None or isinstance(path, str), 'Invalid index path %s' % path
+        self.path = path
+        self.modified = False
+
+        self._paths = None
+        if path and exists(path):
+            # In case the index is corrupted or has an older format it will just be rebuilt.
+            try:
+                with open(path, 'rb') as f: self._paths = pickle.load(f)
+            except Exception: pass
+        if not isinstance(self._paths, dict): self._paths = {}
+
+    def modulesIn(self, path):
+        '''
+        Provides the modules found in the package path.
+        
+        @param path: string
+            The package path to provide the modules for.
+        @return: list[tuple(string, boolean, string)]
+            A list of tuples containing: (module name, is package flag, module folder path)
+        '''
+        assert isinstance(path, str), 'Invalid path %s' % path
+        stamp, indexed = modificationFor(path), self._paths.get(path)
+        if indexed and stamp is not None and indexed[0] == stamp: return indexed[1]
+
+        importer = get_importer(path)
+        modules = [(name, isPkg, dirname(importer.find_module(name).get_filename(name)))
+                   for name, isPkg in iter_importer_modules(importer)]
+        if stamp is not None:
+            self._paths[path] = (stamp, modules)
+            self.modified = True
+        return modules
+
+    def save(self):
+        '''
+        Saves the index if there is an index file path and the index has been modified.
+        '''
+        if self.path and self.modified:
+            with open(self.path, 'wb') as f: pickle.dump(self._paths, f)
+            self.modified = False
+
+_modulesIndex = ModulesIndex()
+# The modules index used by the modules search.
+
+def modificationFor(path):
+    '''
+    Provides the modification time for the provided path, if the path is inside an egg (zip) the modification time of
+    the egg is provided.
+    
+    @param path: string
+        The path to provide the modification time for.
+    @return: float|None
+        The modification time or None if the path cannot be located.
+    '''
+    assert isinstance(path, str), 'Invalid path %s' % path
+    while not exists(path):
+        parent = dirname(path)
+        if parent == path: return None
+        path = parent
+    return os.stat(path).st_mtime
+
 def packageModules(package):
     '''
     Provides all modules that are found in the provided module package.
@@ -389,3 +487,35 @@ def validateType(name, vauleType, allowNone=True):
         if __debug__: validateTypeFor(clazz, name, vauleType, allowNone)
         return clazz
     return decorator
+
+# --------------------------------------------------------------------
+
+_forkListeners = []
+# The listeners to be called in the forked processes.
+
+def addForkListener(listener):
+    '''
+    Adds a listener to be called in the child process after the application process is forked, used mainly for releasing
+    the resources (like database connections) that cannot be shared between processes.
+    
+    @param listener: callable()
+        The listener to be called in the forked process.
+    '''
+    assert callable(listener), 'Invalid listener %s' % listener
+    if listener not in _forkListeners: _forkListeners.append(listener)
+
+def removeForkListener(listener):
+    '''
+    Removes a listener added with @see: addForkListener.
+    
+    @param listener: callable()
+        The listener to be removed.
+    '''
+    try: _forkListeners.remove(listener)
+    except ValueError: pass
+
+def notifyFork():
+    '''
+    Notifies the fork listeners, needs to be called in the child process right after the fork.
+    '''
+    for listener in list(_forkListeners): listener()
@@ -0,0 +1,83 @@
+'''
+Created on Oct 18, 2026
+
+@package: support cdm
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides unit testing for the CDM indexes.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from cdm.impl.index import LinkIndex, ZipCache
+from cdm.impl.local_filesystem import HTTPDelivery, LocalFileSystemLinkCDM
+from os.path import join, dirname
+from tempfile import TemporaryDirectory
+import os
+import unittest
+
+# --------------------------------------------------------------------
+
+class TestIndex(unittest.TestCase):
+
+    def testLinkIndex(self):
+        rootDir, srcDir = TemporaryDirectory(), TemporaryDirectory()
+        d = HTTPDelivery()
+        d.serverURI = 'http://localhost/content/'
+        d.repositoryPath = rootDir.name
+        cdm = LocalFileSystemLinkCDM()
+        cdm.delivery = d
+
+        index = LinkIndex(d.getRepositoryPath(), checkInterval=3600)
+        linkPath = join(d.getRepositoryPath(), 'dir')
+        self.assertIsNone(index.linksFor(linkPath))
+
+        with open(join(srcDir.name, 'file.txt'), 'w') as f: f.write('content')
+        cdm.publishFromDir('dir', srcDir.name)
+        self.assertEqual(index.linksFor(linkPath), [['FS', srcDir.name]])
+        self.assertFalse(index.isDeleted(join(linkPath, 'file.txt')))
+
+        zipPath = join(dirname(__file__), 'test.zip')
+        cdm.publishFromDir('dir', join(zipPath, 'dir1'))
+        self.assertEqual(index.linksFor(linkPath), [['ZIP', zipPath, 'dir1/'], ['FS', srcDir.name]])
+
+        cdm.remove('dir/file.txt')
+        self.assertTrue(index.isDeleted(join(linkPath, 'file.txt')))
+        self.assertFalse(index.isDeleted(join(linkPath, 'other.txt')))
+
+    def testLinkIndexSize(self):
+        rootDir = TemporaryDirectory()
+        index = LinkIndex(rootDir.name, checkInterval=3600, size=2)
+        # The missing directories are not indexed.
+        self.assertFalse(index.isDeleted(join(rootDir.name, 'a', 'b', 'c', 'file.txt')))
+        self.assertIsNone(index.linksFor(join(rootDir.name, 'x', 'y')))
+        self.assertEqual(list(index._dirs), [rootDir.name])
+
+        for name in ('a', 'b', 'c'):
+            os.mkdir(join(rootDir.name, name))
+            self.assertFalse(index.isDeleted(join(rootDir.name, name, 'file.txt')))
+        self.assertEqual(set(index._dirs), {rootDir.name, join(rootDir.name, 'c')})
+
+        open(join(rootDir.name, 'c', 'file.txt.deleted'), 'w').close()
+        index.invalidate(join(rootDir.name, 'c', 'file.txt'))
+        self.assertTrue(index.isDeleted(join(rootDir.name, 'c', 'file.txt')))
+
+    def testZipCache(self):
+        cache = ZipCache(1)
+        zipPath = join(dirname(__file__), 'test.zip')
+        zipFile = cache.zipFor(zipPath)
+        self.assertIn('dir2/file3.txt', zipFile.NameToInfo)
+        self.assertIs(cache.zipFor(zipPath), zipFile)
+        cache.clear()
+        self.assertIsNot(cache.zipFor(zipPath), zipFile)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -16,14 +16,17 @@ from ally.core.spec.codes import METHOD_NOT_AVAILABLE, RESOURCE_FOUND, \
 from ally.design.context import Context, requires, defines
 from ally.design.processor import Chain, Function, Assembly, NO_VALIDATION, \
     Processing, Handler
-from ally.http.spec.server import METHOD_GET
-from ally.support.util_io import IInputStream
+from ally.http.spec.codes import NOT_MODIFIED, PARTIAL_CONTENT, \
+    RANGE_NOT_SATISFIABLE
+from ally.http.spec.server import METHOD_GET, IDecoderHeader, IEncoderHeader
+from ally.support.util_io import IInputStream, FileBacked, StreamRange
 from ally.zip.util_zip import normOSPath, normZipPath
+from cdm.impl.index import LinkIndex, ZipCache
+from email.utils import formatdate, parsedate_tz, mktime_tz
+from functools import partial
 from mimetypes import guess_type
 from os.path import isdir, isfile, join, dirname, normpath, sep
 from urllib.parse import unquote
-from zipfile import ZipFile
-import json
 import logging
 import os
 
@@ -41,11 +44,14 @@ class Request(Context):
     scheme = requires(str)
     uri = requires(str)
     methodName = requires(str)
+    decoderHeader = requires(IDecoderHeader)
 
 class Response(Context):
     '''
     The response context.
     '''
+    # ---------------------------------------------------------------- Required
+    encoderHeader = requires(IEncoderHeader)
     # ---------------------------------------------------------------- Defined
     code = defines(int)
     isSuccess = defines(bool)
@@ -62,7 +68,8 @@ class ResponseContent(Context):
     # ---------------------------------------------------------------- Defined
     source = defines(IInputStream, doc='''
     @rtype: IInputStream
-    The stream that provides the response content in bytes.
+    The stream that provides the response content in bytes, the content that is delivered from the file system is
+    provided as a @see: FileBacked stream.
     ''')
     length = defines(int, doc='''
     @rtype: integer
@@ -91,12 +98,40 @@ class ContentDeliveryHandler(Handler):
     # Marker used in the link file to indicate that a link is inside a zip file.
     _fsHeader = 'FS'
     # Marker used in the link file to indicate that a link is file system
+    _deletedExt = '.deleted'
+    # Extension to mark the deleted paths in the repository.
+    linkCheckInterval = 5
+    # The interval in seconds in which the indexed link and deleted markers are not checked for modifications.
+    linkIndexSize = 1000
+    # The maximum number of directories for which the link and deleted markers are indexed.
+    zipCacheSize = 20
+    # The maximum number of ZIP files kept opened for delivering the ZIP linked content.
     errorAssembly = Assembly
     # The error processors, this are used when the content is not available.
+    nameETag = 'ETag'
+    # The header name for the entity tag.
+    nameLastModified = 'Last-Modified'
+    # The header name for the last modified date.
+    nameIfNoneMatch = 'If-None-Match'
+    # The header name for the entity tags condition.
+    nameIfModifiedSince = 'If-Modified-Since'
+    # The header name for the modified date condition.
+    nameAcceptRanges = 'Accept-Ranges'
+    # The header name for the accepted range units.
+    nameRange = 'Range'
+    # The header name for the requested range.
+    nameIfRange = 'If-Range'
+    # The header name for the range condition.
+    nameContentRange = 'Content-Range'
+    # The header name for the delivered range.
 
     def __init__(self):
         assert isinstance(self.repositoryPath, str), 'Invalid repository path value %s' % self.repositoryPath
         assert isinstance(self.defaultContentType, str), 'Invalid default content type %s' % self.defaultContentType
+        assert isinstance(self.linkCheckInterval, (int, float)), \
+        'Invalid link check interval %s' % self.linkCheckInterval
+        assert isinstance(self.linkIndexSize, int), 'Invalid link index size %s' % self.linkIndexSize
+        assert isinstance(self.zipCacheSize, int), 'Invalid ZIP cache size %s' % self.zipCacheSize
         self.repositoryPath = normpath(self.repositoryPath)
         if not os.path.exists(self.repositoryPath): os.makedirs(self.repositoryPath)
         assert isdir(self.repositoryPath) and os.access(self.repositoryPath, os.R_OK), \
@@ -110,6 +145,9 @@ class ContentDeliveryHandler(Handler):
 
         self._errorProcessing = errorProcessing
         self._linkTypes = {self._fsHeader:self._processLink, self._zipHeader:self._processZiplink}
+        self._linkIndex = LinkIndex(self.repositoryPath, self._linkExt, self._deletedExt, self.linkCheckInterval,
+                                    self.linkIndexSize)
+        self._zipCache = ZipCache(self.zipCacheSize)
 
     def process(self, chain, request, response, responseCnt, **keyargs):
         '''
@@ -134,16 +172,17 @@ class ContentDeliveryHandler(Handler):
                 response.code, response.isSuccess = RESOURCE_NOT_FOUND
                 response.text = 'Out of repository path'
             else:
-                # Initialize the read file handler with None value
-                # This will be set upon successful file open
-                rf = None
+                # Initialize the opener with None value
+                # This will be set upon successful file resolve
+                opener = None
                 if isfile(entryPath):
-                    rf, size = open(entryPath, 'rb'), os.path.getsize(entryPath)
+                    stat = os.stat(entryPath)
+                    opener, size, timestamp = partial(self._openFile, entryPath), stat.st_size, stat.st_mtime
                 else:
                     linkPath = entryPath
                     while len(linkPath) > len(self.repositoryPath):
-                        if isfile(linkPath + self._linkExt):
-                            with open(linkPath + self._linkExt) as f: links = json.load(f)
+                        links = self._linkIndex.linksFor(linkPath)
+                        if links is not None:
                             subPath = normOSPath(entryPath[len(linkPath):]).lstrip(sep)
                             for linkType, *data in links:
                                 if linkType in self._linkTypes:
@@ -151,7 +190,7 @@ class ContentDeliveryHandler(Handler):
                                     if not self._isPathDeleted(join(linkPath, subPath)):
                                         entry = self._linkTypes[linkType](subPath, *data)
                                         if entry is not None:
-                                            rf, size = entry
+                                            opener, size, timestamp = entry
                                             break
                             break
                         subLinkPath = dirname(linkPath)
@@ -159,17 +198,46 @@ class ContentDeliveryHandler(Handler):
                             break
                         linkPath = subLinkPath
         
-                if rf is None:
+                if opener is None:
                     response.code, response.isSuccess = METHOD_NOT_AVAILABLE
                     response.text = 'Invalid content resource'
                 else:
-                    response.code, response.isSuccess = RESOURCE_FOUND
-                    response.text = 'Resource found'
-                    responseCnt.source = rf
-                    responseCnt.length = size
-                    responseCnt.type, _encoding = guess_type(entryPath)
-                    if not responseCnt.type: responseCnt.type = self.defaultContentType
-                    return
+                    assert isinstance(request.decoderHeader, IDecoderHeader), \
+                    'Invalid header decoder %s' % request.decoderHeader
+                    assert isinstance(response.encoderHeader, IEncoderHeader), \
+                    'Invalid header encoder %s' % response.encoderHeader
+                    
+                    etag, timestamp = '"%x-%x"' % (int(timestamp), size), int(timestamp)
+                    response.encoderHeader.encode(self.nameETag, etag)
+                    response.encoderHeader.encode(self.nameLastModified, formatdate(timestamp, usegmt=True))
+                    response.encoderHeader.encode(self.nameAcceptRanges, 'bytes')
+                    
+                    if self._isNotModified(request.decoderHeader, etag, timestamp):
+                        response.code, response.isSuccess = NOT_MODIFIED
+                        response.text = 'Not modified'
+                        return
+                    
+                    bytesRange = self._rangeFor(request.decoderHeader, etag, timestamp, size)
+                    if bytesRange is False:
+                        response.encoderHeader.encode(self.nameContentRange, 'bytes */%s' % size)
+                        response.code, response.isSuccess = RANGE_NOT_SATISFIABLE
+                        response.text = 'Invalid range'
+                    else:
+                        if bytesRange is None:
+                            response.code, response.isSuccess = RESOURCE_FOUND
+                            response.text = 'Resource found'
+                            responseCnt.source = opener()
+                            responseCnt.length = size
+                        else:
+                            start, end = bytesRange
+                            response.encoderHeader.encode(self.nameContentRange, 'bytes %s-%s/%s' % (start, end, size))
+                            response.code, response.isSuccess = PARTIAL_CONTENT
+                            response.text = 'Partial content'
+                            responseCnt.source = opener(start, end - start + 1)
+                            responseCnt.length = end - start + 1
+                        responseCnt.type, _encoding = guess_type(entryPath)
+                        if not responseCnt.type: responseCnt.type = self.defaultContentType
+                        return
         
         chain.branch(self._errorProcessing)
 
@@ -177,8 +245,8 @@ class ContentDeliveryHandler(Handler):
 
     def _processLink(self, subPath, linkedFilePath):
         '''
-        Reads a link description file and returns a file handler to
-        the linked file.
+        Reads a link description file and returns the opener, size and
+        modification time of the linked file.
         '''
         # make sure the file path uses the OS separator
         linkedFilePath = normOSPath(linkedFilePath)
@@ -189,32 +257,99 @@ class ContentDeliveryHandler(Handler):
         else:
             return None
         if isfile(resPath):
-            return open(resPath, 'rb'), os.path.getsize(resPath)
+            stat = os.stat(resPath)
+            return partial(self._openFile, resPath), stat.st_size, stat.st_mtime
 
     def _processZiplink(self, subPath, zipFilePath, inFilePath):
         '''
-        Reads a link description file and returns a file handler to
-        the linked file inside the ZIP archive.
+        Reads a link description file and returns the opener, size and
+        modification time of the linked file inside the ZIP archive.
         '''
         # make sure the ZIP file path uses the OS separator
         zipFilePath = normOSPath(zipFilePath)
         # convert the internal ZIP path to OS format in order to use standard path functions
         inFilePath = normOSPath(inFilePath)
-        zipFile = ZipFile(zipFilePath)
+        zipFile = self._zipCache.zipFor(zipFilePath)
         # resource internal ZIP path should be in ZIP format
         resPath = normZipPath(join(inFilePath, subPath))
         if resPath in zipFile.NameToInfo:
-            return zipFile.open(resPath, 'r'), zipFile.getinfo(resPath).file_size
+            return partial(self._openZip, zipFile, resPath), zipFile.getinfo(resPath).file_size, \
+                os.stat(zipFilePath).st_mtime
 
     def _isPathDeleted(self, path):
         '''
         Returns true if the given path was deleted or was part of a directory
         that was deleted.
         '''
-        path = normpath(path)
-        while len(path) > len(self.repositoryPath):
-            if isfile(path + '.deleted'): return True
-            subPath = dirname(path)
-            if subPath == path: break
-            path = subPath
+        return self._linkIndex.isDeleted(path)
+
+    def _openFile(self, path, offset=0, length=None):
+        '''
+        Opens the file system file for delivery.
+        '''
+        return FileBacked(open(path, 'rb'), offset, length)
+
+    def _openZip(self, zipFile, path, offset=0, length=None):
+        '''
+        Opens the file inside the ZIP archive for delivery.
+        '''
+        if length is None: return zipFile.open(path, 'r')
+        return StreamRange(zipFile.open(path, 'r'), offset, length)
+
+    def _isNotModified(self, decoder, etag, timestamp):
+        '''
+        Checks if the content is not modified based on the conditional headers.
+        '''
+        assert isinstance(decoder, IDecoderHeader), 'Invalid header decoder %s' % decoder
+        value = decoder.retrieve(self.nameIfNoneMatch)
+        if value is not None:
+            for tag in value.split(','):
+                tag = tag.strip()
+                if tag == '*' or tag == etag or tag == 'W/' + etag: return True
+            return False
+
+        value = decoder.retrieve(self.nameIfModifiedSince)
+        if value is not None:
+            since = self._parseDate(value)
+            return since is not None and timestamp <= since
         return False
+
+    def _rangeFor(self, decoder, etag, timestamp, size):
+        '''
+        Provides the requested bytes range, only single ranges are supported.
+        
+        @return: tuple(integer, integer)|None|boolean
+            The first and last byte positions, None if the full content needs to be delivered or False if the range
+            cannot be satisfied.
+        '''
+        assert isinstance(decoder, IDecoderHeader), 'Invalid header decoder %s' % decoder
+        value = decoder.retrieve(self.nameRange)
+        if not value: return None
+
+        condition = decoder.retrieve(self.nameIfRange)
+        if condition and condition.strip() != etag and self._parseDate(condition) != timestamp: return None
+
+        unit, _equal, ranges = value.partition('=')
+        if unit.strip().lower() != 'bytes' or ',' in ranges: return None
+        start, dash, end = ranges.partition('-')
+        if not dash: return None
+        try:
+            if start.strip():
+                start = int(start)
+                end = int(end) if end.strip() else size - 1
+            else:
+                start, end = max(size - int(end), 0), size - 1
+                if start > end: return False
+        except ValueError: return None
+        if start >= size: return False
+        if start > end: return None
+        return start, min(end, size - 1)
+
+    def _parseDate(self, value):
+        '''
+        Parses the HTTP date value into a time stamp.
+        '''
+        parsed = parsedate_tz(value)
+        if parsed is None: return None
+        try: return mktime_tz(parsed)
+        except (ValueError, OverflowError): return None
@@ -0,0 +1,224 @@
+'''
+Created on Oct 18, 2026
+
+@package: support cdm
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides the in memory indexes used for resolving the linked content of a local file system repository.
+'''
+
+from collections import OrderedDict
+from os.path import dirname, basename, normpath, join
+from weakref import WeakSet
+from zipfile import ZipFile
+import json
+import os
+import time
+
+# --------------------------------------------------------------------
+
+_indexes = WeakSet()
+# The link indexes that are notified about the repository changes.
+
+# --------------------------------------------------------------------
+
+class LinkIndex:
+    '''
+    Provides an in memory index for the link and deleted markers of a repository. The markers of a directory are
+    listed once and then kept until the directory modification time changes, the modification time is checked at most
+    once in the check interval. Only the existing directories are indexed and at most size directories are kept, the
+    least recently used being removed first. The changes made in this process are notified through
+    @see: invalidateLinks.
+    '''
+    __slots__ = ('repositoryPath', 'linkExt', 'deletedExt', 'checkInterval', 'size', '_dirs', '__weakref__')
+
+    def __init__(self, repositoryPath, linkExt='.link', deletedExt='.deleted', checkInterval=5, size=1000):
+        '''
+        Construct the link index.
+
+        @param repositoryPath: string
+            The repository path to index.
+        @param linkExt: string
+            The extension that marks the link files.
+        @param deletedExt: string
+            The extension that marks the deleted paths.
+        @param checkInterval: integer|float
+            The interval in seconds in which the directories are not checked for modifications.
+        @param size: integer
+            The maximum number of indexed directories.
+        '''
+        assert isinstance(repositoryPath, str), 'Invalid repository path %s' % repositoryPath
+        assert isinstance(linkExt, str), 'Invalid link extension %s' % linkExt
+        assert isinstance(deletedExt, str), 'Invalid deleted extension %s' % deletedExt
+        assert isinstance(checkInterval, (int, float)), 'Invalid check interval %s' % checkInterval
+        assert isinstance(size, int) and size > 0, 'Invalid size %s' % size
+        self.repositoryPath = normpath(repositoryPath)
+        self.linkExt = linkExt
+        self.deletedExt = deletedExt
+        self.checkInterval = checkInterval
+        self.size = size
+
+        self._dirs = OrderedDict()
+        _indexes.add(self)
+
+    def linksFor(self, path):
+        '''
+        Provides the links defined for the path.
+
+        @param path: string
+            The full path to provide the links for.
+        @return: list[list]|None
+            The links in the JSON format or None if there is no link file for the path.
+        '''
+        assert isinstance(path, str), 'Invalid path %s' % path
+        entry = self._entryFor(dirname(path))
+        linkName = basename(path)
+        if linkName not in entry[2]: return None
+
+        loaded = entry[2][linkName]
+        if loaded is None:
+            linkPath = path + self.linkExt
+            try:
+                mtime = os.stat(linkPath).st_mtime
+                with open(linkPath) as f: loaded = entry[2][linkName] = (mtime, json.load(f))
+            except (OSError, IOError): return None
+        return loaded[1]
+
+    def isDeleted(self, path):
+        '''
+        Checks if the path was deleted or is part of a directory that was deleted.
+
+        @param path: string
+            The full path to check.
+        @return: boolean
+            True if the path is marked as deleted, False otherwise.
+        '''
+        assert isinstance(path, str), 'Invalid path %s' % path
+        path = normpath(path)
+        while len(path) > len(self.repositoryPath):
+            subPath = dirname(path)
+            if basename(path) in self._entryFor(subPath)[3]: return True
+            if subPath == path: break
+            path = subPath
+        return False
+
+    def invalidate(self, path):
+        '''
+        Invalidates the indexed markers for the path, this includes the directory containing the path and all the
+        directories inside the path.
+
+        @param path: string
+            The full path that has been changed.
+        '''
+        assert isinstance(path, str), 'Invalid path %s' % path
+        path = normpath(path)
+        if not path.startswith(self.repositoryPath): return
+        self._dirs.pop(dirname(path), None)
+        prefix = join(path, '')
+        for dirPath in [dirPath for dirPath in self._dirs if dirPath == path or dirPath.startswith(prefix)]:
+            del self._dirs[dirPath]
+
+    # ----------------------------------------------------------------
+
+    def _entryFor(self, dirPath):
+        '''
+        Provides the index entry for the directory.
+
+        @return: list[float, float, dictionary{string: tuple(float, list)}, set(string)]
+            The check time, the directory modification time, the link names with the loaded links and the deleted names.
+        '''
+        now = time.time()
+        entry = self._dirs.get(dirPath)
+        if entry is not None:
+            self._dirs.move_to_end(dirPath)
+            if now < entry[0]: return entry
+
+        try: mtime = os.stat(dirPath).st_mtime
+        except OSError:
+            # The missing directories are not indexed since they can be provided by any requested path.
+            self._dirs.pop(dirPath, None)
+            return [now, None, {}, set()]
+
+        if entry is not None and entry[1] == mtime:
+            entry[0] = now + self.checkInterval
+            # The link files can be rewritten without changing the directory modification time.
+            for linkName, loaded in entry[2].items():
+                if loaded is None: continue
+                try:
+                    if os.stat(join(dirPath, linkName + self.linkExt)).st_mtime == loaded[0]: continue
+                except OSError: pass
+                entry[2][linkName] = None
+            return entry
+
+        links, deleted = {}, set()
+        lenLink, lenDeleted = len(self.linkExt), len(self.deletedExt)
+        try: names = os.listdir(dirPath)
+        except OSError: names = ()
+        for name in names:
+            if name.endswith(self.linkExt): links[name[:-lenLink]] = None
+            elif name.endswith(self.deletedExt): deleted.add(name[:-lenDeleted])
+        entry = self._dirs[dirPath] = [now + self.checkInterval, mtime, links, deleted]
+        while len(self._dirs) > self.size: self._dirs.popitem(last=False)
+        return entry
+
+class ZipCache:
+    '''
+    Provides a least recently used cache for the opened ZIP files, the ZIP files are identified by path and
+    modification time so a changed ZIP file is opened again.
+    '''
+    __slots__ = ('size', '_zips')
+
+    def __init__(self, size=20):
+        '''
+        Construct the ZIP cache.
+
+        @param size: integer
+            The maximum number of ZIP files kept opened.
+        '''
+        assert isinstance(size, int) and size > 0, 'Invalid size %s' % size
+        self.size = size
+
+        self._zips = OrderedDict()
+
+    def zipFor(self, path):
+        '''
+        Provides the ZIP file for the path.
+
+        @param path: string
+            The ZIP file path.
+        @return: ZipFile
+            The opened ZIP file.
+        '''
+        assert isinstance(path, str), 'Invalid path %s' % path
+        mtime = os.stat(path).st_mtime
+        cached = self._zips.get(path)
+        if cached is not None:
+            if cached[0] == mtime:
+                self._zips.move_to_end(path)
+                return cached[1]
+            del self._zips[path]
+            cached[1].close()
+
+        zipFile = ZipFile(path)
+        self._zips[path] = (mtime, zipFile)
+        while len(self._zips) > self.size: self._zips.popitem(last=False)[1][1].close()
+        return zipFile
+
+    def clear(self):
+        '''
+        Closes all the cached ZIP files.
+        '''
+        while self._zips: self._zips.popitem()[1][1].close()
+
+# --------------------------------------------------------------------
+
+def invalidateLinks(path):
+    '''
+    Notifies all the link indexes that the path has been changed.
+
+    @param path: string
+        The full path that has been changed.
+    '''
+    for index in list(_indexes): index.invalidate(path)
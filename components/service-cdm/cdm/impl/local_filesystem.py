@@ -11,6 +11,7 @@ Contains the Content Delivery Manager implementation for local file system
 
 from ally.container.ioc import injected
 from ally.zip.util_zip import ZIPSEP, normOSPath, normZipPath, getZipFilePath, validateInZipPath
+from cdm.impl.index import invalidateLinks
 from cdm.spec import ICDM, UnsupportedProtocol, PathNotFound
 from datetime import datetime
 from os.path import isdir, isfile, join, dirname, normpath, relpath, abspath
@@ -200,6 +201,7 @@ class LocalFileSystemCDM(ICDM):
             os.remove(itemPath)
         else:
             raise PathNotFound(path)
+        invalidateLinks(itemPath)
         assert log.debug('Success removing path %s', path) or True
 
     def getSupportedProtocols(self):
@@ -341,7 +343,9 @@ class LocalFileSystemLinkCDM(LocalFileSystemCDM):
         '''
         path, entryPath = self._validatePath(path)
         if isfile(entryPath.rstrip(os.sep)):
-            return os.remove(entryPath)
+            os.remove(entryPath)
+            invalidateLinks(entryPath)
+            return
 
         linkPath = entryPath
         repPathLen = len(self.delivery.getRepositoryPath())
@@ -369,6 +373,7 @@ class LocalFileSystemLinkCDM(LocalFileSystemCDM):
             raise PathNotFound(path)
         if len(subPath.strip(os.sep)) == 0 and isdir(linkPath):
             rmtree(linkPath)
+            invalidateLinks(linkPath)
 
     def getURI(self, path, protocol='http'):
         '''
@@ -426,6 +431,7 @@ class LocalFileSystemLinkCDM(LocalFileSystemCDM):
         with open(path.rstrip(os.sep) + self._deletedExt, 'w') as _d: pass
         if isdir(path):
             rmtree(path)
+        invalidateLinks(path)
 
     def _isValidFSLink(self, link, subPath):
         '''
@@ -513,6 +519,7 @@ class LocalFileSystemLinkCDM(LocalFileSystemCDM):
         else: links.insert(0, (self._zipHeader, zipFilePath, inFilePath))
 
         with open(repFilePath, 'w') as f: json.dump(links, f)
+        invalidateLinks(self._getItemPath(path))
 
     def _createLinkToFileOrDir(self, path, filePath):
         repFilePath = self._getItemPath(path) + self._linkExt
@@ -527,6 +534,7 @@ class LocalFileSystemLinkCDM(LocalFileSystemCDM):
         else: links.insert(0, (self._fsHeader, filePath))
 
         with open(repFilePath, 'w') as f: json.dump(links, f)
+        invalidateLinks(self._getItemPath(path))
 
     def _publishFromFile(self, path, filePath):
         assert isinstance(path, str) and len(path) > 0, 'Invalid content path %s' % path
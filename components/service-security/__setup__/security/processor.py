@@ -73,6 +73,14 @@ def cleanup_inactive_auth_timeout():
     ''' The number of seconds of inactivity of an authenticated access after which the cached access is cleared.'''
     return 60
 
+@ioc.config
+def access_filter_workers():
+    '''
+    The number of threads used for issuing together the filter checks of a request, if 0 the filter checks are issued
+    sequentially.
+    '''
+    return 4
+
 # --------------------------------------------------------------------
 # Creating the processors used in handling the request
 
@@ -105,6 +113,7 @@ def security() -> Handler:
     b.accessParameters = access_parameters()
     b.accessResponseEncoding = access_response_encoding()
     b.cleanupTimeout = cleanup_inactive_auth_timeout()
+    b.filterWorkers = access_filter_workers()
     return b
 
 # --------------------------------------------------------------------
@@ -18,6 +18,7 @@ from ally.http.spec.codes import PATH_NOT_FOUND
 from ally.http.spec.server import RequestHTTP, ResponseHTTP, ResponseContentHTTP, \
     IDecoderHeader, METHOD_GET, METHOD_OPTIONS
 from ally.support.util_io import IInputStream, writeGenerator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from io import BytesIO
 from sched import scheduler
@@ -34,6 +35,11 @@ log = logging.getLogger(__name__)
 
 # --------------------------------------------------------------------
 
+GROUPS_MAX = 99
+# The maximum number of groups in a combined patterns regex, the python regexes support at most 100 groups.
+
+# --------------------------------------------------------------------
+
 class Request(Context):
     '''
     The request context.
@@ -102,6 +108,9 @@ class SecurityHandler(Handler):
     # The access response encoding.
     cleanupTimeout = float
     # The number of seconds of inactivity after which a cached access is cleared.
+    filterWorkers = 4
+    # The number of threads used for issuing together the filter checks of a request, if 0 the filter checks are issued
+    # sequentially.
 
     def __init__(self):
         assert isinstance(self.requestAssembly, Assembly), 'Invalid request assembly %s' % self.requestAssembly
@@ -113,6 +122,7 @@ class SecurityHandler(Handler):
         assert isinstance(self.accessResponseEncoding, str), \
         'Invalid access response encoding %s' % self.accessResponseEncoding
         assert isinstance(self.cleanupTimeout, int), 'Invalid cleanup time out %s' % self.cleanupTimeout
+        assert isinstance(self.filterWorkers, int), 'Invalid filter workers %s' % self.filterWorkers
 
         requestProcessing = self.requestAssembly.create(NO_VALIDATION, request=Request, requestCnt=RequestContent,
                                                         response=Response, responseCnt=ResponseContent)
@@ -121,6 +131,8 @@ class SecurityHandler(Handler):
 
         self._requestProcessing = requestProcessing
         self._cache = Cache()
+        if self.filterWorkers: self._executor = ThreadPoolExecutor(self.filterWorkers)
+        else: self._executor = None
 
         self._authenticationTimeOut = timedelta(seconds=self.cleanupTimeout)
         schedule = scheduler(time.time, time.sleep)
@@ -191,25 +203,11 @@ class SecurityHandler(Handler):
         cacheMethod = cacheAuth.methods.get(request.methodName)
         if cacheMethod:
             assert isinstance(cacheMethod, CacheMethod)
-            for cachePattern in cacheMethod.patterns:
-                assert isinstance(cachePattern, CachePattern)
-                match = cachePattern.pattern.match(request.uri)
-                if match:
-                    found = True
-                    for k, resource in enumerate(match.groups()):
-                        try: cacheFilter = cachePattern.filters[k]
-                        except IndexError:
-                            raise Exception('Invalid filter at position %s in pattern %s' %
-                                            (k, cachePattern.pattern.pattern))
-                        assert isinstance(cacheFilter, CacheFilter)
-                        value = cacheFilter.accesses.get(resource)
-                        if value is None:
-                            uri = cacheFilter.uri.replace('*', resource)
-                            value = cacheFilter.accesses[resource] = self._isAllowed(request, uri)
-                            if not value: break
-                        elif not value: break
-                    else: forward = True
-                    break
+            assert isinstance(cacheMethod.matcher, PatternsMatcher), 'Invalid matcher %s' % cacheMethod.matcher
+            matched = cacheMethod.matcher.match(request.uri)
+            if matched:
+                found = True
+                forward = self._isAllowedAll(request, *matched)
 
         if not forward:
             if found:
@@ -250,6 +248,7 @@ class SecurityHandler(Handler):
                 if not cacheMethod: cacheMethod = cacheAuth.methods[method] = CacheMethod()
                 cacheMethod.patterns.append(CachePattern(pattern=pattern, filters=filters))
 
+        for cacheMethod in cacheAuth.methods.values(): cacheMethod.matcher = PatternsMatcher(cacheMethod.patterns)
         return cacheAuth
 
     def _access(self, authentication, request):
@@ -286,6 +285,37 @@ class SecurityHandler(Handler):
             source.seek(0)
         return json.load(codecs.getreader(self.accessResponseEncoding)(source))
 
+    def _isAllowedAll(self, request, cachePattern, resources):
+        '''
+        Checks if all the resources captured by the pattern are allowed by the pattern filters, the filter checks that are
+        not cached are issued together.
+        '''
+        assert isinstance(cachePattern, CachePattern), 'Invalid cache pattern %s' % cachePattern
+
+        checks = []
+        for k, resource in enumerate(resources):
+            try: cacheFilter = cachePattern.filters[k]
+            except IndexError:
+                raise Exception('Invalid filter at position %s in pattern %s' % (k, cachePattern.pattern.pattern))
+            assert isinstance(cacheFilter, CacheFilter)
+            value = cacheFilter.accesses.get(resource)
+            if value is None: checks.append((cacheFilter, resource))
+            elif not value: return False
+
+        if self._executor is None or len(checks) < 2:
+            for cacheFilter, resource in checks:
+                value = cacheFilter.accesses[resource] = self._isAllowed(request, cacheFilter.uri.replace('*', resource))
+                if not value: return False
+            return True
+
+        futures = [self._executor.submit(self._isAllowed, request, cacheFilter.uri.replace('*', resource))
+                   for cacheFilter, resource in checks]
+        allowed = True
+        for (cacheFilter, resource), future in zip(checks, futures):
+            value = cacheFilter.accesses[resource] = future.result()
+            if not value: allowed = False
+        return allowed
+
     def _isAllowed(self, request, uri):
         '''
         Retrieve the access for the authentication.
@@ -366,6 +396,10 @@ class CacheMethod(Bean):
     @rtype: list[CachePattern]
     The cached patterns.
     ''')
+    matcher = object; matcher = Attribute(matcher, doc='''
+    @rtype: PatternsMatcher
+    The matcher for the cached patterns.
+    ''')
 
 class CachePattern(Bean):
     '''
@@ -394,3 +428,70 @@ class CacheFilter(Bean):
     @rtype: dictionary{string: boolean}
     The cached accesses for the filter.
     ''')
+
+# --------------------------------------------------------------------
+
+class PatternsMatcher:
+    '''
+    Matches the cached patterns in one pass by combining the patterns regexes into alternation regexes, each pattern
+    regex is enclosed in a group that is the last closed group when the pattern matches, this way the matched pattern is
+    identified by the match last index. The patterns that use flags, named groups or back references are matched
+    separately.
+    '''
+    __slots__ = ('_matchers',)
+
+    def __init__(self, patterns):
+        '''
+        Construct the patterns matcher.
+        
+        @param patterns: list[CachePattern]
+            The cached patterns to match, in the order in which they are checked.
+        '''
+        assert isinstance(patterns, list), 'Invalid patterns %s' % patterns
+        self._matchers = []
+
+        combined, groups, count = [], {}, 0
+        for cachePattern in patterns:
+            assert isinstance(cachePattern, CachePattern), 'Invalid cache pattern %s' % cachePattern
+            regex = cachePattern.pattern
+            if regex.flags & ~re.UNICODE or regex.groupindex or regex.groups >= GROUPS_MAX or \
+            re.search(r'\\\d', regex.pattern):
+                self._combine(combined, groups)
+                combined, groups, count = [], {}, 0
+                self._matchers.append((regex, cachePattern))
+                continue
+
+            if count + regex.groups + 1 > GROUPS_MAX:
+                self._combine(combined, groups)
+                combined, groups, count = [], {}, 0
+            # The group enclosing the pattern regex is followed by the pattern regex groups.
+            groups[count + 1] = (cachePattern, count + 1, count + 1 + regex.groups)
+            combined.append(regex)
+            count += regex.groups + 1
+        self._combine(combined, groups)
+
+    def match(self, uri):
+        '''
+        Provides the first cached pattern that matches the URI.
+        
+        @param uri: string
+            The URI to match.
+        @return: tuple(CachePattern, tuple(string))|None
+            The matched cached pattern and the resources captured by the pattern, None if no pattern matches.
+        '''
+        for regex, groups in self._matchers:
+            match = regex.match(uri)
+            if match is None: continue
+            if isinstance(groups, CachePattern): return groups, match.groups()
+            cachePattern, start, end = groups[match.lastindex]
+            return cachePattern, match.groups()[start:end]
+
+    # ----------------------------------------------------------------
+
+    def _combine(self, regexes, groups):
+        '''
+        Adds the matcher for the combined regexes.
+        '''
+        if not regexes: return
+        if len(regexes) == 1: self._matchers.append((regexes[0], groups[1][0]))
+        else: self._matchers.append((re.compile('|'.join('(%s)' % regex.pattern for regex in regexes)), groups))
@@ -20,17 +20,26 @@ import warnings
 
 # --------------------------------------------------------------------
 
+MODULES_INDEX = 'modules.index'
+# The path of the modules index file used for finding the application modules.
+
+# --------------------------------------------------------------------
+
 def __deploy__():
     # Deploy the application
     try:
         import package_extender
         package_extender.PACKAGE_EXTENDER.addFreezedPackage('__deploy__.')
         from ally.container import aop, context
+        from ally.support.util_sys import useModulesIndex
     except ImportError:
         print('Corrupted or missing ally-utilites component, make sure that this component is not missing from python path '
               'or components eggs', file=sys.stderr)
         sys.exit(1)
 
+    # The modules index is used in order to avoid searching the modules in the python path on each start.
+    useModulesIndex(MODULES_INDEX)
+
     application = sys.modules['application'] = ModuleType('application')
     try:
         # We create the parser to be prepared.
@@ -0,0 +1,42 @@
+'''
+Created on Oct 18, 2026
+
+@package: Superdesk
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Benchmarks for the application and components, each benchmark is run as a module from the distribution folder, for
+instance:
+    python3 -m benchmarks.processor
+Importing this package adds to the python path the libraries, components and plugins of the distribution, or of the
+sources if the distribution is not built, and registers the package extender.
+'''
+
+import os
+import sys
+
+# --------------------------------------------------------------------
+
+DISTRIBUTION = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The distribution folder.
+SOURCES = os.path.dirname(DISTRIBUTION)
+# The sources folder, used if the distribution has no components.
+
+# --------------------------------------------------------------------
+
+for folder in (os.path.join(DISTRIBUTION, 'libraries'), os.path.join(DISTRIBUTION, 'components'),
+               os.path.join(DISTRIBUTION, 'plugins')):
+    if os.path.isdir(folder):
+        for name in os.listdir(folder):
+            path = os.path.join(folder, name)
+            if path not in sys.path: sys.path.append(path)
+
+if not os.path.isdir(os.path.join(DISTRIBUTION, 'components')):
+    for folder in (os.path.join(SOURCES, 'components'), os.path.join(SOURCES, 'plugins')):
+        if os.path.isdir(folder):
+            for name in os.listdir(folder):
+                path = os.path.join(folder, name)
+                if path not in sys.path: sys.path.append(path)
+
+import package_extender  # @UnusedImport
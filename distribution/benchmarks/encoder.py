@@ -0,0 +1,63 @@
+'''
+Created on Oct 18, 2026
+
+@package: Superdesk
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Benchmarks the encoding of the compact models against the encoding of the dictionary models.
+'''
+
+from ally.api.config import model
+from ally.api.type import typeFor, List
+from ally.container import ioc
+from ally.core.impl.processor.encoder import CreateEncoderHandler
+from ally.core.spec.resources import ConverterPath
+from ally.core.spec.transform.exploit import Resolve
+from ally.core.spec.transform.render import RenderToObject
+import timeit
+
+# --------------------------------------------------------------------
+
+MODELS = 10000
+# The number of encoded models.
+
+# --------------------------------------------------------------------
+
+@model(id='Key')
+class ModelKey:
+    Key = str
+
+@model(id='Id')
+class ModelId:
+    Id = int
+    Name = str
+    ModelKey = ModelKey
+
+@model(id='Id', compact=True)
+class ModelCompact:
+    Id = int
+    Name = str
+    ModelKey = ModelKey
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__':
+    transformer = CreateEncoderHandler()
+    ioc.initialize(transformer)
+    context = dict(render=RenderToObject(), converter=ConverterPath(), converterId=ConverterPath(),
+                   normalizer=ConverterPath())
+
+    times = []
+    for clazz in (ModelId, ModelCompact):
+        models = []
+        for k in range(MODELS):
+            model = clazz()
+            model.Id, model.Name, model.ModelKey = k, 'Name %s' % k, 'Key %s' % k
+            models.append(model)
+        encoder = transformer.encoderFor(typeFor(List(clazz)))
+        times.append(timeit.timeit(lambda: Resolve(encoder).request(value=models, **context).doAll(), number=1))
+
+    print('=' * 50, 'Encoding of %s models' % MODELS)
+    print('Dictionary models: %.3fs, compact models: %.3fs' % tuple(times))
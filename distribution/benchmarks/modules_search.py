@@ -0,0 +1,49 @@
+'''
+Created on Oct 18, 2026
+
+@package: Superdesk
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Benchmarks the modules search that is performed when the application is started, the search is timed without the
+modules index, with the index being created and with the index loaded from disk.
+'''
+
+from ally.support.util_sys import searchPaths, useModulesIndex
+from application import MODULES_INDEX
+from benchmarks import DISTRIBUTION
+import os
+import package_extender
+import timeit
+
+# --------------------------------------------------------------------
+
+PATTERNS = ('__deploy__.*.prepare', '__deploy__.*.deploy', '__setup__.**', '__plugin__.**')
+# The module patterns that are searched when the application is started.
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__':
+    os.chdir(DISTRIBUTION)
+    package_extender.PACKAGE_EXTENDER.addFreezedPackage('__deploy__.')
+
+    def search():
+        for pattern in PATTERNS: searchPaths(pattern)
+
+    pathIndex = MODULES_INDEX + '.benchmark'
+    if os.path.isfile(pathIndex): os.remove(pathIndex)
+    try:
+        useModulesIndex(None)
+        timeMemory = timeit.timeit(search, number=1)
+        # Only the first search is relevant since the next searches use the memory index.
+        useModulesIndex(pathIndex)
+        timeCreate = timeit.timeit(search, number=1)
+        useModulesIndex(pathIndex)
+        timeLoaded = timeit.timeit(search, number=1)
+    finally:
+        if os.path.isfile(pathIndex): os.remove(pathIndex)
+
+    print('=' * 50, 'Modules search for %s' % ', '.join(PATTERNS))
+    print('Without index: %.3fs, creating the index: %.3fs, with the index loaded from disk: %.3fs' %
+          (timeMemory, timeCreate, timeLoaded))
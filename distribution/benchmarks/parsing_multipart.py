@@ -0,0 +1,71 @@
+'''
+Created on Oct 18, 2026
+
+@package: Superdesk
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Benchmarks the streamed multi part content against the spooled multi part content.
+'''
+
+from ally.container import ioc
+from ally.core.http.impl.processor.parsing_multipart import DataMultiPart, \
+    StreamMultiPart, NextContent, RequestPopulate, RequestContentMultiPart
+from ally.core.impl.processor.parsing import Response
+from ally.design.context import Context, requires
+from ally.design.processor import Assembly, NO_MISSING_VALIDATION, \
+    HandlerProcessorProceed
+from io import BytesIO
+import timeit
+
+# --------------------------------------------------------------------
+
+SIZE = 10 * 1024 * 1024
+# The size of the multi part content.
+CHUNK = 64 * 1024
+# The size of the chunks read from the request stream.
+PARSES = 3
+# The number of multi part parses.
+
+# --------------------------------------------------------------------
+
+class StreamChunks:
+
+    def __init__(self, content, size):
+        self.content, self.size = BytesIO(content), size
+
+    def read(self, nbytes=None):
+        return self.content.read(min(self.size, nbytes) if nbytes is not None and nbytes >= 0 else self.size)
+
+class Request(Context):
+    headers = requires(dict)
+
+class HandlerHeaders(HandlerProcessorProceed):
+
+    def process(self, request:Request, **keyargs): pass
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__':
+    data = DataMultiPart()
+    ioc.initialize(data)
+    assembly = Assembly()
+    assembly.add(HandlerHeaders())
+    processing = assembly.create(NO_MISSING_VALIDATION, request=RequestPopulate, requestCnt=RequestContentMultiPart,
+                                 response=Response)
+    content = b''.join((b'--AaB03x\r\nContent-Type: image/png\r\n\r\n', b'x' * SIZE, b'\r\n--AaB03x--\r\n'))
+
+    def parse():
+        stream = StreamMultiPart(data, StreamChunks(content, CHUNK), 'AaB03x')
+        requestCnt = NextContent(processing.contexts['requestCnt'](), processing.contexts['response'](), processing,
+                                 data, stream)()
+        requestCnt.source.read()
+
+    data.spoolThreshold = 0
+    timeStream = timeit.timeit(parse, number=PARSES)
+    data.spoolThreshold = 1024 * 1024
+    timeSpool = timeit.timeit(parse, number=PARSES)
+
+    print('=' * 50, 'Multi part content of %sMB' % (SIZE // (1024 * 1024)))
+    print('Streamed: %.3fs, spooled: %.3fs, for %s parses' % (timeStream, timeSpool, PARSES))
@@ -0,0 +1,56 @@
+'''
+Created on Oct 18, 2026
+
+@package: Superdesk
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Benchmarks the compiled processing chains against the standard chains.
+'''
+
+from ally.design.context import Context, requires, defines
+from ally.design.processor import HandlerProcessorProceed, Assembly, Chain, \
+    ChainCompiled, COMPILED
+import timeit
+
+# --------------------------------------------------------------------
+
+PROCESSORS = 20
+# The number of increment processors in the chain.
+EXECUTIONS = 10000
+# The number of executions of the chain.
+
+# --------------------------------------------------------------------
+
+class Data(Context):
+    value = defines(int)
+
+class DataRequired(Context):
+    value = requires(int)
+
+class HandlerStart(HandlerProcessorProceed):
+
+    def process(self, data:Data, **keyargs):
+        data.value = 0
+
+class HandlerIncrement(HandlerProcessorProceed):
+
+    def process(self, data:DataRequired, **keyargs):
+        data.value += 1
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__':
+    assembly = Assembly()
+    assembly.add(HandlerStart(), *(HandlerIncrement() for _k in range(PROCESSORS)))
+    processing = assembly.create(COMPILED, data=Data)
+
+    def execute(chainClass):
+        chainClass(processing).process(data=processing.contexts['data']()).doAll()
+
+    timeChain = timeit.timeit(lambda: execute(Chain), number=EXECUTIONS)
+    timeCompiled = timeit.timeit(lambda: execute(ChainCompiled), number=EXECUTIONS)
+
+    print('=' * 50, 'Processing of %s processors' % (PROCESSORS + 1))
+    print('Chain.doAll: %.3fs, ChainCompiled.doAll: %.3fs, for %s executions' % (timeChain, timeCompiled, EXECUTIONS))
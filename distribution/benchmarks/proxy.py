@@ -0,0 +1,53 @@
+'''
+Created on Oct 18, 2026
+
+@package: Superdesk
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Benchmarks the compiled proxy calls against the proxy executions and the direct calls.
+'''
+
+from ally.container.binder import bindLock
+from ally.container.proxy import createProxy, ProxyWrapper, Execution
+from collections import deque
+from threading import RLock
+import timeit
+
+# --------------------------------------------------------------------
+
+CALLS = 10000
+# The number of calls.
+
+# --------------------------------------------------------------------
+
+class A:
+
+    def methodA(self):
+        return 'A.methodA'
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__':
+    AProxy = createProxy(A)
+
+    a = A()
+    proxy = AProxy(ProxyWrapper(a))
+    locked = AProxy(ProxyWrapper(a))
+    bindLock(locked, RLock())
+    assert isinstance(proxy, A)
+    assert isinstance(locked, A)
+
+    timeDirect = timeit.timeit(a.methodA, number=CALLS)
+    timeExecution = timeit.timeit(lambda: Execution(proxy.methodA, deque(proxy._proxy_handlers), (), {}).invoke(),
+                                  number=CALLS)
+    timeCompiled = timeit.timeit(proxy.methodA, number=CALLS)
+    timeExecutionLocked = timeit.timeit(lambda: Execution(locked.methodA, deque(locked._proxy_handlers), (),
+                                                          {}).invoke(), number=CALLS)
+    timeCompiledLocked = timeit.timeit(locked.methodA, number=CALLS)
+
+    print('=' * 50, 'Proxy calls')
+    print('Direct call: %.3fs, proxy execution: %.3fs, compiled proxy: %.3fs, locked proxy execution: %.3fs, '
+          'compiled locked proxy: %.3fs, for %s calls' % (timeDirect, timeExecution, timeCompiled, timeExecutionLocked,
+                                                          timeCompiledLocked, CALLS))
@@ -0,0 +1,126 @@
+'''
+Created on Oct 18, 2026
+
+@package: Superdesk
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Benchmarks the SQL alchemy query building with the cached query plans against the query building that resolves the
+mapped columns and criteria for every call, as it was done before the query plans.
+'''
+
+from ally.api.config import model, query
+from ally.api.criteria import AsLike, AsOrdered, AsBoolean, AsEqual, AsDate, \
+    AsTime, AsDateTime, AsRange, AsLikeOrdered, AsEqualOrdered, AsRangeOrdered
+from ally.support.api.util_service import namesForQuery, namesForModel
+from ally.support.sqlalchemy.descriptor import PropertyAttribute
+from ally.support.sqlalchemy.mapper import mapperModel
+from ally.support.sqlalchemy.util_service import buildQuery, _plans
+from itertools import chain
+from sqlalchemy.engine import create_engine
+from sqlalchemy.orm.session import sessionmaker
+from sqlalchemy.schema import MetaData, Table, Column
+from sqlalchemy.sql.expression import _Case
+from sqlalchemy.types import String, Integer, Boolean
+import timeit
+
+# --------------------------------------------------------------------
+
+CRITERIAS = 10
+# The number of criteria of each kind (like, equal, range) in the query.
+BUILDS = 1000
+# The number of query builds.
+
+# --------------------------------------------------------------------
+
+def buildQueryUncached(sqlQuery, query, mapped):
+    '''
+    The query building before the query plans, without the only and exclude options. The ordering is applied after
+    the criteria loop, as in the current query building, in order to produce the same query.
+    '''
+    clazz = query.__class__
+
+    columns, ordered, unordered = {}, [], []
+    for name in namesForModel(mapped):
+        cp, name = getattr(mapped, name), name.lower()
+        if name not in columns and isinstance(cp, (PropertyAttribute, _Case)): columns[name] = cp
+    columns = {criteria:columns.get(criteria.lower()) for criteria in namesForQuery(clazz)}
+
+    for criteria, column in columns.items():
+        if column is None or getattr(clazz, criteria) not in query: continue
+
+        crt = getattr(query, criteria)
+        if isinstance(crt, AsBoolean):
+            if AsBoolean.value in crt:
+                sqlQuery = sqlQuery.filter(column == crt.value)
+        elif isinstance(crt, AsLike):
+            if AsLike.like in crt: sqlQuery = sqlQuery.filter(column.like(crt.like))
+            elif AsLike.ilike in crt: sqlQuery = sqlQuery.filter(column.ilike(crt.ilike))
+        elif isinstance(crt, AsEqual):
+            if AsEqual.equal in crt:
+                sqlQuery = sqlQuery.filter(column == crt.equal)
+        elif isinstance(crt, (AsDate, AsTime, AsDateTime, AsRange)):
+            if crt.__class__.start in crt: sqlQuery = sqlQuery.filter(column >= crt.start)
+            elif crt.__class__.until in crt: sqlQuery = sqlQuery.filter(column < crt.until)
+            if crt.__class__.end in crt: sqlQuery = sqlQuery.filter(column <= crt.end)
+            elif crt.__class__.since in crt: sqlQuery = sqlQuery.filter(column > crt.since)
+
+        if isinstance(crt, AsOrdered):
+            if AsOrdered.ascending in crt:
+                if AsOrdered.priority in crt and crt.priority:
+                    ordered.append((column, crt.ascending, crt.priority))
+                else:
+                    unordered.append((column, crt.ascending, None))
+
+    ordered.sort(key=lambda pack: pack[2])
+    for column, asc, __ in chain(ordered, unordered):
+        if asc: sqlQuery = sqlQuery.order_by(column)
+        else: sqlQuery = sqlQuery.order_by(column.desc())
+
+    return sqlQuery
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__':
+    properties, criterias, columns = {'Id': int, 'Active': bool}, {'active': AsBoolean}, []
+    for k in range(CRITERIAS):
+        properties['Name%s' % k], criterias['name%s' % k] = str, AsLikeOrdered
+        properties['Code%s' % k], criterias['code%s' % k] = str, AsEqualOrdered
+        properties['Count%s' % k], criterias['count%s' % k] = int, AsRangeOrdered
+        columns.extend((Column('name%s' % k, String(255), key='Name%s' % k),
+                        Column('code%s' % k, String(255), key='Code%s' % k),
+                        Column('count%s' % k, Integer, key='Count%s' % k)))
+    properties['__module__'] = criterias['__module__'] = __name__
+
+    Item = model(id='Id')(type('Item', (), properties))
+    QItem = query(Item)(type('QItem', (), criterias))
+    meta = MetaData()
+    table = Table('item', meta, Column('id', Integer, primary_key=True, key='Id'),
+                  Column('active', Boolean, key='Active'), *columns)
+    ItemMapped = mapperModel(Item, table)
+
+    q = QItem(active=True)
+    for k in range(CRITERIAS):
+        getattr(q, 'name%s' % k).like = '%a'
+        getattr(q, 'name%s' % k).orderAsc()
+        getattr(q, 'code%s' % k).equal = 'X'
+        getattr(q, 'count%s' % k).start = 10
+        getattr(q, 'count%s' % k).orderDesc()
+        getattr(q, 'count%s' % k).priority = k + 1
+
+    session = sessionmaker(bind=create_engine('sqlite:///:memory:'))()
+    sqlQuery = session.query(ItemMapped)
+    assert str(buildQuery(sqlQuery, q, ItemMapped)) == str(buildQueryUncached(sqlQuery, q, ItemMapped))
+
+    def compiled():
+        _plans.clear()
+        buildQuery(sqlQuery, q, ItemMapped)
+
+    timeUncached = timeit.timeit(lambda: buildQueryUncached(sqlQuery, q, ItemMapped), number=BUILDS)
+    timeCompiled = timeit.timeit(compiled, number=BUILDS)
+    timeCached = timeit.timeit(lambda: buildQuery(sqlQuery, q, ItemMapped), number=BUILDS)
+
+    print('=' * 50, 'Query building for %s criteria' % len(criterias))
+    print('Without plans: %.3fs, compiling the plan: %.3fs, with the cached plan: %.3fs, for %s builds' %
+          (timeUncached, timeCompiled, timeCached, BUILDS))
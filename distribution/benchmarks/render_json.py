@@ -0,0 +1,42 @@
+'''
+Created on Oct 18, 2026
+
+@package: Superdesk
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Benchmarks the batched JSON renderer against the JSON renderer that writes to a stream writer.
+'''
+
+from ally.core.impl.processor.render.json import RenderJSON, RenderJSONBatched
+from ally.core.spec.transform.render import Object, List, Value, renderObject
+from codecs import getwriter
+from io import BytesIO
+import timeit
+
+# --------------------------------------------------------------------
+
+ITEMS = 10000
+# The number of items in the rendered list.
+RENDERS = 3
+# The number of renders.
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__':
+    items = (Object('User', Value('Id', str(k)), Value('Name', 'User ă "%s"' % k),
+                    attributes={'href': 'http://localhost/User/%s' % k}) for k in range(ITEMS))
+    obj = List('UserList', *items, attributes={'total': str(ITEMS)})
+
+    def renderStream():
+        renderObject(obj, RenderJSON(getwriter('utf-8')(BytesIO(), 'backslashreplace')))
+
+    def renderBatched():
+        renderObject(obj, RenderJSONBatched(BytesIO(), 'utf-8'))
+
+    timeStream = timeit.timeit(renderStream, number=RENDERS)
+    timeBatched = timeit.timeit(renderBatched, number=RENDERS)
+
+    print('=' * 50, 'JSON render of %s items' % ITEMS)
+    print('Stream writer render: %.3fs, batched render: %.3fs, for %s renders' % (timeStream, timeBatched, RENDERS))
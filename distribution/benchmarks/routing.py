@@ -0,0 +1,47 @@
+'''
+Created on Oct 18, 2026
+
+@package: Superdesk
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Benchmarks the resources routing with the routing index against the linear path finding.
+'''
+
+from ally.api.config import model
+from ally.api.type import typeFor, Input
+from ally.core.impl.node import NodeRoot, NodePath, NodeProperty
+from ally.core.spec.resources import ConverterPath
+from ally.support.core.util_resources import findPath, RoutingIndex
+import timeit
+
+# --------------------------------------------------------------------
+
+SERVICES = 300
+# The number of service nodes in the root node.
+LOOKUPS = 2000
+# The number of paths lookups.
+
+# --------------------------------------------------------------------
+
+@model(id='Id')
+class Item:
+    Id = int
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__':
+    root = NodeRoot()
+    for k in range(SERVICES): NodePath(root, True, 'Service%s' % k)
+    NodeProperty(NodePath(root, True, 'Item'), Input('id', typeFor(Item.Id)))
+    converterPath, elements = ConverterPath(), ['Item', '12']
+
+    routing, routingUncached = RoutingIndex(root, converterPath), RoutingIndex(root, converterPath, 0)
+    timeLinear = timeit.timeit(lambda: findPath(root, elements, converterPath), number=LOOKUPS)
+    timeIndexed = timeit.timeit(lambda: routingUncached.findPath(elements), number=LOOKUPS)
+    timeCached = timeit.timeit(lambda: routing.findPath(elements), number=LOOKUPS)
+
+    print('=' * 50, 'Path finding in %s service nodes' % SERVICES)
+    print('Linear: %.3fs, indexed: %.3fs, cached: %.3fs, for %s lookups' %
+          (timeLinear, timeIndexed, timeCached, LOOKUPS))
@@ -16,6 +16,7 @@ if True:
 
 # --------------------------------------------------------------------
 
+from ally.container import ioc
 from babel.messages.pofile import read_po
 from datetime import datetime
 from internationalization.api.message import IMessageService, Message
@@ -165,6 +166,7 @@ class TestHTTPDelivery(unittest.TestCase):
         poManager.sourceService = TestSourceService()
         poRepDir = TemporaryDirectory()
         poManager.locale_dir_path = poRepDir.name
+        ioc.initialize(poManager)
 
         # ********************************************
         # test updateGlobalPOFile
@@ -253,6 +255,28 @@ class TestHTTPDelivery(unittest.TestCase):
 #        pluginTestDict = poManager.getPluginAsDict('1', 'ro')
 #        print(pluginTestDict)
 
+    def testCachedDict(self):
+        poManager = POFileManager()
+        poManager.messageService = TestMessageService()
+        poManager.sourceService = sourceService = TestSourceService()
+        poRepDir = TemporaryDirectory()
+        poManager.locale_dir_path = poRepDir.name
+        ioc.initialize(poManager)
+
+        sources = []
+        getById = sourceService.getById
+        sourceService.getById = lambda id: sources.append(id) or getById(id)
+
+        componentDict = poManager.getComponentAsDict('1', 'ro')
+        self.assertEqual(sources, [1])
+        self.assertIs(poManager.getComponentAsDict('1', 'ro'), componentDict)
+        self.assertIsNot(poManager.getComponentAsDict('2', 'ro'), componentDict)
+        self.assertEqual(sources, [1, 2])
+
+        with open(join(self._poDir, 'component 1_ro.po')) as f: poManager.updateComponentPOFile('1', 'ro', f)
+        self.assertIsNot(poManager.getComponentAsDict('1', 'ro'), componentDict)
+        self.assertEqual(sorted(sources), [0, 1, 2, 10, 11, 12])
+
     def _checkHeader(self, testCat, witnessCat):
         self.assertEqual(testCat.domain, witnessCat.domain)
         self.assertEqual(testCat.locale, witnessCat.locale)
@@ -0,0 +1,100 @@
+'''
+Created on Oct 18, 2026
+
+@package: internationalization
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides unit testing for the messages bulk persistence.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.container import ioc
+from ally.exception import InputError
+from ally.support.sqlalchemy.session import beginWith, endCurrent, rollback
+from datetime import datetime
+from internationalization.impl.message_bulk import MessageBulkServiceAlchemy
+from internationalization.meta.file_hash import table as tableHash
+from internationalization.meta.message import Message
+from internationalization.meta.metadata_internationalization import meta
+from internationalization.meta.source import Source
+from sqlalchemy.engine import create_engine
+from sqlalchemy.orm.session import sessionmaker
+import unittest
+
+# --------------------------------------------------------------------
+
+class TestMessageBulk(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine('sqlite:///:memory:')
+        meta.create_all(engine)
+        beginWith(sessionmaker(bind=engine))
+        self.service = MessageBulkServiceAlchemy()
+        ioc.initialize(self.service)
+        self.session = self.service.session()
+
+        self.sources = []
+        for path, component in (('a.py', 'comp'), ('b.py', 'comp'), ('c.py', None)):
+            source = Source()
+            source.Component, source.Plugin = component, None if component else 'plug'
+            source.Path, source.Type, source.LastModified = path, 'python', datetime(2012, 1, 1)
+            self.session.add(source)
+            self.sources.append(source)
+        self.session.flush()
+
+    def tearDown(self):
+        endCurrent(rollback)
+
+    def messages(self, source):
+        return {msg.Singular: (msg.Plural, msg.Context, msg.LineNumber, msg.Comments)
+                for msg in self.session.query(Message).filter(Message.Source == source)}
+
+    def testPersist(self):
+        a, b = self.sources[0].Id, self.sources[1].Id
+        self.service.persistMessages(a, [('one', None, None, 1, ''), ('two', ['twos'], 'ctx', 2, 'note')])
+        self.service.persistMessages(b, [('one', None, None, 10, '')])
+        self.assertEqual(self.messages(a), {'one': (None, None, 1, ''), 'two': (['twos'], 'ctx', 2, 'note')})
+
+        self.service.persistMessages(a, [('two', ['twos', 'more'], None, 5, ''), ('three', None, None, 6, '')])
+        self.session.expire_all()
+        self.assertEqual(self.messages(a), {'one': (None, None, 1, ''), 'two': (['twos', 'more'], None, 5, ''),
+                                            'three': (None, None, 6, '')})
+        self.assertEqual(self.messages(b), {'one': (None, None, 10, '')})
+
+    def testValidation(self):
+        a = self.sources[0].Id
+        self.assertRaises(InputError, self.service.persistMessages, a, [('x', ['1', '2', '3', '4', '5'], None, 1, '')])
+        try: self.service.persistMessages(a, [('ok', None, None, 1, ''), ('x' * 256, None, None, 2, 'y' * 300)])
+        except InputError as e:
+            self.assertEqual([(ref.model, ref.property) for ref in e.message],
+                             [('Message', 'Singular'), ('Message', 'Comments')])
+        else: self.fail('Expected an input error')
+        self.assertEqual(self.messages(a), {})
+
+        self.service.persistMessages(a, [('x' * 255, None, None, 2, 'y' * 255)])
+        self.assertEqual(len(self.messages(a)), 1)
+
+    def testContentHashes(self):
+        a, b, c = (source.Id for source in self.sources)
+        self.assertEqual(self.service.getContentHashes(), {})
+
+        self.service.updateContentHashes({a: 'aaaa', c: 'cccc'})
+        self.assertEqual(self.service.getContentHashes(), {'a.py': 'aaaa', 'c.py': 'cccc'})
+        self.assertEqual(self.service.getContentHashes(component='comp'), {'a.py': 'aaaa'})
+        self.assertEqual(self.service.getContentHashes(plugin='plug'), {'c.py': 'cccc'})
+
+        self.service.updateContentHashes({a: 'a2', b: 'bbbb'})
+        self.assertEqual(self.service.getContentHashes(component='comp'), {'a.py': 'a2', 'b.py': 'bbbb'})
+        self.assertEqual(self.session.execute(tableHash.count()).scalar(), 3)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
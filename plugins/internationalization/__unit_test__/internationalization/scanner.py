@@ -0,0 +1,142 @@
+'''
+Created on Oct 18, 2026
+
+@package: internationalization
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Provides unit testing for the messages scanner.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from admin.introspection.api.component import IComponentService, Component
+from admin.introspection.api.plugin import IPluginService
+from ally.container import ioc
+from ally.support.sqlalchemy.session import beginWith, endCurrent, rollback
+from internationalization.impl.file import FileServiceAlchemy
+from internationalization.impl.message_bulk import MessageBulkServiceAlchemy
+from internationalization.impl.source import SourceServiceAlchemy
+from internationalization.meta.message import Message
+from internationalization.meta.metadata_internationalization import meta
+from internationalization.meta.source import Source
+from internationalization.scanner import Scanner, extractZip
+from os import path
+from sqlalchemy.engine import create_engine
+from sqlalchemy.orm.session import sessionmaker
+from tempfile import TemporaryDirectory
+from zipfile import ZipFile
+import os
+import unittest
+import zlib
+
+# --------------------------------------------------------------------
+
+class ComponentServiceEggs(IComponentService):
+
+    def __init__(self): self.components = []
+
+    def getById(self, id): raise NotImplementedError()
+
+    def getComponents(self, offset=None, limit=None, q=None): return self.components
+
+class PluginServiceEmpty(IPluginService):
+
+    def getById(self, id): raise NotImplementedError()
+
+    def getPlugins(self, offset=None, limit=None): return ()
+
+class MessageBulkServiceTrack(MessageBulkServiceAlchemy):
+
+    def __init__(self):
+        super().__init__()
+        self.persisted = []
+
+    def persistMessages(self, source, messages):
+        self.persisted.append(source)
+        super().persistMessages(source, messages)
+
+def egg(eggPath, mtime, **files):
+    with ZipFile(eggPath, 'w') as zipFile:
+        for name, content in files.items(): zipFile.writestr(name, content)
+    os.utime(eggPath, (mtime, mtime))
+
+# --------------------------------------------------------------------
+
+class TestScanner(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def testExtractZip(self):
+        eggPath = path.join(self.folder.name, 'a.egg')
+        content = b"_('hello')\nngettext('one', 'many', 2)\n"
+        egg(eggPath, 1e9, **{'pkg/a.py': content, 'pkg/b.js': b"_('world');", 'pkg/c.txt': b"_('none')"})
+
+        extracted = extractZip(eggPath, {})
+        self.assertEqual([(filePath, method) for filePath, method, _hash, _messages in extracted],
+                         [(eggPath + '/pkg/a.py', 'python'), (eggPath + '/pkg/b.js', 'javascript')])
+        filePath, _method, contentHash, messages = extracted[0]
+        self.assertEqual(contentHash, '%08x' % zlib.crc32(content))
+        self.assertEqual(messages, [('hello', None, None, 1, ''), ('one', ['many'], None, 2, '')])
+
+        # The files that have the same CRC as the previous scan are skipped.
+        extracted = extractZip(eggPath, {filePath: contentHash, eggPath + '/pkg/b.js': '00000000'})
+        self.assertEqual([filePath for filePath, _method, _hash, _messages in extracted], [eggPath + '/pkg/b.js'])
+
+    def testScanEggs(self):
+        engine = create_engine('sqlite:///%s' % path.join(self.folder.name, 'test.db'))
+        meta.create_all(engine)
+        beginWith(sessionmaker(bind=engine))
+        try:
+            componentService = ComponentServiceEggs()
+            for name in ('first', 'second'):
+                component = Component()
+                component.Id = component.Name = name
+                component.Path = path.join(self.folder.name, '%s.egg' % name)
+                component.InEgg = True
+                egg(component.Path, 1e9, **{'%s/a.py' % name: b"_('a %s')" % name.encode(),
+                                            '%s/b.py' % name: b"_('b %s')" % name.encode()})
+                componentService.components.append(component)
+
+            scanner = Scanner()
+            scanner.scan_processes = 2
+            scanner.componentService = componentService
+            scanner.pluginService = PluginServiceEmpty()
+            scanner.fileService = FileServiceAlchemy()
+            scanner.sourceService = SourceServiceAlchemy()
+            scanner.messageBulkService = MessageBulkServiceTrack()
+            for service in (scanner.fileService, scanner.sourceService, scanner.messageBulkService):
+                ioc.initialize(service)
+            ioc.initialize(scanner)
+
+            scanner.doAnalyze()
+            session = scanner.messageBulkService.session()
+            sources = {source.Id: source.Path[len(self.folder.name) + 1:] for source in session.query(Source)}
+            self.assertEqual(sorted(session.query(Message.Singular)),
+                             [('a first',), ('a second',), ('b first',), ('b second',)])
+            self.assertEqual(len(scanner.messageBulkService.persisted), 4)
+            self.assertEqual(len(scanner.messageBulkService.getContentHashes()), 4)
+
+            # Only the modified file of the modified egg is scanned again.
+            del scanner.messageBulkService.persisted[:]
+            egg(componentService.components[0].Path, 2e9, **{'first/a.py': b"_('a first')\n_('c first')",
+                                                             'first/b.py': b"_('b first')"})
+            scanner.doAnalyze()
+            self.assertEqual([sources[source] for source in scanner.messageBulkService.persisted], ['first.egg/first/a.py'])
+            self.assertEqual(sorted(session.query(Message.Singular)),
+                             [('a first',), ('a second',), ('b first',), ('b second',), ('c first',)])
+        finally: endCurrent(rollback)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -11,7 +11,9 @@ Implementation for the PO file management.
 
 from ally.container import wire
 from ally.container.ioc import injected
+from ally.api.type import typeFor
 from ally.container.support import setup
+from ally.support.api.util_service import addChangeListener
 from ally.support.util_io import IInputStream
 from babel import localedata, core
 from babel.core import Locale, UnknownLocaleError
@@ -22,14 +24,16 @@ from collections import Iterable
 from copy import copy
 from datetime import datetime
 from genericpath import isdir, isfile
+from internationalization.api.file import File
 from internationalization.api.message import IMessageService, Message
 from internationalization.api.source import ISourceService, QSource, \
-    TYPE_JAVA_SCRIPT
+    TYPE_JAVA_SCRIPT, Source
 from internationalization.core.spec import IPOFileManager, InvalidLocaleError
 from internationalization.support.babel.util_babel import msgId, isMsgTranslated, \
     copyTranslation, fixBabelCatalogAddBug
 from io import BytesIO
 from os.path import dirname, join
+from threading import Lock
 import os
 
 # --------------------------------------------------------------------
@@ -119,6 +123,13 @@ class POFileManager(IPOFileManager):
         if not isdir(self.locale_dir_path) or not os.access(self.locale_dir_path, os.W_OK):
             raise IOError('Unable to access the locale directory %s' % self.locale_dir_path)
 
+        self._models = {typeFor(clazz).container for clazz in (File, Source, Message)}
+        self._sourcesModified = {}
+        self._sourcesPath = {}
+        self._dicts = {}
+        self._lock = Lock()
+        addChangeListener(self._onChange)
+
     def getGlobalPOTimestamp(self, locale):
         '''
         @see: IPOFileManager.getGlobalPOTimestamp
@@ -163,9 +174,10 @@ class POFileManager(IPOFileManager):
         try: locale = Locale.parse(locale)
         except UnknownLocaleError: raise InvalidLocaleError(locale)
 
-        messages = self.messageService.getMessages(qs=QSource(type=TYPE_JAVA_SCRIPT))
-        catalog = self._build(locale, messages, self._filePath(locale))
-        return self._toDict('', catalog)
+        def build():
+            messages = self.messageService.getMessages(qs=QSource(type=TYPE_JAVA_SCRIPT))
+            return self._toDict('', self._build(locale, messages, self._filePath(locale)))
+        return self._cachedDict(build, locale)
 
     def getComponentPOFile(self, component, locale):
         '''
@@ -183,10 +195,12 @@ class POFileManager(IPOFileManager):
         '''
         try: locale = Locale.parse(locale)
         except UnknownLocaleError: raise InvalidLocaleError(locale)
-        messages = self.messageService.getComponentMessages(component, qs=QSource(type=TYPE_JAVA_SCRIPT))
-        catalog = self._build(locale, messages, self._filePath(locale, component=component),
-                              self._filePath(locale))
-        return self._toDict(component, catalog)
+        def build():
+            messages = self.messageService.getComponentMessages(component, qs=QSource(type=TYPE_JAVA_SCRIPT))
+            catalog = self._build(locale, messages, self._filePath(locale, component=component),
+                                  self._filePath(locale))
+            return self._toDict(component, catalog)
+        return self._cachedDict(build, locale, component=component)
 
     def getPluginPOFile(self, plugin, locale):
         '''
@@ -204,10 +218,12 @@ class POFileManager(IPOFileManager):
         '''
         try: locale = Locale.parse(locale)
         except UnknownLocaleError: raise InvalidLocaleError(locale)
-        messages = self.messageService.getPluginMessages(plugin, qs=QSource(type=TYPE_JAVA_SCRIPT))
-        catalog = self._build(locale, messages, self._filePath(locale, plugin=plugin),
-                              self._filePath(locale))
-        return self._toDict(plugin, catalog)
+        def build():
+            messages = self.messageService.getPluginMessages(plugin, qs=QSource(type=TYPE_JAVA_SCRIPT))
+            catalog = self._build(locale, messages, self._filePath(locale, plugin=plugin),
+                                  self._filePath(locale))
+            return self._toDict(plugin, catalog)
+        return self._cachedDict(build, locale, plugin=plugin)
 
     def updateGlobalPOFile(self, locale, poFile):
         '''
@@ -299,6 +315,29 @@ class POFileManager(IPOFileManager):
         assert isinstance(locale, Locale), 'Invalid locale %s' % locale
         assert not(component and plugin), 'Cannot process a component id %s and a plugin id %s' % (component, plugin)
 
+        lastModified = self._sourcesLastModified(component, plugin)
+        path = self._filePath(locale, component, plugin)
+        if isfile(path):
+            modified = datetime.fromtimestamp(os.stat(path).st_mtime)
+            if lastModified is None or lastModified < modified: lastModified = modified
+        return lastModified
+
+    def _sourcesLastModified(self, component=None, plugin=None):
+        '''
+        Provides the last modification of the sources for the component, plugin or global domain, the modifications
+        are cached until the sources or messages are changed.
+
+        @param component: string|None
+            The component id to get the last modification for.
+        @param plugin: string|None
+            The plugin id to get the last modification for.
+        @return: datetime|None
+            The last modification time stamp, None if there are no sources.
+        '''
+        key = (component, plugin)
+        with self._lock:
+            if key in self._sourcesModified: return self._sourcesModified[key]
+
         q = QSource()
         q.lastModified.orderDesc()
         if component: q.component = component
@@ -307,11 +346,76 @@ class POFileManager(IPOFileManager):
         try: lastModified = next(iter(sources)).LastModified
         except StopIteration: lastModified = None
 
-        path = self._filePath(locale, component, plugin)
-        if isfile(path):
-            lastModified = max(lastModified, datetime.fromtimestamp(os.stat(path).st_mtime))
+        with self._lock: self._sourcesModified[key] = lastModified
         return lastModified
 
+    def _sourcePaths(self, messages):
+        '''
+        Provides the source paths for the messages, the sources are loaded in bulk and the paths are kept since a source
+        path never changes for a source id.
+
+        @param messages: list[Message]
+            The messages to provide the source paths for.
+        @return: dictionary{integer: string}
+            The source paths indexed by source id.
+        '''
+        assert isinstance(messages, list), 'Invalid messages %s' % messages
+        with self._lock: paths = dict(self._sourcesPath)
+
+        missing = {msg.Source for msg in messages if msg.Source not in paths}
+        if missing:
+            for src in self.sourceService.getAll():
+                assert isinstance(src, Source), 'Invalid source %s' % src
+                if src.Id is not None: paths[src.Id] = src.Path
+            # The sources that are not provided by the bulk load are fetched one by one.
+            for srcId in missing.difference(paths): paths[srcId] = self.sourceService.getById(srcId).Path
+            with self._lock: self._sourcesPath.update(paths)
+        return paths
+
+    def _cachedDict(self, build, locale, component=None, plugin=None):
+        '''
+        Provides the cached dictionary for the domain and locale, the dictionary is rebuilt only if the domain sources or
+        the PO files used for the dictionary have been modified.
+
+        @param build: callable()
+            The call used for building the dictionary.
+        @param locale: Locale
+            The locale of the dictionary.
+        @param component: string|None
+            The component id of the dictionary.
+        @param plugin: string|None
+            The plugin id of the dictionary.
+        @return: dictionary
+            The dictionary, @see: IPOFileManager.getGlobalAsDict
+        '''
+        assert callable(build), 'Invalid build %s' % build
+        assert isinstance(locale, Locale), 'Invalid locale %s' % locale
+
+        paths = [self._filePath(locale, component, plugin)]
+        if component or plugin: paths.append(self._filePath(locale))
+        stamp = (self._sourcesLastModified(component, plugin),) + \
+                tuple(os.stat(path).st_mtime if isfile(path) else None for path in paths)
+
+        key = (component, plugin, str(locale))
+        with self._lock: cached = self._dicts.get(key)
+        if cached and cached[0] == stamp: return cached[1]
+
+        d = build()
+        with self._lock: self._dicts[key] = (stamp, d)
+        return d
+
+    def _onChange(self, model):
+        '''
+        Called whenever a model is changed, used in order to invalidate the cached sources modifications and dictionaries.
+        A message change does not alter the sources modification so the dictionaries are also invalidated. The change
+        notifications are provided only for the changes made in this process, the other server worker processes rely on
+        the sources and PO files modification stamps.
+        '''
+        if model in self._models:
+            with self._lock:
+                self._sourcesModified.clear()
+                self._dicts.clear()
+
     def _processCatalog(self, catalog, messages, fallBack=None):
         '''
         Processes a catalog based on the given messages list. Basically the catalog will be made in sync with the list of
@@ -331,10 +435,11 @@ class POFileManager(IPOFileManager):
 
         for msg in catalog: msg.locations = []
 
+        messages = list(messages)
+        paths = self._sourcePaths(messages)
         for msg in messages:
             assert isinstance(msg, Message)
             id = msg.Singular if not msg.Plural else (msg.Singular,) + tuple(msg.Plural)
-            src = self.sourceService.getById(msg.Source)
             context = msg.Context if msg.Context != '' else None
             msgC = catalog.get(msg.Singular, context)
             if msgC is None and fallBack is not None:
@@ -345,7 +450,7 @@ class POFileManager(IPOFileManager):
                     catalog[msg.Singular] = msgC
             msgCOrig = copy(msgC)
             catalog.add(id, context=msg.Context if msg.Context != '' else None,
-                        locations=((src.Path, msg.LineNumber),),
+                        locations=((paths[msg.Source], msg.LineNumber),),
                         user_comments=(msg.Comments if msg.Comments else '',))
             if msgC: fixBabelCatalogAddBug(msgC, catalog.num_plurals)
             if msg.Plural and msgC and msgCOrig and isinstance(msgCOrig.string, str) and msgCOrig.string != '':
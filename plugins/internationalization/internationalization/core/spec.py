@@ -6,7 +6,7 @@ Created on Mar 13, 2012
 @license: http://www.gnu.org/licenses/gpl-3.0.txt
 @author: Mugur Rus
 
-API specifications for PO file management.
+API specifications for PO file management and messages bulk persistence.
 '''
 
 import abc
@@ -196,3 +196,45 @@ class IPOFileManager(metaclass=abc.ABCMeta):
         @param poFile: text file like object
             The source PO file from which to read the translation.
         '''
+
+# --------------------------------------------------------------------
+
+class IMessageBulkService(metaclass=abc.ABCMeta):
+    '''
+    The bulk persistence for the scanned messages, used in order to avoid persisting each message with a service call.
+    '''
+
+    @abc.abstractmethod
+    def getContentHashes(self, component=None, plugin=None):
+        '''
+        Provides the content hashes of the scanned files for the given component or plugin.
+
+        @param component: string|None
+            The component id to provide the hashes for.
+        @param plugin: string|None
+            The plugin id to provide the hashes for.
+        @return: dictionary{string: string}
+            The content hashes indexed by file path, the files that have no content hash are not provided.
+        '''
+
+    @abc.abstractmethod
+    def updateContentHashes(self, hashes):
+        '''
+        Updates the content hashes of the scanned files.
+
+        @param hashes: dictionary{integer: string}
+            The content hashes indexed by file id.
+        '''
+
+    @abc.abstractmethod
+    def persistMessages(self, source, messages):
+        '''
+        Persists the messages for the source, the messages that are already in the source (identified by the singular
+        form) are updated and the rest are inserted.
+
+        @param source: integer
+            The source id to persist the messages for.
+        @param messages: list[tuple(string, list[string]|None, string|None, integer, string)]
+            The messages to persist as tuples of (singular, plurals, context, line number, comments).
+        @raise InputError: if a message has more plural forms or longer values then the persistence allows.
+        '''
@@ -0,0 +1,124 @@
+'''
+Created on Oct 18, 2026
+
+@package: internationalization
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Implementation for the messages bulk persistence.
+'''
+
+from ..api.message import Message as MessageModel
+from ..core.spec import IMessageBulkService
+from ..meta.file import File
+from ..meta.file_hash import table as tableHash
+from ..meta.message import Message
+from ally.container.ioc import injected
+from ally.container.support import setup
+from ally.exception import InputError, Ref
+from ally.internationalization import _
+from ally.support.sqlalchemy.mapper import tableFor
+from ally.support.sqlalchemy.session import SessionSupport, notifyChangeOnCommit
+from sqlalchemy.sql.expression import select, bindparam
+
+# --------------------------------------------------------------------
+
+PLURALS_MAX = 4
+# The maximum number of plural forms that can be persisted for a message.
+
+# --------------------------------------------------------------------
+
+@injected
+@setup(IMessageBulkService, name='messageBulkService')
+class MessageBulkServiceAlchemy(SessionSupport, IMessageBulkService):
+    '''
+    Alchemy implementation for @see: IMessageBulkService, the messages are persisted using executemany statements.
+    '''
+
+    def getContentHashes(self, component=None, plugin=None):
+        '''
+        @see: IMessageBulkService.getContentHashes
+        '''
+        table = tableFor(File)
+        sql = select([table.c.Path, tableHash.c.contentHash]).where(tableHash.c.Id == table.c.Id)
+        if component: sql = sql.where(table.c.Component == component)
+        if plugin: sql = sql.where(table.c.Plugin == plugin)
+        return dict(self.session().execute(sql).fetchall())
+
+    def updateContentHashes(self, hashes):
+        '''
+        @see: IMessageBulkService.updateContentHashes
+        '''
+        assert isinstance(hashes, dict), 'Invalid hashes %s' % hashes
+        if not hashes: return
+        session = self.session()
+        session.execute(tableHash.delete().where(tableHash.c.Id.in_(list(hashes))))
+        session.execute(tableHash.insert(), [dict(Id=fileId, contentHash=hash) for fileId, hash in hashes.items()])
+
+    def persistMessages(self, source, messages):
+        '''
+        @see: IMessageBulkService.persistMessages
+        '''
+        assert isinstance(source, int), 'Invalid source id %s' % source
+        assert isinstance(messages, list), 'Invalid messages %s' % messages
+        if not messages: return
+        table = tableFor(Message)
+
+        sql = select([table.c.Singular, table.c.Id]).where(table.c.Source == source)
+        existing = dict(self.session().execute(sql).fetchall())
+
+        inserts, updates, errors = {}, {}, []
+        for singular, plurals, context, lineNumber, comments in messages:
+            if plurals and len(plurals) > PLURALS_MAX:
+                raise InputError(Ref(_('Only a maximum of four plural forms is accepted, got %(nplurals)i') %
+                                     dict(nplurals=len(plurals))))
+            # The model validations are not triggered for bulk statements so the lengths are validated here.
+            validateLength(singular, table.c.Singular, MessageModel.Singular, errors)
+            if plurals:
+                for plural in plurals: validateLength(plural, table.c.plural1, MessageModel.Plural, errors)
+            validateLength(context, table.c.Context, MessageModel.Context, errors)
+            validateLength(comments, table.c.Comments, MessageModel.Comments, errors)
+            if errors: raise InputError(*errors)
+
+            values = dict(Context=context, LineNumber=lineNumber, Comments=comments)
+            for k in range(PLURALS_MAX): values['plural%s' % (k + 1)] = plurals[k] if plurals and k < len(plurals) else None
+
+            msgId = existing.get(singular)
+            if msgId is None:
+                values['Source'], values['Singular'] = source, singular
+                inserts[singular] = values
+            else:
+                values['msgId'] = msgId
+                updates[singular] = values
+
+        if inserts: self.session().execute(table.insert(), list(inserts.values()))
+        if updates:
+            # The updated columns are provided by the parameters keys.
+            self.session().execute(table.update().where(table.c.Id == bindparam('msgId')), list(updates.values()))
+        notifyChangeOnCommit(self.session(), MessageModel)
+
+# --------------------------------------------------------------------
+
+def validateLength(value, column, ref, errors):
+    '''
+    Validates the value length against the column length, the same validation as the one provided by the service
+    validations @see: ally.container.binder_op.onPropertyMaxLength.
+
+    @param value: string|None
+        The value to validate.
+    @param column: Column
+        The column that will persist the value.
+    @param ref: TypeModelProperty
+        The model property to reference in the error.
+    @param errors: list[Ref]
+        The list of errors.
+    @return: boolean
+        True if the value is valid, False otherwise.
+    '''
+    assert isinstance(errors, list), 'Invalid errors list %s' % errors
+    length = getattr(column.type, 'length', None)
+    if value is None or length is None or len(value) <= length: return True
+    errors.append(Ref(_('Maximum length allowed is %(maximum)i but got length %(provided)i') %
+                      {'maximum':length, 'provided':len(value)}, ref=ref))
+    return False
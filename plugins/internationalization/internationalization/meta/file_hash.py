@@ -0,0 +1,24 @@
+'''
+Created on Oct 18, 2026
+
+@package: internationalization
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: agent
+
+Contains the SQL alchemy meta for the scanned files content hashes.
+'''
+
+from .file import File
+from .metadata_internationalization import meta
+from sqlalchemy.schema import Table, Column, ForeignKey
+from sqlalchemy.types import String
+
+# --------------------------------------------------------------------
+
+# The content hashes are kept in a separate table so the tables created by previous versions remain valid.
+table = Table('inter_file_hash', meta,
+              Column('fk_file_id', ForeignKey(File.Id, ondelete='CASCADE'), primary_key=True, key='Id'),
+              Column('content_hash', String(40), nullable=False, key='contentHash'),
+              mysql_engine='InnoDB'
+              )
@@ -17,13 +17,14 @@ from ally.container.support import setup
 from babel.messages.extract import extract_nothing, extract_python, \
     _strip_comment_tags, empty_msgid_warning, extract_javascript
 from babel.util import pathmatch
+from concurrent.futures import ProcessPoolExecutor, Future
 from datetime import datetime
 from distribution.support import IAnalyzer
 from functools import partial
 from internationalization.api.file import IFileService, QFile, File
-from internationalization.api.message import IMessageService, Message
 from internationalization.api.source import ISourceService, TYPES, Source, \
     QSource
+from internationalization.core.spec import IMessageBulkService
 from io import BytesIO, TextIOWrapper
 from os import path
 from zipfile import ZipFile
@@ -66,36 +67,44 @@ class Scanner(IAnalyzer):
     The class that provides the scanner.
     '''
 
+    scan_processes = 0; wire.config('scan_processes', doc='''
+    The number of processes used for scanning the component and plugin eggs, 0 means a process for each CPU and 1 means
+    that the eggs are scanned in the application process.
+    ''')
     componentService = IComponentService; wire.entity('componentService')
     pluginService = IPluginService; wire.entity('pluginService')
     fileService = IFileService; wire.entity('fileService')
     sourceService = ISourceService; wire.entity('sourceService')
-    messageService = IMessageService; wire.entity('messageService')
+    messageBulkService = IMessageBulkService; wire.entity('messageBulkService')
 
     def __init__(self):
         '''
         Construct the scanner.
         '''
+        assert isinstance(self.scan_processes, int) and self.scan_processes >= 0, \
+        'Invalid scan processes %s' % self.scan_processes
         assert isinstance(self.componentService, IComponentService), \
         'Invalid component service %s' % self.componentService
         assert isinstance(self.pluginService, IPluginService), 'Invalid plugin service %s' % self.pluginService
         assert isinstance(self.fileService, IFileService), 'Invalid file service %s' % self.fileService
         assert isinstance(self.sourceService, ISourceService), 'Invalid source service %s' % self.sourceService
-        assert isinstance(self.messageService, IMessageService), 'Invalid message service %s' % self.messageService
-        
+        assert isinstance(self.messageBulkService, IMessageBulkService), \
+        'Invalid message bulk service %s' % self.messageBulkService
+
     def doAnalyze(self):
         '''
         @see: IAnalyzer.doAnalyze
         '''
         self.scanComponents()
         self.scanPlugins()
-        
+
     # ----------------------------------------------------------------
 
     def scanComponents(self):
         '''
         Scan the current application components for the localized text messages.
         '''
+        eggs = []
         for component in self.componentService.getComponents():
             assert isinstance(component, Component)
             files = {file.Path: file for file in self.fileService.getAll(q=QFile(component=component.Id))}
@@ -115,17 +124,17 @@ class Scanner(IAnalyzer):
                 else:
                     file.LastModified = lastModified
                     self.fileService.update(file)
-                scanner = scanZip(component.Path)
-            else:
-                lastModified, scanner = None, scanFolder(component.Path)
 
             files.update({source.Path: source for source in self.sourceService.getAll(q=QSource(component=component.Id))})
-            self._persist(files, scanner, component.Path, lastModified, component.Id, None)
+            if component.InEgg: eggs.append((files, component.Path, lastModified, component.Id, None))
+            else: self._persist(files, self._scanFolder(files, component.Path), component.Id, None)
+        self._scanEggs(eggs)
 
     def scanPlugins(self):
         '''
         Scan the current application plugins for the localized text messages.
         '''
+        eggs = []
         for plugin in self.pluginService.getPlugins():
             assert isinstance(plugin, Plugin)
             files = {file.Path: file for file in self.fileService.getAll(q=QFile(plugin=plugin.Id))}
@@ -145,80 +154,77 @@ class Scanner(IAnalyzer):
                 else:
                     file.LastModified = lastModified
                     self.fileService.update(file)
-                scanner = scanZip(plugin.Path)
-            else:
-                lastModified, scanner = None, scanFolder(plugin.Path)
-
 
             files.update({source.Path: source for source in self.sourceService.getAll(q=QSource(plugin=plugin.Id))})
-            self._persist(files, scanner, plugin.Path, lastModified, None, plugin.Id)
+            if plugin.InEgg: eggs.append((files, plugin.Path, lastModified, None, plugin.Id))
+            else: self._persist(files, self._scanFolder(files, plugin.Path), None, plugin.Id)
+        self._scanEggs(eggs)
 
     # ----------------------------------------------------------------
 
-    def _persist(self, files, scanner, path, lastModified, componentId, pluginId):
+    def _scanEggs(self, eggs):
+        '''
+        Scans the modified eggs, the eggs are independent so they are scanned in parallel processes and only the egg files
+        that have a different content hash then the one of the last scan are extracted.
+        '''
+        assert isinstance(eggs, list), 'Invalid eggs %s' % eggs
+        hashes = [self.messageBulkService.getContentHashes(componentId, pluginId)
+                  for _files, _path, _lastModified, componentId, pluginId in eggs]
+
+        if self.scan_processes == 1 or len(eggs) <= 1:
+            extracted = [extractZip(path, hashesEgg) for (_files, path, *_rest), hashesEgg in zip(eggs, hashes)]
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(self.scan_processes or None)
+            extracted = [executor.submit(extractZip, path, hashesEgg)
+                         for (_files, path, *_rest), hashesEgg in zip(eggs, hashes)]
+        try:
+            for (files, _path, lastModified, componentId, pluginId), scanned in zip(eggs, extracted):
+                if isinstance(scanned, Future): scanned = scanned.result()
+                scanned = ((filePath, method, contentHash, lastModified, messages)
+                           for filePath, method, contentHash, messages in scanned)
+                self._persist(files, scanned, componentId, pluginId)
+        finally:
+            if executor: executor.shutdown()
+
+    def _scanFolder(self, files, folderPath):
+        '''
+        Scans the folder files that have been modified since the last scan.
+        '''
+        assert isinstance(files, dict), 'Invalid files %s' % files
+        for filePath, method, contentHash, extractor in scanFolder(folderPath):
+            lastModified = modificationTimeFor(filePath)
+            file = files.get(filePath)
+            if file:
+                assert isinstance(file, File)
+                if lastModified <= file.LastModified:
+                    log.info('No modifications for file "%s"', filePath)
+                    continue
+                file.LastModified = lastModified
+                self.fileService.update(file)
+            yield filePath, method, contentHash, lastModified, messagesFrom(filePath, extractor)
+
+    def _persist(self, files, scanned, componentId, pluginId):
         '''
-        Persist the sources and messages. 
+        Persist the sources and messages, the messages of a source are persisted in bulk.
         '''
         assert isinstance(files, dict), 'Invalid files %s' % files
-        processModified = lastModified is None
-        for filePath, method, extractor in scanner:
+        hashes = {}
+        for filePath, method, contentHash, lastModified, messages in scanned:
             assert method in TYPES, 'Invalid method %s' % method
 
             file = files.get(filePath)
-            if processModified:
-                lastModified = modificationTimeFor(filePath)
-                if file:
-                    assert isinstance(file, File)
-                    if lastModified <= file.LastModified:
-                        log.info('No modifications for file "%s"', filePath)
-                        continue
-                    file.LastModified = lastModified
-                    self.fileService.update(file)
-
-            if isinstance(file, Source): source = file
-            else: source = None
-            messages = None
-            try:
-                for text, context, lineno, comments in extractor:
-                    if not source:
-                        if file: self.fileService.delete(file.Id)
-                        source = Source()
-                        source.Component = componentId
-                        source.Plugin = pluginId
-                        source.Path = filePath
-                        source.Type = method
-                        source.LastModified = lastModified
-                        files[filePath] = source
-                        self.sourceService.insert(source)
-
-                    if messages is None: messages = {msg.Singular:msg for msg in self.messageService.getMessages(source.Id)}
-
-                    if isinstance(text, str): singular, plurals = text, None
-                    elif len(text) == 1: singular, plurals = text[0], None
-                    else: singular, plurals = text[0], list(text[1:])
-
-                    msg = messages.get(singular)
-                    if not msg:
-                        msg = Message()
-                        msg.Source = source.Id
-                        msg.Singular = singular
-                        msg.Plural = plurals
-                        msg.Context = context
-                        msg.LineNumber = lineno
-                        msg.Comments = '\n'.join(comments)
-
-                        self.messageService.insert(msg)
-                        messages[singular] = msg
-                    else:
-                        msg.Plural = plurals
-                        msg.Context = context
-                        msg.LineNumber = lineno
-                        msg.Comments = '\n'.join(comments)
-                        self.messageService.update(msg)
-            except UnicodeDecodeError as e:
-                log.error('%s: %s' % (filePath, str(e)))
-
-            if processModified and filePath not in files:
+            if messages and not isinstance(file, Source):
+                if file: self.fileService.delete(file.Id)
+                file = Source()
+                file.Component = componentId
+                file.Plugin = pluginId
+                file.Path = filePath
+                file.Type = method
+                file.LastModified = lastModified
+                files[filePath] = file
+                self.sourceService.insert(file)
+            elif not file:
                 file = File()
                 file.Component = componentId
                 file.Plugin = pluginId
@@ -227,31 +233,81 @@ class Scanner(IAnalyzer):
                 files[filePath] = file
                 self.fileService.insert(file)
 
+            if messages: self.messageBulkService.persistMessages(file.Id, messages)
+            if contentHash is not None: hashes[file.Id] = contentHash
+
+        self.messageBulkService.updateContentHashes(hashes)
+
 # --------------------------------------------------------------------
 
 modificationTimeFor = lambda path: datetime.fromtimestamp(os.stat(path).st_mtime).replace(microsecond=0)
 # Provides the last update time for the provided full path.
 
-def scanZip(zipFilePath):
+def extractZip(zipFilePath, hashes):
+    '''
+    Extracts the messages of the zip that is found on the provided path, this function is also used in the scanning
+    processes so it only deals with the zip content.
+
+    @param zipFilePath: string
+        The zip path.
+    @param hashes: dictionary{string: string}
+        The content hashes indexed by file path of the files that have already been scanned, the files that have the same
+        content hash are skipped.
+    @return: list[tuple(string, string, string, list[tuple])]
+        Returns a list of tuples containing: (filePath, method, contentHash, messages(@see: messagesFrom))
+    '''
+    return [(filePath, method, contentHash, messagesFrom(filePath, extractor))
+            for filePath, method, contentHash, extractor in scanZip(zipFilePath, hashes)]
+
+def messagesFrom(filePath, extractor):
+    '''
+    Provides the messages of the extractor in the form used for the bulk persistence.
+
+    @param filePath: string
+        The path of the file that is extracted, used for reporting.
+    @param extractor: Iterable(tuple)
+        The extractor, @see: process.
+    @return: list[tuple(string, list[string]|None, string|None, integer, string)]
+        Returns a list of tuples containing: (singular, plurals, context, lineno, comments)
+    '''
+    messages = []
+    try:
+        for text, context, lineno, comments in extractor:
+            if isinstance(text, str): singular, plurals = text, None
+            elif len(text) == 1: singular, plurals = text[0], None
+            else: singular, plurals = text[0], list(text[1:])
+            messages.append((singular, plurals, context, lineno, '\n'.join(comments)))
+    except UnicodeDecodeError as e:
+        log.error('%s: %s' % (filePath, str(e)))
+    return messages
+
+def scanZip(zipFilePath, hashes=None):
     '''
     Scan a zip that is found on the provided path.
     
     @param zipFilePath: string
         The zip path.
-    @return: tuple(string, string, generator)
-        Returns a tuple containing: (filePath, method, generator(@see: process))
+    @param hashes: dictionary{string: string}|None
+        The content hashes indexed by file path of the files to be skipped if the content hash is the same.
+    @return: tuple(string, string, string, generator)
+        Returns a tuple containing: (filePath, method, contentHash, generator(@see: process))
     '''
     zipFile = ZipFile(zipFilePath)
-    names = zipFile.namelist()
-    names.sort()
-    for name in names:
+    infos = zipFile.infolist()
+    infos.sort(key=lambda info: info.filename)
+    for info in infos:
         for pattern, method in METHOD_MAP:
-            if pathmatch(pattern, name):
-                filePath = zipFilePath + '/' + name
-                def openZip():
+            if pathmatch(pattern, info.filename):
+                filePath = zipFilePath + '/' + info.filename
+                # The CRC is already provided by the zip so there is no need to read the content for hashing
+                contentHash = '%08x' % info.CRC
+                if hashes and hashes.get(filePath) == contentHash:
+                    assert log.debug('No modifications for file "%s"', filePath) or True
+                    break
+                def openZip(name=info.filename):
                     with zipFile.open(name, 'r') as f:
                         return BytesIO(f.read())
-                yield filePath, method, process(openZip, method)
+                yield filePath, method, contentHash, process(openZip, method)
 
 def scanFolder(folderPath):
     '''
@@ -259,8 +315,9 @@ def scanFolder(folderPath):
     
     @param folderPath: string
         The folder path.
-    @return: tuple(string, string, generator)
-        Returns a tuple containing: (filePath, method, generator(@see: process))
+    @return: tuple(string, string, None, generator)
+        Returns a tuple containing: (filePath, method, contentHash, generator(@see: process)), the folder files have no
+        content hash since they are checked based on the modification time.
     '''
     assert isinstance(folderPath, str), 'Invalid folder path %s' % folderPath
     for root, _dirnames, filenames in os.walk(folderPath):
@@ -270,7 +327,7 @@ def scanFolder(folderPath):
             for pattern, method in METHOD_MAP:
                 if pathmatch(pattern, name):
                     filePath = name.replace('/', os.sep)
-                    yield filePath, method, process(partial(open, name, 'rb'), method)
+                    yield filePath, method, None, process(partial(open, name, 'rb'), method)
 
 def process(openFile, method):
     '''
@@ -11,6 +11,7 @@ Contains sql alchemy database setup.
 
 from ally.container import ioc
 from ally.container.error import ConfigError
+from ally.support.util_sys import addForkListener
 from sqlalchemy.engine import create_engine
 from sqlalchemy.engine.base import Engine
 from sqlalchemy.orm.session import sessionmaker
@@ -39,7 +40,10 @@ def alchemySessionCreator(): return sessionmaker(bind=alchemyEngine())
 
 @ioc.entity
 def alchemyEngine() -> Engine:
-    return create_engine(database_url(), pool_recycle=alchemy_pool_recycle())
+    engine = create_engine(database_url(), pool_recycle=alchemy_pool_recycle())
+    # The pooled connections cannot be shared with the forked processes, like the server workers.
+    addForkListener(engine.dispose)
+    return engine
 
 @ioc.entity
 def metas(): return []
@@ -15,8 +15,9 @@ from ally.exception import InputError, Ref
 from ally.internationalization import _
 from ally.support.api import entity as api
 from ally.support.api.util_service import copy
-from ally.support.sqlalchemy.session import SessionSupport
-from ally.support.sqlalchemy.util_service import buildQuery, buildLimits, handle
+from ally.support.sqlalchemy.session import SessionSupport, notifyChangeOnCommit
+from ally.support.sqlalchemy.util_service import buildQuery, buildLimits, handle, \
+    buildAllWithCount
 from inspect import isclass
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
 import logging
@@ -34,6 +35,11 @@ class EntitySupportAlchemy(SessionSupport):
     Provides support generic entity handling.
     '''
 
+    countOver = None
+    # Flag indicating that the total count is provided by a COUNT(*) OVER() window function in the same query as the
+    # entities, if False a separate count query is used and if None the window function is used if the database
+    # supports it.
+
     def __init__(self, Entity, QEntity=None):
         '''
         Construct the entity support for the provided model class and query class.
@@ -114,9 +120,7 @@ class EntitySupportAlchemy(SessionSupport):
             assert self.QEntity, 'No query provided for the entity service'
             assert self.queryType.isValid(query), 'Invalid query %s, expected %s' % (query, self.QEntity)
             sql = buildQuery(sql, query, self.Entity)
-        sqlLimit = buildLimits(sql, offset, limit)
-        if limit == 0: return (), sql.count()
-        return sqlLimit.all(), sql.count()
+        return buildAllWithCount(sql, offset, limit, self.countOver)
 
 # --------------------------------------------------------------------
 
@@ -125,6 +129,9 @@ class EntityGetServiceAlchemy(EntitySupportAlchemy):
     Generic implementation for @see: IEntityGetService
     '''
 
+    bulkSize = 500
+    # The maximum number of ids used in a single SQL IN query.
+
     def getById(self, id):
         '''
         @see: IEntityGetService.getById
@@ -133,6 +140,22 @@ class EntityGetServiceAlchemy(EntitySupportAlchemy):
         if not entity: raise InputError(Ref(_('Unknown id'), ref=self.Entity.Id))
         return entity
 
+    def getByIds(self, ids):
+        '''
+        Provides the entities for the provided ids using a SQL IN query, this is used for fetching in bulk the entities
+        that are referenced by other models.
+        
+        @param ids: Iterable(integer)
+            The ids of the entities to provide.
+        @return: dictionary{integer, Entity}
+            The found entities indexed by id, the unknown ids are not present.
+        '''
+        ids, entities = list(ids), {}
+        for k in range(0, len(ids), self.bulkSize):
+            sql = self.session().query(self.Entity).filter(self.Entity.Id.in_(ids[k:k + self.bulkSize]))
+            entities.update((entity.Id, entity) for entity in sql.all())
+        return entities
+
 class EntityFindServiceAlchemy(EntitySupportAlchemy):
     '''
     Generic implementation for @see: IEntityFindService
@@ -176,6 +199,7 @@ class EntityCRUDServiceAlchemy(EntitySupportAlchemy):
             self.session().add(entityDb)
             self.session().flush((entityDb,))
         except SQLAlchemyError as e: handle(e, entityDb)
+        notifyChangeOnCommit(self.session(), self.model)
         entity.Id = entityDb.Id
         return entityDb.Id
 
@@ -189,16 +213,19 @@ class EntityCRUDServiceAlchemy(EntitySupportAlchemy):
         if not entityDb: raise InputError(Ref(_('Unknown id'), ref=self.Entity.Id))
         try: self.session().flush((copy(entity, entityDb),))
         except SQLAlchemyError as e: handle(e, self.Entity)
+        notifyChangeOnCommit(self.session(), self.model)
 
     def delete(self, id):
         '''
         @see: IEntityCRUDService.delete
         '''
         try:
-            return self.session().query(self.Entity).filter(self.Entity.Id == id).delete() > 0
+            deleted = self.session().query(self.Entity).filter(self.Entity.Id == id).delete() > 0
         except OperationalError:
             assert log.debug('Could not delete entity %s with id \'%s\'', self.Entity, id, exc_info=True) or True
             raise InputError(Ref(_('Cannot delete because is in use'), model=self.model))
+        if deleted: notifyChangeOnCommit(self.session(), self.model)
+        return deleted
 
 class EntityGetCRUDServiceAlchemy(EntityGetServiceAlchemy, EntityCRUDServiceAlchemy):
     '''
@@ -15,8 +15,9 @@ from ally.exception import InputError, Ref
 from ally.internationalization import _
 from ally.support.api import keyed as api
 from ally.support.api.util_service import copy
-from ally.support.sqlalchemy.session import SessionSupport
-from ally.support.sqlalchemy.util_service import buildQuery, buildLimits, handle
+from ally.support.sqlalchemy.session import SessionSupport, notifyChangeOnCommit
+from ally.support.sqlalchemy.util_service import buildQuery, buildLimits, handle, \
+    buildAllWithCount
 from inspect import isclass
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
 from sqlalchemy.orm.exc import NoResultFound
@@ -34,6 +35,11 @@ class EntitySupportAlchemy(SessionSupport):
     Provides support generic entity handling.
     '''
 
+    countOver = None
+    # Flag indicating that the total count is provided by a COUNT(*) OVER() window function in the same query as the
+    # entities, if False a separate count query is used and if None the window function is used if the database
+    # supports it.
+
     def __init__(self, Entity, QEntity=None):
         '''
         Construct the entity support for the provided model class and query class.
@@ -136,9 +142,7 @@ class EntitySupportAlchemy(SessionSupport):
             assert self.QEntity, 'No query provided for the entity service'
             assert self.queryType.isValid(query), 'Invalid query %s, expected %s' % (query, self.QEntity)
             sqlQuery = buildQuery(sqlQuery, query, self.Entity)
-        sql = buildLimits(sqlQuery, offset, limit)
-        if limit == 0: return [], sqlQuery.count()
-        return sql.all(), sqlQuery.count()
+        return buildAllWithCount(sqlQuery, offset, limit, self.countOver)
 
 # --------------------------------------------------------------------
 
@@ -147,6 +151,9 @@ class EntityGetServiceAlchemy(EntitySupportAlchemy):
     Generic implementation for @see: IEntityGetService
     '''
 
+    bulkSize = 500
+    # The maximum number of keys used in a single SQL IN query.
+
     def getByKey(self, key):
         '''
         @see: IEntityGetService.getByKey
@@ -154,6 +161,22 @@ class EntityGetServiceAlchemy(EntitySupportAlchemy):
         try: return self.session().query(self.Entity).filter(self.Entity.Key == key).one()
         except NoResultFound: raise InputError(Ref(_('Unknown key'), ref=self.Entity.Key))
 
+    def getByKeys(self, keys):
+        '''
+        Provides the entities for the provided keys using a SQL IN query, this is used for fetching in bulk the entities
+        that are referenced by other models.
+        
+        @param keys: Iterable(string)
+            The keys of the entities to provide.
+        @return: dictionary{string, Entity}
+            The found entities indexed by key, the unknown keys are not present.
+        '''
+        keys, entities = list(keys), {}
+        for k in range(0, len(keys), self.bulkSize):
+            sql = self.session().query(self.Entity).filter(self.Entity.Key.in_(keys[k:k + self.bulkSize]))
+            entities.update((entity.Key, entity) for entity in sql.all())
+        return entities
+
 class EntityFindServiceAlchemy(EntitySupportAlchemy):
     '''
     Generic implementation for @see: IEntityFindService
@@ -191,6 +214,7 @@ class EntityCRUDServiceAlchemy(EntitySupportAlchemy):
             self.session().add(entityDb)
             self.session().flush((entityDb,))
         except SQLAlchemyError as e: handle(e, entityDb)
+        notifyChangeOnCommit(self.session(), self.model)
         return entity.Key
 
     def update(self, entity):
@@ -205,16 +229,19 @@ class EntityCRUDServiceAlchemy(EntitySupportAlchemy):
         try:
             self.session().flush((copy(entity, entityDb),))
         except SQLAlchemyError as e: handle(e, self.Entity)
+        notifyChangeOnCommit(self.session(), self.model)
 
     def delete(self, key):
         '''
         @see: IEntityCRUDService.delete
         '''
         try:
-            return self.session().query(self.Entity).filter(self.Entity.Key == key).delete() > 0
+            deleted = self.session().query(self.Entity).filter(self.Entity.Key == key).delete() > 0
         except OperationalError:
             assert log.debug('Could not delete entity %s with key \'%s\'', self.Entity, key, exc_info=True) or True
             raise InputError(Ref(_('Cannot delete because is in use'), model=self.model))
+        if deleted: notifyChangeOnCommit(self.session(), self.model)
+        return deleted
 
 class EntityGetCRUDServiceAlchemy(EntityGetServiceAlchemy, EntityCRUDServiceAlchemy):
     '''